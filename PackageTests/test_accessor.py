@@ -0,0 +1,69 @@
+import unittest
+
+from pyini import ConfigParser, Accessor
+
+class Test_Accessor(unittest.TestCase):
+
+    source = "[service]\n    name = api\n    [limits]\n        (int) rps = 10\n"
+
+    def test_accessor(self):
+
+        config = ConfigParser(self.source, lazy = True)
+        rps = config.accessor("service:limits:rps")
+
+        self.assertIsInstance(rps, Accessor)
+        self.assertEqual(rps(), 10)
+        self.assertEqual(rps.get(), 10)
+
+        # Setting changes are seen without discarding the cached section
+        limits = rps._node
+        config["service"]["limits"]["rps"] = 20
+        config["service"]["limits"]["burst"] = 5
+        self.assertEqual(rps(), 20)
+        self.assertIs(rps._node, limits)
+
+        self.assertEqual(config.accessor("name")(default = "missing"), "missing")
+        self.assertEqual(config.accessor("service:name")(), "api")
+
+    def test_replaced_sections(self):
+
+        config = ConfigParser(self.source)
+        rps = config.accessor("service:limits:rps")
+        self.assertEqual(rps(), 10)
+
+        # Replacing an ancestor section detaches the cached section
+        config["service"] = {"limits": {"rps": 30}}
+        self.assertEqual(rps(), 30)
+
+        del config["service"]["limits"]
+        self.assertIsNone(rps())
+
+        # Sections are looked for again until they exist
+        config["service"]["limits"] = {"rps": 40}
+        self.assertEqual(rps(), 40)
+
+        # Replacing the sections of other configs doesn't discard the cached section
+        limits = rps._node
+        other = ConfigParser(self.source)
+        other["service"] = {}
+        del other["service"]
+        self.assertEqual(rps(), 40)
+        self.assertIs(rps._node, limits)
+
+        # A section moved to another path is not followed
+        limits = config["service"].pop("limits")
+        config["other"] = limits
+        self.assertEqual(rps(1), 1)
+
+    def test_get_many(self):
+
+        config = ConfigParser(self.source)
+        config["service"]["limits"]["burst"] = 5
+
+        self.assertEqual(
+            config.get_many(
+                ["service:limits:rps", "service:limits:burst", "service:name", "service:missing:key", "missing", "service"],
+                default = 0
+            ),
+            [10, 5, "api", 0, 0, config["service"]]
+        )
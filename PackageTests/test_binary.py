@@ -0,0 +1,84 @@
+import io
+import os
+import codecs
+import tempfile
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, ParseError
+
+class Test_BinaryInput(unittest.TestCase):
+
+    source = "name = café\r\n[section]\n    (int) value = 10\r    (list) items = a, b\n"
+    expected = {"name": "café", "section": {"value": 10, "items": ["a", "b"]}}
+
+    def test_bytes_like(self):
+
+        content = self.source.encode("utf-8")
+        for value in (content, bytearray(content), memoryview(content)):
+            self.assertEqual(ConfigParser().parse(value), self.expected, type(value))
+
+    def test_byte_order_marks(self):
+
+        for bom, encoding in (
+            (codecs.BOM_UTF8, "utf-8"),
+            (codecs.BOM_UTF16_LE, "utf-16-le"),
+            (codecs.BOM_UTF16_BE, "utf-16-be"),
+            (codecs.BOM_UTF32_LE, "utf-32-le"),
+            (codecs.BOM_UTF32_BE, "utf-32-be"),
+        ):
+            content = bom + self.source.encode(encoding)
+
+            # The byte order mark takes precedence over the encoding provided
+            self.assertEqual(ConfigParser().parse(content, encoding = "latin-1"), self.expected, encoding)
+
+    def test_encoding(self):
+
+        config = ConfigParser().parse(self.source.encode("latin-1"), encoding = "latin-1")
+        self.assertEqual(config, self.expected)
+
+        config = ConfigParser().parse(self.source.encode("utf-16-le"), encoding = "utf-16-le")
+        self.assertEqual(config, self.expected)
+
+    def test_binary_streams(self):
+
+        self.assertEqual(ConfigParser().parse(io.BytesIO(self.source.encode())), self.expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.ini")
+            with open(path, "wb") as handle:
+                handle.write(codecs.BOM_UTF16_LE + self.source.encode("utf-16-le"))
+
+            self.assertEqual(ConfigParser().read(path), self.expected)
+
+            with open(path, "rb") as handle:
+                self.assertEqual(ConfigParser().parse(handle), self.expected)
+
+    def test_decode_error_offset(self):
+
+        content = b"first = 1\nsecond = \xff\n"
+
+        with pytest.raises(ParseError) as info:
+            ConfigParser().parse(content)
+
+        self.assertEqual(info.value.line, 2)
+        self.assertEqual(info.value.offset, 10)
+        self.assertIn("byte offset 10", str(info.value))
+
+    def test_conversion_error_offset(self):
+
+        content = "name = café\n(int) value = ten\n".encode("utf-8")
+
+        with pytest.raises(ParseError) as info:
+            ConfigParser().parse(content)
+
+        self.assertEqual(info.value.line, 2)
+        self.assertEqual(info.value.offset, len("name = café\n".encode("utf-8")))
+
+        # Lazily converted settings remember where they were read from
+        config = ConfigParser(lazy = True).parse(content)
+        with pytest.raises(ParseError) as info:
+            config["value"]
+
+        self.assertEqual(info.value.offset, 13)
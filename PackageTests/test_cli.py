@@ -0,0 +1,141 @@
+import io
+import os
+import json
+import tempfile
+import contextlib
+import unittest
+
+from pyini.cli import main
+
+class Test_CLI(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+        self.files = {}
+        for name, content in (
+            ("a.ini", "[server]\n    host = localhost\n    (int) port = 80\n"),
+            ("b.ini", "[server]\n    host = remote\n    (int) port = 8080\n"),
+            ("broken.ini", "[server]\n    (int) port = eighty\n"),
+        ):
+            path = os.path.join(self.directory, name)
+            with open(path, "w") as handle:
+                handle.write(content)
+            self.files[name] = path
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def run_cli(self, *argv) -> (int, list):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(list(argv))
+        return status, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_validate(self):
+
+        status, records = self.run_cli("validate", self.files["a.ini"], self.files["b.ini"])
+        self.assertEqual(status, 0)
+        self.assertEqual(records, [{"file": self.files["a.ini"], "ok": True}, {"file": self.files["b.ini"], "ok": True}])
+
+        status, records = self.run_cli("validate", os.path.join(self.directory, "*.ini"))
+        self.assertEqual(status, 1)
+        self.assertEqual([record["file"] for record in records], sorted(self.files.values()))
+
+        # Every record reports whether it succeeded
+        self.assertEqual([record["ok"] for record in records], [True, True, False])
+
+        error = records[-1]
+        self.assertEqual(error["line"], 2)
+        self.assertIn("Invalid type definition", error["error"])
+
+    def test_missing_files(self):
+
+        status, records = self.run_cli("validate", os.path.join(self.directory, "*.cfg"), "missing.ini")
+        self.assertEqual(status, 1)
+        self.assertEqual(records[0]["error"], "No files matched")
+        self.assertEqual(records[1]["file"], "missing.ini")
+
+        # The records of patterns without any files are in the position of the pattern
+        pattern = os.path.join(self.directory, "*.cfg")
+        status, records = self.run_cli("validate", self.files["a.ini"], pattern, self.files["b.ini"])
+        self.assertEqual([record["file"] for record in records], [self.files["a.ini"], pattern, self.files["b.ini"]])
+
+    def test_get(self):
+
+        status, records = self.run_cli("get", "server:port", self.files["a.ini"], self.files["b.ini"])
+        self.assertEqual(status, 0)
+        self.assertEqual([record["value"] for record in records], [80, 8080])
+
+        status, records = self.run_cli("get", "server:user", self.files["a.ini"])
+        self.assertEqual(status, 1)
+        self.assertIn("No setting", records[0]["error"])
+
+    def test_to_json(self):
+
+        status, records = self.run_cli("to-json", self.files["a.ini"])
+        self.assertEqual(status, 0)
+        self.assertEqual(records[0]["config"], {"server": {"host": "localhost", "port": 80}})
+
+    def test_fmt(self):
+
+        path = self.files["a.ini"]
+
+        status, records = self.run_cli("fmt", path)
+        self.assertEqual(status, 1)
+        self.assertEqual(records, [{"file": path, "ok": False, "changed": True}])
+
+        status, records = self.run_cli("fmt", "--write", path)
+        self.assertEqual(status, 0)
+
+        status, records = self.run_cli("fmt", path)
+        self.assertEqual(status, 0)
+        self.assertEqual(records, [{"file": path, "ok": True, "changed": False}])
+
+    def test_fmtKeepOrder(self):
+
+        path = os.path.join(self.directory, "ordered.ini")
+        with open(path, "w", newline = "") as handle:
+            handle.write(os.linesep.join(["b = 1", "a = 2", ""]))
+
+        status, records = self.run_cli("fmt", "--keep-order", path)
+        self.assertEqual(status, 0)
+        self.assertEqual(records, [{"file": path, "ok": True, "changed": False}])
+
+        status, records = self.run_cli("fmt", path)
+        self.assertEqual(status, 1)
+
+    def test_parallel(self):
+
+        paths = []
+        for i in range(16):
+            path = os.path.join(self.directory, "many", "{}.ini".format(i))
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            with open(path, "w") as handle:
+                handle.write("(int) value = {}\n".format(i))
+            paths.append(path)
+
+        status, records = self.run_cli("--jobs", "2", "get", "value", os.path.join(self.directory, "many", "*.ini"))
+        self.assertEqual(status, 0)
+        self.assertEqual({record["file"]: record["value"] for record in records}, {p: i for i, p in enumerate(paths)})
+
+    def test_usage(self):
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+            main(["unknown"])
+        self.assertEqual(context.exception.code, 2)
+
+        for jobs in ("0", "-1", "many"):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main(["--jobs", jobs, "validate", self.files["a.ini"]])
+            self.assertEqual(context.exception.code, 2)
+
+    def test_closed_output(self):
+
+        class Closed(io.StringIO):
+            def write(self, text: str): raise BrokenPipeError()
+
+        # A consumer that stops reading (e.g. `| head`) ends the command without an error
+        with contextlib.redirect_stdout(Closed()):
+            self.assertEqual(main(["validate", self.files["a.ini"], self.files["b.ini"]]), 0)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pyini
+from pyini import ConfigParser
+
+class Test_Compiled(unittest.TestCase):
+
+    source = os.linesep.join([
+        "name = service",
+        "[types]",
+        "    flag",
+        "    (int) integer = 10",
+        "    (float) real = 1.5",
+        "    (list<int>) numbers = 1, 2, 3",
+        "    (tuple) pair = a, b",
+        "    (set) names = x, y",
+        "    (frozenset) empty =",
+        "    (range) span = 0, 10, 2",
+        "    (bytes<hex>) binary = ff00",
+        "    (array<i>) packed = 1, 2, 3",
+    ])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ini = os.path.join(self.directory, "config.ini")
+        self.module = os.path.join(self.directory, "config_compiled.py")
+
+        with open(self.ini, "w") as handle:
+            handle.write(self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+
+        pyini.compile_to_module(self.ini, self.module)
+
+        self.assertTrue(os.path.exists(self.module))
+        self.assertEqual(pyini.load_compiled(self.ini, self.module), ConfigParser().read(self.ini))
+
+    def test_fresh_module_not_regenerated(self):
+
+        pyini.load_compiled(self.ini, self.module)
+
+        with mock.patch("pyini.compiled.compile_to_module") as compile_to_module:
+            config = pyini.load_compiled(self.ini, self.module)
+
+        compile_to_module.assert_not_called()
+        self.assertEqual(config["types"]["numbers"], [1, 2, 3])
+
+        # Touching the file without changing its content doesn't regenerate the module either
+        os.utime(self.ini, ns = (0, 0))
+        with mock.patch("pyini.compiled.compile_to_module") as compile_to_module:
+            pyini.load_compiled(self.ini, self.module)
+
+        compile_to_module.assert_not_called()
+
+    def test_stale_module_regenerated(self):
+
+        pyini.load_compiled(self.ini, self.module)
+
+        with open(self.ini, "a") as handle:
+            handle.write(os.linesep + "(int) added = 1")
+
+        self.assertEqual(pyini.load_compiled(self.ini, self.module)["types"]["added"], 1)
+
+        # Different parser options require a new module
+        config = pyini.load_compiled(self.ini, self.module, default = False)
+        self.assertEqual(config["types"]["flag"], False)
+
+    def test_option_objects(self):
+
+        # Options are compared by their content - not by the identity of the objects
+        options = lambda: {"pool": pyini.InternPool(), "limits": pyini.Limits(max_depth = 4)}
+        pyini.load_compiled(self.ini, self.module, **options())
+
+        with mock.patch("pyini.compiled.compile_to_module") as compile_to_module:
+            pyini.load_compiled(self.ini, self.module, **options())
+        compile_to_module.assert_not_called()
+
+        # A regenerated module that cannot be imported is reported
+        with mock.patch("pyini.compiled._literal", return_value = "undefined"):
+            with self.assertRaises(ImportError):
+                pyini.load_compiled(self.ini, self.module, default = False)
+
+    def test_uncompilable_values(self):
+
+        with open(self.ini, "w") as handle:
+            handle.write("(uuid.uuid4) identifier =")
+
+        with self.assertRaises(TypeError):
+            pyini.compile_to_module(self.ini, self.module)
+
+        self.assertFalse(os.path.exists(self.module))
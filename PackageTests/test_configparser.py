@@ -6,7 +6,7 @@ import tempfile
 import shutil
 
 import pyini
-from pyini import ConfigParser
+from pyini import ConfigParser, ParseError
 
 RESOURCES = os.path.join(os.path.dirname(__file__), "resources")
 
@@ -64,6 +64,17 @@ class Test_ConfigParser(unittest.TestCase):
         # Unpacking into another item works
         self.assertEqual({**config, **other_dictionary}, expected_result)
 
+    def test_setdefault(self):
+
+        # Dictionaries set as defaults are held as sections - writes through the returned section are kept
+        config = ConfigParser()
+        config.setdefault("db", {})["host"] = "x"
+        config["db"].setdefault("pool", {})["size"] = 4
+        self.assertEqual(config, {"db": {"host": "x", "pool": {"size": 4}}})
+
+        self.assertIs(config.setdefault("db", {}), config["db"])
+        self.assertEqual(config.setdefault("name", "demo"), "demo")
+
     def test_fromFile(self):
         config = ConfigParser().read(os.path.join(RESOURCES, "example.ini"))
 
@@ -395,6 +406,33 @@ class Test_ConfigParser(unittest.TestCase):
 
         self.assertEqual(config["a"], list(range(5)))
 
+    def test_arrayTypes(self):
+
+        import array
+
+        config = ConfigParser(os.linesep.join([
+            "(array<i>) integers = 1, 2,3",
+            "(array) doubles = 1.5, 2",
+            "(array<q>) multiline = 1,",
+            "    2, 3",
+            "(array<i>) empty =",
+            "(bytes<hex>) hex = de ad be ef",
+            "(bytearray<base64>) encoded = aGVsbG8=",
+        ]))
+
+        self.assertEqual(config["integers"], array.array("i", [1, 2, 3]))
+        self.assertEqual(config["doubles"], array.array("d", [1.5, 2.0]))
+        self.assertEqual(config["multiline"], array.array("q", [1, 2, 3]))
+        self.assertEqual(config["empty"], array.array("i"))
+        self.assertEqual(config["hex"], b"\xde\xad\xbe\xef")
+        self.assertEqual(config["encoded"], bytearray(b"hello"))
+
+        with pytest.raises(ValueError):
+            ConfigParser("(array<x>) a = 1, 2")
+
+        with pytest.raises(ValueError):
+            ConfigParser("(array<i>) a = 1, two")
+
     def test_setStringTypeIssue(self):
 
         config = ConfigParser(os.linesep.join([
@@ -511,6 +549,27 @@ class TestSavingConfigs(unittest.TestCase):
         config.write(path)
         self.assertEqual(config_string.strip(), self.binaryread(path))
 
+    def test_ArrayConversion(self):
+
+        import array
+
+        config = ConfigParser({
+            "a": array.array("i", range(5)),
+            "b": array.array("d", [0.5, 1.25]),
+            "c": b"\xff\x00",
+        })
+
+        string = os.linesep.join([
+            "(array<i>) a = 0, 1, 2, 3, 4",
+            "(array<d>) b = 0.5, 1.25",
+            "(bytes<hex>) c = ff00",
+        ])
+
+        path = os.path.join(self.directory, 'file1.ini')
+        config.write(path)
+        self.assertEqual(string, self.binaryread(path))
+        self.assertEqual(config, ConfigParser().read(path))
+
     def test_ComplexConfig(self):
 
         string = os.linesep.join([
@@ -535,17 +594,60 @@ class TestSavingConfigs(unittest.TestCase):
         config.write(path)
         self.assertEqual(string.strip(), self.binaryread(path))
 
+    def test_UnsortedWrite(self):
+
+        string = os.linesep.join([
+            "zeta = 1",
+            "(int) alpha = 2",
+            "[section 2]",
+            "b = 1",
+            "a = 2",
+            "    [inner z]",
+            "    y = 1",
+            "",
+            "    [inner a]",
+            "    x = 1",
+            "",
+            "[section 1]",
+            "c = 3",
+        ])
+
+        config = ConfigParser(string)
+
+        # The insertion order of the parsed content is kept - the round trip is stable
+        self.assertEqual(string, config.write(sort = False).strip())
+        self.assertEqual(config.write(sort = False), ConfigParser(config.write(sort = False)).write(sort = False))
+
+        # Sorting remains the default
+        self.assertTrue(config.write().startswith("(int) alpha = 2" + os.linesep + "zeta = 1"))
+
+    def test_UnsortedWriteSettingsAfterSections(self):
+
+        config = ConfigParser()
+        config["section"] = {"inner": {"a": "1"}, "b": "2"}
+        config["late"] = "3"
+
+        # Settings added after a section are still written before it, so that they are read back into their section
+        path = os.path.join(self.directory, 'file1.ini')
+        config.write(path, sort = False)
+
+        self.assertEqual(
+            os.linesep.join(["late = 3", "[section]", "b = 2", "    [inner]", "    a = 1"]),
+            self.binaryread(path)
+        )
+        self.assertEqual(config, ConfigParser().read(path))
+
 class Test_ConfigParserSettings(unittest.TestCase):
 
     def test_eval(self):
 
         with pytest.raises(ValueError):
-            config = ConfigParser("(eval) a = [(1,2), (2,3)]")
+            config = ConfigParser("(eval) a = [(1,2), (2,3)] + []")
             self.assertEqual(config['a'], [(1,2), (2,3)])
 
         with pytest.raises(ValueError):
-            config = ConfigParser("(eval) b = ['hello']")
-            self.assertEqual(config['b'], ['hello'])
+            config = ConfigParser("(eval) b = ['hello'.upper()]")
+            self.assertEqual(config['b'], ['HELLO'])
 
         config = ConfigParser("(eval) a = [(1,2), (2,3)]", safe=False)
         self.assertEqual(config['a'], [(1,2), (2,3)])
@@ -553,5 +655,103 @@ class Test_ConfigParserSettings(unittest.TestCase):
         config= ConfigParser().parse("(eval) b = ['hello']", safe=False)
         self.assertEqual(config['b'], ['hello'])
 
+    def test_eval_literals(self):
+
+        # Pure literals cannot execute code and are evaluated even when safe
+        config = ConfigParser("(eval) a = [(1,2), (2,3)]\n(eval) b = (-1.5, 'x', None)")
+        self.assertEqual(config['a'], [(1,2), (2,3)])
+        self.assertEqual(config['b'], (-1.5, 'x', None))
+
+        # Evaluated values are never shared between settings
+        config = ConfigParser("(eval) a = [1]\n(eval) b = [1]")
+        self.assertIsNot(config['a'], config['b'])
+
+    def test_eval_namespace(self):
+
+        config = ConfigParser("(eval) a = scale * 2", safe = False, namespace = {"scale": 21})
+        self.assertEqual(config['a'], 42)
+
+        with pytest.raises(ValueError):
+            ConfigParser("(eval) a = open('file.txt')", safe = False, namespace = {"__builtins__": {}})
+
+    def test_eval_compile_cache(self):
+
+        ConfigParser._compileExpression.cache_clear()
+
+        for _ in range(5):
+            ConfigParser("(eval) a = sum(range(10))", safe = False)
+
+        info = ConfigParser._compileExpression.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 4))
+
+        # Safe configs evaluate literals without compiling - rejected expressions are not cached
+        with pytest.raises(ValueError):
+            ConfigParser("(eval) a = sum(range(11))")
+        self.assertEqual(ConfigParser("(eval) a = [1, 2]")["a"], [1, 2])
+        self.assertEqual(ConfigParser._compileExpression.cache_info().currsize, 1)
+
 
 
+    def test_lazy(self):
+
+        import uuid
+        from unittest import mock
+
+        source = os.linesep.join([
+            "(int) a = 10",
+            "plain = 'quoted'",
+            "[section]",
+            "    (list<int>) b = 1, 2, 3",
+            "    (uuid.UUID) c = 12345678123456781234567812345678",
+        ])
+
+        original = ConfigParser._convertToType
+        with mock.patch.object(ConfigParser, "_convertToType", autospec = True, side_effect = original) as convert:
+            config = ConfigParser(source, lazy = True)
+            self.assertEqual(convert.call_count, 0)
+
+            self.assertEqual(config["a"], 10)
+            self.assertEqual(config.get("section:b"), [1, 2, 3])
+            self.assertEqual(config["plain"], "quoted")
+            calls = convert.call_count
+
+            # Converted values are memoized
+            self.assertIs(config["section"]["b"], config["section"]["b"])
+            self.assertEqual(convert.call_count, calls)
+
+        self.assertIsInstance(config["section"]["c"], uuid.UUID)
+        self.assertEqual(config, ConfigParser(source))
+        self.assertEqual(ConfigParser(source, lazy = True), ConfigParser(source, lazy = True))
+        self.assertEqual({**config["section"]}, ConfigParser(source)["section"])
+
+    def test_lazy_errors(self):
+
+        config = ConfigParser("[section]\n(int) a = 10\n(int) b = ten", lazy = True)
+
+        self.assertEqual(config["section"]["a"], 10)
+
+        with pytest.raises(ValueError, match = "Line 3"):
+            config["section"]["b"]
+
+        with pytest.raises(ValueError, match = "Line 3"):
+            config.materialize()
+
+        # Membership doesn't convert the setting
+        config = ConfigParser("(int) b = ten", lazy = True)
+        self.assertIn("b", config)
+        self.assertNotIn("c", config)
+
+    def test_section_conflicts_with_setting(self):
+
+        with pytest.raises(ParseError, match = "Line 2"):
+            ConfigParser("a = 1\n[a]\nb = 2")
+
+    def test_lazy_eval_safety(self):
+
+        config = ConfigParser("(eval) a = len([1, 2])", lazy = True)
+        with pytest.raises(ValueError):
+            config["a"]
+
+        # The manner of parsing is fixed when the setting is read
+        config = ConfigParser(lazy = True).parse("(eval) a = len([1, 2])", safe = False)
+        self.assertEqual(config.materialize()["a"], 2)
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+import pyini
+from pyini import ConfigParser
+
+class Test_Diff(unittest.TestCase):
+
+    source = r"""
+    name = service
+    [database]
+        host = localhost
+        (int) port = 5432
+        [pool]
+            (int) size = 10
+    [cache]
+        (set) nodes = a, b, c
+        (list<int>) weights = 1, 2, 3
+    """
+
+    def test_fingerprint(self):
+
+        first, second = ConfigParser(self.source), ConfigParser(self.source)
+
+        self.assertEqual(first.fingerprint(), second.fingerprint())
+        self.assertEqual(len(first.fingerprint()), 32)
+
+        # The fingerprint is independent of the order of keys
+        self.assertEqual(ConfigParser({"a": 1, "b": 2}).fingerprint(), ConfigParser({"b": 2, "a": 1}).fingerprint())
+
+        # Values of different types are differentiated
+        self.assertNotEqual(ConfigParser({"a": 1}).fingerprint(), ConfigParser({"a": "1"}).fingerprint())
+
+        second["database"]["pool"]["size"] = 11
+        self.assertNotEqual(first.fingerprint(), second.fingerprint())
+
+        second["database"]["pool"]["size"] = 10
+        self.assertEqual(first.fingerprint(), second.fingerprint())
+
+    def test_diff(self):
+
+        first, second = ConfigParser(self.source), ConfigParser(self.source)
+
+        self.assertEqual(first.diff(second), pyini.ConfigDiff([], [], []))
+
+        second["database"]["pool"]["size"] = 20
+        second["database"]["user"] = "admin"
+        del second["cache"]["weights"]
+        second["cache"]["nodes"] = {"a", "b"}
+        second["name"] = {"nested": "now a section"}
+
+        difference = first.diff(second)
+        self.assertEqual(difference.added, ["database:user"])
+        self.assertEqual(difference.removed, ["cache:weights"])
+        self.assertEqual(sorted(difference.changed), ["cache:nodes", "database:pool:size", "name"])
+
+        # Comparison against a plain dictionary
+        self.assertEqual(first.diff(first.copy()), pyini.ConfigDiff([], [], []))
+
+    def test_identical_sections_skipped(self):
+
+        first, second = ConfigParser(self.source), ConfigParser(self.source)
+        first.fingerprint(), second.fingerprint()
+
+        second["cache"]["weights"] = [1, 2]
+
+        # Only the changed section (and the root) are re-hashed - the unchanged database section is not walked
+        with mock.patch("pyini.section._combine", wraps = pyini.section._combine) as combine:
+            self.assertEqual(first.diff(second).changed, ["cache:weights"])
+
+        self.assertEqual(combine.call_count, 2)
+
+    def test_unstable_values(self):
+
+        class Point:
+            def __init__(self, x): self.x = x
+            def __eq__(self, other): return self.x == other.x
+            def __repr__(self): return "Point"
+
+        # Values without a stable digest have no fingerprint - rather than one shared by Point(1) and Point(2)
+        with self.assertRaises(TypeError):
+            ConfigParser({"a": Point(1)}).fingerprint()
+
+        # Such values are compared directly by diff
+        config = ConfigParser({"a": Point(1), "b": Point(2), "c": {1: "x"}})
+        other = ConfigParser({"a": Point(1), "b": Point(3), "c": {1: "y"}})
+        self.assertEqual(config.diff(other), pyini.ConfigDiff([], [], ["b", "c:1"]))
+
+        # Values wholly expressed by their repr are fingerprinted
+        import decimal
+        self.assertNotEqual(
+            ConfigParser({"a": decimal.Decimal("1.0")}).fingerprint(),
+            ConfigParser({"a": decimal.Decimal("1.00")}).fingerprint()
+        )
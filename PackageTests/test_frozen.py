@@ -0,0 +1,67 @@
+import unittest
+
+from pyini import ConfigParser, FrozenConfig
+
+class Test_FrozenConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.config = ConfigParser(r"""
+        basic = value
+        [section]
+            (list<int>) numbers = 1, 2, 3
+            [nested]
+                key = value
+                (set) names = a, b
+        """)
+
+    def test_freeze(self):
+
+        frozen = self.config.freeze()
+
+        self.assertIsInstance(frozen, FrozenConfig)
+        self.assertIsInstance(frozen["section"], FrozenConfig)
+        self.assertEqual(frozen["section"]["numbers"], (1, 2, 3))
+        self.assertEqual(frozen["section"]["nested"]["names"], frozenset({"a", "b"}))
+
+        with self.assertRaises(TypeError):
+            frozen["basic"] = "changed"
+
+    def test_get(self):
+
+        frozen = self.config.freeze()
+
+        self.assertEqual(frozen.get("basic"), "value")
+        self.assertEqual(frozen.get("section:nested:key"), "value")
+        self.assertEqual(frozen.get("section:nested:missing", 10), 10)
+        self.assertEqual(frozen.get("basic:too deep"), None)
+
+    def test_hashable(self):
+
+        first, second = self.config.freeze(), ConfigParser(self.config.freeze().thaw()).freeze()
+
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(len({first: 1, second: 2}), 1)
+
+        self.config["basic"] = "changed"
+        self.assertNotEqual(first, self.config.freeze())
+
+    def test_interned_keys(self):
+
+        first = ConfigParser("[section]\nshared key name = 1").freeze()
+        second = ConfigParser("[section]\nshared key name = 2").freeze()
+
+        self.assertIs(next(iter(first["section"])), next(iter(second["section"])))
+
+    def test_unhashable_value(self):
+
+        with self.assertRaises(TypeError):
+            ConfigParser({"a": object.__new__(type("Unhashable", (), {"__hash__": None}))}).freeze()
+
+    def test_array(self):
+
+        frozen = ConfigParser("(array<i>) a = 1, 2\n(bytes<hex>) b = ff00").freeze()
+
+        self.assertEqual(frozen["a"], (1, 2))
+        self.assertEqual(frozen["b"], b"\xff\x00")
+        self.assertIsInstance(hash(frozen), int)
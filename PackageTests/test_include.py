@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+import concurrent.futures
+
+from pyini import ConfigParser, ParseError
+from pyini import include
+
+class Test_Include(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        include.cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name: str, *lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as handle:
+            handle.write(os.linesep.join(lines))
+        return path
+
+    def test_include_in_scope(self):
+
+        self.write("pool.ini", "(int) size = 10", "[limits]", "(int) idle = 5")
+        path = self.write(
+            "main.ini",
+            "name = main",
+            "[database]",
+            "    host = localhost",
+            "    %include pool.ini",
+            "[cache]",
+            "    %include 'pool.ini'",
+        )
+
+        config = ConfigParser().read(path)
+
+        self.assertEqual(config, {
+            "name": "main",
+            "database": {"host": "localhost", "size": 10, "limits": {"idle": 5}},
+            "cache": {"size": 10, "limits": {"idle": 5}},
+        })
+
+        # Grafted content is not shared between scopes
+        self.assertIsNot(config["database"]["limits"], config["cache"]["limits"])
+
+    def test_parse_cache(self):
+
+        self.write("shared.ini", "(list<int>) values = 1, 2, 3")
+        path = self.write("main.ini", "[a]", "%include shared.ini", "[b]", "%include shared.ini")
+
+        first, second = ConfigParser().read(path), ConfigParser().read(path)
+
+        self.assertEqual((include.cache.misses, include.cache.hits), (1, 3))
+        self.assertEqual(first, second)
+
+        # Grafted values are copies of the cached fragment
+        first["a"]["values"].append(4)
+        self.assertEqual(ConfigParser().read(path)["a"]["values"], [1, 2, 3])
+
+        # A modified file is parsed again
+        self.write("shared.ini", "(list<int>) values = 1, 2, 3, 4, 5")
+        os.utime(os.path.join(self.directory, "shared.ini"), ns = (0, 0))
+        self.assertEqual(ConfigParser().read(path)["a"]["values"], [1, 2, 3, 4, 5])
+
+        # The entry of the previous version of the file is replaced
+        self.assertEqual(len(include.cache), 1)
+
+    def test_threads(self):
+
+        for i in range(8): self.write("part{}.ini".format(i), "(int) value = {}".format(i))
+        path = self.write("main.ini", *("[s{0}]\n    %include part{0}.ini".format(i) for i in range(8)))
+
+        # Threads sharing a small cache continually evict one another's entries
+        maxsize, include.cache.maxsize = include.cache.maxsize, 2
+        try:
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                configs = list(executor.map(lambda _: ConfigParser().read(path), range(200)))
+        finally:
+            include.cache.maxsize = maxsize
+
+        self.assertTrue(all(config["s7"]["value"] == 7 for config in configs))
+        self.assertLessEqual(len(include.cache), 2)
+
+    def test_nested_include_changes(self):
+
+        self.write("b.ini", "value = old")
+        self.write("a.ini", "%include b.ini")
+        path = self.write("main.ini", "%include a.ini")
+
+        self.assertEqual(ConfigParser().read(path)["value"], "old")
+
+        # A change to a file included by an included file is seen
+        self.write("b.ini", "value = new")
+        os.utime(os.path.join(self.directory, "b.ini"), ns = (0, 0))
+        self.assertEqual(ConfigParser().read(path)["value"], "new")
+        self.assertEqual(len(include.cache), 2)
+
+    def test_cycles(self):
+
+        self.write("first.ini", "a = 1", "%include second.ini")
+        self.write("second.ini", "b = 2", "%include first.ini")
+
+        with self.assertRaises(ParseError) as context:
+            ConfigParser().read(os.path.join(self.directory, "first.ini"))
+
+        self.assertIn("Cyclic include", str(context.exception))
+        self.assertEqual(context.exception.line, 2)
+        self.assertTrue(context.exception.source.endswith("second.ini"))
+
+    def test_errors_reference_included_file(self):
+
+        self.write("broken.ini", "a = 1", "(int) b = two")
+        path = self.write("main.ini", "%include broken.ini")
+
+        with self.assertRaises(ParseError) as context:
+            ConfigParser().read(path)
+
+        self.assertEqual(context.exception.line, 2)
+        self.assertTrue(context.exception.source.endswith("broken.ini"))
+
+        with self.assertRaises(ParseError) as context:
+            ConfigParser().read(self.write("missing.ini", "", "%include nothing.ini"))
+
+        self.assertEqual(context.exception.line, 2)
@@ -0,0 +1,83 @@
+import os
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, IncrementalParser, ParseError
+
+RESOURCES = os.path.join(os.path.dirname(__file__), "resources")
+
+class Test_IncrementalParser(unittest.TestCase):
+
+    def chunked(self, content: str, size: int) -> ConfigParser:
+        parser = IncrementalParser()
+        for i in range(0, len(content), size):
+            parser.feed(content[i: i + size])
+        return parser.close()
+
+    def test_chunk_boundaries(self):
+
+        for name in ("example.ini", "challenging.ini", "Quick Start.ini"):
+            with open(os.path.join(RESOURCES, name)) as handle:
+                content = handle.read()
+
+            expected = ConfigParser(content)
+            for size in (1, 2, 3, 7, 64, len(content)):
+                self.assertEqual(self.chunked(content, size), expected, (name, size))
+
+    def test_continuations_across_chunks(self):
+
+        parser = IncrementalParser()
+        parser.feed("[section]\n    value = first")
+        parser.feed(" part\n        second line\n")
+        parser.feed("    (list<int>) numbers = 1,\n")
+        parser.feed("        2, 3")
+
+        # The final setting may still be continued - it isn't added until the parser is closed
+        self.assertNotIn("numbers", parser.config["section"])
+
+        config = parser.close()
+        self.assertEqual(config["section"]["value"], "first part{}second line".format(os.linesep))
+        self.assertEqual(config["section"]["numbers"], [1, 2, 3])
+
+    def test_existing_config(self):
+
+        config = ConfigParser("[section]\na = 1")
+
+        with IncrementalParser(config) as parser:
+            parser.feed("[section]\nb = 2\n")
+
+        self.assertEqual(config, {"section": {"a": "1", "b": "2"}})
+
+        with pytest.raises(ValueError):
+            parser.feed("c = 3")
+
+    def test_errors(self):
+
+        parser = IncrementalParser()
+        parser.feed("a = 1\n(int) b = two\n")
+
+        with pytest.raises(ParseError, match = "Line 2"):
+            parser.feed("c = 3\n")
+
+        parser = IncrementalParser(safe = False)
+        parser.feed("(eval) a = len('abc')\n")
+        self.assertEqual(parser.close()["a"], 3)
+
+    def test_binary_chunks(self):
+
+        content = "[section]\n    name = café ☕\n    (int) port = 80\n"
+        expected = ConfigParser(content)
+
+        # Multi-byte characters are split between chunks
+        for encoding, prefix in (("utf-8", b""), ("utf-16-le", b"\xff\xfe")):
+            binary = prefix + content.encode(encoding)
+            for size in (1, 2, 3, 5):
+                parser = IncrementalParser()
+                for i in range(0, len(binary), size):
+                    parser.feed(binary[i: i + size])
+                self.assertEqual(parser.close(), expected, (encoding, size))
+
+        with pytest.raises(ParseError, match = "Line 2"):
+            parser = IncrementalParser()
+            parser.feed(b"a = 1\nb = \xff\n")
@@ -0,0 +1,61 @@
+import unittest
+
+from pyini import ConfigParser, InternPool
+
+class Test_InternPool(unittest.TestCase):
+
+    source = r"""
+    [tenant]
+        name = a shared tenant name
+        (tuple<int>) ports = 8080, 8081
+        (frozenset) roles = admin, user
+        (list) mutable = a, b
+    """
+
+    def test_shared_values(self):
+
+        pool = InternPool()
+        first = ConfigParser(self.source, pool = pool)
+        second = ConfigParser(self.source, pool = pool)
+
+        self.assertEqual(first, second)
+
+        for key in ("name", "ports", "roles"):
+            self.assertIs(first["tenant"][key], second["tenant"][key])
+
+        # Mutable values are never shared between configs
+        self.assertIsNot(first["tenant"]["mutable"], second["tenant"]["mutable"])
+
+        # Keys are deduplicated too
+        self.assertIs(list(first["tenant"])[0], list(second["tenant"])[0])
+
+    def test_report(self):
+
+        pool = InternPool()
+        ConfigParser(self.source, pool = pool)
+        entries = len(pool)
+
+        self.assertEqual(pool.report(), {"entries": entries, "hits": pool.hits, "saved": pool.saved})
+
+        for _ in range(10): ConfigParser(self.source, pool = pool)
+
+        # Repeated content doesn't grow the pool but does save memory
+        self.assertEqual(len(pool), entries)
+        self.assertGreater(pool.hits, 0)
+        self.assertGreater(pool.saved, 0)
+
+        pool.clear()
+        self.assertEqual(pool.report(), {"entries": 0, "hits": 0, "saved": 0})
+
+    def test_types_kept_distinct(self):
+
+        pool = InternPool()
+
+        self.assertIs(type(pool.intern(1)), int)
+        self.assertIs(type(pool.intern(1.0)), float)
+        self.assertEqual(type(pool.intern((1,))[0]), int)
+        self.assertEqual(type(pool.intern((1.0,))[0]), float)
+
+        # Containers of unhashable values are left alone
+        value = ([],)
+        self.assertIs(pool.intern(value), value)
@@ -0,0 +1,139 @@
+import io
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, IncrementalParser, Limits, LimitExceeded, ParseError
+
+class Test_Limits(unittest.TestCase):
+
+    def parse(self, content: object, **limits) -> ConfigParser:
+        return ConfigParser(limits = Limits(**limits)).parse(content)
+
+    def test_within_limits(self):
+
+        content = "[section]\n    (int) value = 1\n    (list) items = a, b\n    key\n"
+        self.assertEqual(
+            ConfigParser(limits = Limits.untrusted()).parse(content),
+            ConfigParser(content)
+        )
+
+    def test_size_and_lines(self):
+
+        with pytest.raises(LimitExceeded):
+            self.parse("a = 1\n"*100, max_size = 100)
+
+        with pytest.raises(LimitExceeded) as info:
+            self.parse(io.StringIO("a = 1\nb = 1\n" + "c = " + "x"*1000 + "\n"), max_line_length = 100)
+        self.assertEqual(info.value.line, 3)
+
+        with pytest.raises(LimitExceeded):
+            self.parse(("a = 1\n"*100).encode(), max_size = 100)
+
+        with pytest.raises(LimitExceeded):
+            self.parse(io.BytesIO(("a = 1\n"*100).encode()), max_size = 100)
+
+        # Lines of exactly the limit are accepted
+        self.assertEqual(self.parse("a = " + "x"*96 + "\r\n", max_line_length = 100)["a"], "x"*96)
+
+    def test_structure(self):
+
+        deep = "".join("{}[s{}]\n".format("    "*i, i) for i in range(10))
+        with pytest.raises(LimitExceeded) as info:
+            self.parse(deep, max_depth = 5)
+        self.assertEqual(info.value.line, 6)
+
+        with pytest.raises(LimitExceeded):
+            self.parse("".join("key{}\n".format(i) for i in range(20)), max_settings = 10)
+
+        with pytest.raises(LimitExceeded):
+            self.parse("a = start\n" + "    more\n"*100, max_value_length = 100)
+
+    def test_interpolation(self):
+
+        content = "a = " + "x"*50 + "\nb = {a}{a}{a}{a}\n"
+        self.assertEqual(len(self.parse(content, max_interpolation = 200)["b"]), 200)
+
+        with pytest.raises(LimitExceeded):
+            self.parse(content, max_interpolation = 150)
+
+        # The characters interpolated are limited over the whole source, not only each line
+        content = "a = " + "x"*50 + "\n" + "".join("c{} = {{a}}\n".format(i) for i in range(10))
+        self.assertEqual(len(self.parse(content, max_interpolation = 100, max_expansion = 500)), 11)
+
+        with pytest.raises(LimitExceeded) as info:
+            self.parse(content, max_interpolation = 100, max_expansion = 400)
+        self.assertEqual(info.value.line, 10)
+
+    def test_includes(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            allowed = os.path.join(directory, "allowed")
+            os.mkdir(allowed)
+
+            for name, content in [
+                ("allowed/settings.ini", "[nested]\n    [deeper]\n        a = 1\n        b = 2\n"),
+                ("secret.ini", "password = hunter2\n")
+            ]:
+                with open(os.path.join(directory, name), "w") as handle: handle.write(content)
+
+            path = os.path.join(allowed, "settings.ini")
+            content = "%include {}\n".format(path)
+
+            self.assertEqual(self.parse(content, includes = [allowed])["nested"]["deeper"]["b"], "2")
+
+            # Untrusted configs cannot include files
+            with pytest.raises(LimitExceeded):
+                ConfigParser(limits = Limits.untrusted()).parse(content)
+
+            for escape in ["secret.ini", "allowed/../secret.ini"]:
+                with pytest.raises(LimitExceeded):
+                    self.parse("%include {}\n".format(os.path.join(directory, escape)), includes = [allowed])
+
+            # The included content counts towards the limits of the including config
+            with pytest.raises(LimitExceeded):
+                self.parse("key\n" + content, max_settings = 2)
+
+            with pytest.raises(LimitExceeded):
+                self.parse("[top]\n    " + content, max_depth = 2)
+
+            self.assertEqual(len(self.parse("[top]\n    " + content, max_depth = 3, max_settings = 2)), 1)
+
+    def test_conversions(self):
+
+        with pytest.raises(LimitExceeded) as info:
+            self.parse("a = 1\n(bytes<int>) b = 1000000000\n", max_items = 1000)
+        self.assertEqual(info.value.line, 2)
+        self.assertIsInstance(info.value, ParseError)
+
+        for content in ("(range) r = 0, 1000000", "(list) l = " + ",".join("1"*2000), "(array<i>) a = " + ",1"*2000):
+            with pytest.raises(LimitExceeded):
+                self.parse(content, max_items = 1000)
+
+        with pytest.raises(LimitExceeded):
+            self.parse("(decimal.Decimal) d = 1.5", types = Limits.BUILTIN_TYPES)
+
+        with pytest.raises(LimitExceeded):
+            self.parse("(list<uuid.UUID>) d = 12345678123456781234567812345678", types = Limits.BUILTIN_TYPES)
+
+        # Lazily converted settings are limited when they are accessed
+        config = ConfigParser("(eval) e = 1", lazy = True, limits = Limits(types = {"int"}))
+        with pytest.raises(LimitExceeded):
+            config["e"]
+
+    def test_incremental(self):
+
+        parser = IncrementalParser(ConfigParser(limits = Limits(max_line_length = 100)))
+        parser.feed("a = 1\n")
+        with pytest.raises(LimitExceeded) as info:
+            for _ in range(100): parser.feed("x"*10)
+        self.assertEqual(info.value.line, 2)
+
+        # Incomplete lines count towards the size of the content
+        parser = IncrementalParser(ConfigParser(limits = Limits(max_size = 100)))
+        parser.feed("a = 1\n")
+        with pytest.raises(LimitExceeded) as info:
+            for _ in range(100): parser.feed("x"*10)
+        self.assertEqual(info.value.line, 2)
@@ -0,0 +1,67 @@
+import sys
+import array
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, InternPool
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+class Test_MemoryReport(unittest.TestCase):
+
+    def test_attribution(self):
+
+        config = ConfigParser("""
+name = service
+[small]
+    (int) value = 1
+[large]
+    (array<d>) samples = {}
+    [nested]
+        (bytes<hex>) blob = {}
+""".format(", ".join(["1.5"]*10000), "ff"*5000))
+
+        report = config.memory_report()
+
+        self.assertEqual(set(report.sections), {"", "small", "large", "large:nested"})
+        self.assertEqual(report.total, sum(report.sections.values()))
+
+        self.assertGreater(report.types["array.array"], 80000)
+        self.assertGreater(report.types["bytes"], 5000)
+        self.assertIn("int", report.types)
+
+        self.assertEqual(report.top(1)[0][0], "large")
+        self.assertEqual([path for path, _ in report.top(2, inclusive = True)], ["", "large"])
+        self.assertEqual(report.top(1, by = "types")[0][0], "array.array")
+
+        with pytest.raises(ValueError):
+            report.top(by = "keys")
+
+    def test_shared_counted_once(self):
+
+        value = tuple(range(1000))
+        config = ConfigParser({"first": {"value": value}, "second": {"value": value}})
+        report = config.memory_report()
+
+        # The tuple is attributed to whichever section is measured first
+        smaller, larger = sorted((report.sections["first"], report.sections["second"]))
+        self.assertLess(smaller, sys.getsizeof(value))
+        self.assertGreater(larger, sys.getsizeof(value))
+
+    def test_custom_and_lazy_values(self):
+
+        config = ConfigParser("(int) lazy = 1\n", lazy = True)
+        config["point"] = Point("x"*1000, [1, 2, 3])
+        config["items"] = {frozenset({"a", "b"}), (1, 2)}
+
+        report = config.memory_report()
+
+        self.assertGreater(report.types[__name__ + ".Point"], 1000)
+        self.assertIn("set", report.types)
+        self.assertIn("deferred", report.types)
+
+        # Measuring doesn't convert deferred values
+        self.assertIn("deferred", config.memory_report().types)
@@ -0,0 +1,97 @@
+import copy
+import unittest
+
+from pyini import ConfigParser
+
+class Test_Observers(unittest.TestCase):
+
+    def setUp(self):
+        self.config = ConfigParser(r"""
+        [database]
+            host = localhost
+            (int) port = 5432
+            [pool]
+                (int) size = 10
+        [servers]
+            [alpha]
+                (int) port = 8080
+        """)
+
+        self.calls = []
+
+    def record(self, name: str):
+        return lambda paths: self.calls.append((name, paths))
+
+    def test_nested_changes(self):
+
+        self.config.on_change("database", self.record("database"))
+        self.config.on_change("servers:*:port", self.record("ports"))
+
+        self.config["database"]["pool"]["size"] = 20
+        self.config["servers"]["alpha"]["port"] = 9090
+        del self.config["database"]["host"]
+
+        self.assertEqual(self.calls, [
+            ("database", ["database:pool:size"]),
+            ("ports", ["servers:alpha:port"]),
+            ("database", ["database:host"]),
+        ])
+
+    def test_replaced_ancestor(self):
+
+        self.config.on_change("database:pool:size", self.record("size"))
+
+        self.config["database"] = {"host": "remote"}
+        self.assertEqual(self.calls, [("size", ["database"])])
+
+        # Unrelated changes aren't dispatched
+        self.config["servers"]["alpha"]["port"] = 1
+        self.assertEqual(len(self.calls), 1)
+
+    def test_batches(self):
+
+        self.config.on_change("", self.record("all"))
+        self.config.on_change("database", self.record("database"))
+
+        self.config.parse("[database]\n    user = admin\n    [pool]\n        (int) size = 5\n[other]\na = 1")
+        self.assertEqual(self.calls, [
+            ("all", ["database:user", "database:pool:size", "other", "other:a"]),
+            ("database", ["database:user", "database:pool:size"]),
+        ])
+
+        self.calls.clear()
+        self.config.update({"a": 1, "b": 2})
+        self.assertEqual(self.calls, [("all", ["a", "b"])])
+
+        self.calls.clear()
+        with self.config.batch():
+            self.config["database"]["host"] = "remote"
+            self.config["database"]["host"] = "other"
+            self.assertEqual(self.calls, [])
+
+        self.assertEqual(self.calls, [("all", ["database:host"]), ("database", ["database:host"])])
+
+    def test_cancel(self):
+
+        subscription = self.config.on_change("database", self.record("database"))
+        subscription.cancel()
+
+        self.config["database"]["host"] = "remote"
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.config._observers), 0)
+        self.assertEqual(self.config._observers._root.children, {})
+
+    def test_copies_not_subscribed(self):
+
+        self.config.on_change("", self.record("all"))
+
+        duplicate = copy.deepcopy(self.config)
+        duplicate["database"]["host"] = "remote"
+        self.assertEqual(self.calls, [])
+
+        # Sections removed from the config no longer report changes
+        pool = self.config["database"]["pool"]
+        del self.config["database"]["pool"]
+        self.calls.clear()
+        pool["size"] = 1
+        self.assertEqual(self.calls, [])
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from pyini import ConfigParser, Origin, OriginMap
+
+class Test_Origins(unittest.TestCase):
+
+    source = "name = first\n[section]\n\tflag\n    (int) value = 10\n    [nested]\n        deep = 1\n"
+
+    def test_origin(self):
+
+        config = ConfigParser(self.source, track_origins = True)
+
+        self.assertEqual(config.origin("name"), Origin(None, 1, 1))
+        self.assertEqual(config.origin("section:flag"), Origin(None, 3, 2))
+        self.assertEqual(config.origin("section:value"), Origin(None, 4, 5))
+        self.assertEqual(config.origin("section:nested:deep"), Origin(None, 6, 9))
+
+        self.assertIsNone(config.origin("section"))
+        self.assertIsNone(config.origin("missing:key"))
+
+        # Untracked configs have no origins
+        self.assertIsNone(ConfigParser(self.source).origin("name"))
+
+    def test_mutations(self):
+
+        config = ConfigParser(self.source, track_origins = True)
+
+        config["section"]["value"] = 20
+        self.assertIsNone(config.origin("section:value"))
+
+        del config["section"]
+        self.assertIsNone(config.origin("section:nested:deep"))
+
+        # Replacing a section discards the origins of all the settings within it - even those of the same name
+        config = ConfigParser(self.source, track_origins = True)
+        config["section"] = {"flag": True, "nested": {"deep": 2}}
+        self.assertIsNone(config.origin("section:flag"))
+        self.assertIsNone(config.origin("section:nested:deep"))
+
+        config = ConfigParser(self.source, track_origins = True)
+        config.update({"section": {"value": 20}})
+        config["section"]["value"] = 10
+        self.assertIsNone(config.origin("section:value"))
+        self.assertEqual(config.origin("name"), Origin(None, 1, 1))
+
+        config.parse("\n\nname = second")
+        self.assertEqual(config.origin("name"), Origin(None, 3, 1))
+
+    def test_files(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            shared = os.path.join(directory, "shared.ini")
+            with open(shared, "w") as handle:
+                handle.write("[logging]\n    level = debug\n")
+
+            service = os.path.join(directory, "service.ini")
+            with open(service, "w") as handle:
+                handle.write("[app]\n    %include shared.ini\n    port = 80\n")
+
+            first = ConfigParser(track_origins = True).read(service)
+            self.assertEqual(first.origin("app:port"), Origin(service, 3, 5))
+            self.assertEqual(first.origin("app:logging:level"), Origin(shared, 2, 5))
+
+            # Origins are carried across by update
+            config = ConfigParser("other = 1", track_origins = True)
+            config.update(first)
+            self.assertEqual(config.origin("app:port"), Origin(service, 3, 5))
+            self.assertEqual(config.origin("other"), Origin(None, 1, 1))
+
+    def test_map(self):
+
+        origins = OriginMap()
+        for i in range(10000):
+            origins.record(("section", str(i)), "file.ini", i + 1, 1)
+
+        self.assertEqual(len(origins), 10000)
+        self.assertEqual(origins.lookup(("section", "5000")), Origin("file.ini", 5001, 1))
+        self.assertIsNone(origins.lookup(("section", "10000")))
+
+        origins.discard(("section", "5000"))
+        self.assertIsNone(origins.lookup(("section", "5000")))
+        self.assertEqual(len(origins), 9999)
+
+        # The map is held in compact arrays
+        self.assertLess(origins.nbytes, 10000*40)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+import pyini
+from pyini import ConfigParser, ParseError, Resolvers
+
+class Test_Resolvers(unittest.TestCase):
+
+    def test_environment_and_files(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            secret = os.path.join(directory, "token")
+            with open(secret, "w") as handle:
+                handle.write("s3cret\n")
+
+            with mock.patch.dict(os.environ, {"DB_HOST": "db.internal"}):
+                config = ConfigParser(
+                    "port = 5432\nurl = postgres://{env:DB_HOST}:{port}/\n[auth]\n    token = {file:" + secret + "}\n",
+                    resolvers = {"env": pyini.resolvers.env, "file": pyini.resolvers.file}
+                )
+
+        self.assertEqual(config["url"], "postgres://db.internal:5432/")
+        self.assertEqual(config["auth"]["token"], "s3cret")
+
+        # Config references are still resolved from the config - port wasn't defined when url was read
+        with pytest.raises(ParseError) as info:
+            ConfigParser("url = {env:DB_HOST}:{port}\n", resolvers = {"env": lambda name: "host"})
+        self.assertEqual(info.value.line, 1)
+
+    def test_multiple_references(self):
+
+        config = ConfigParser("a = 1\nb = 2\nc = {a} and {b}, {a}\nd = \\{a\\}\n")
+        self.assertEqual(config["c"], "1 and 2, 1")
+        self.assertEqual(config["d"], "\\{a\\}")
+
+        # Values aren't treated as regular expressions
+        config = ConfigParser("a = $1.*\\\nb = [{a}]\n")
+        self.assertEqual(config["b"], "[$1.*\\]")
+
+    def test_cache(self):
+
+        resolver = mock.Mock(side_effect = lambda name: name.upper())
+        resolvers = Resolvers({"upper": resolver})
+
+        source = "".join("key{} = {{upper:value}}\n".format(i) for i in range(1000))
+        config = ConfigParser(source, resolvers = resolvers)
+
+        self.assertEqual(config["key999"], "VALUE")
+        self.assertEqual(resolver.call_count, 1)
+        self.assertEqual((resolvers.hits, resolvers.misses), (999, 1))
+
+        ConfigParser(source, resolvers = resolvers)
+        self.assertEqual(resolver.call_count, 1)
+
+        resolvers.invalidate("upper")
+        ConfigParser(source, resolvers = resolvers)
+        self.assertEqual(resolver.call_count, 2)
+
+    def test_ttl(self):
+
+        resolver = mock.Mock(return_value = "value")
+        resolvers = Resolvers({"ext": resolver}, ttl = 10)
+
+        with mock.patch("time.monotonic", return_value = 100):
+            ConfigParser("a = {ext:name}\nb = {ext:name}\n", resolvers = resolvers)
+        self.assertEqual(resolver.call_count, 1)
+
+        with mock.patch("time.monotonic", return_value = 111):
+            ConfigParser("a = {ext:name}\n", resolvers = resolvers)
+        self.assertEqual(resolver.call_count, 2)
@@ -0,0 +1,186 @@
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, IncrementalParser, Origin, OriginMap
+
+class Test_Save(unittest.TestCase):
+
+    source = [
+        "# Service configuration",
+        "name = demo  ; the name",
+        "[server]",
+        "    host = localhost  # the host",
+        "    (int) port = 80",
+        "    hosts = a",
+        "        b",
+        "    (int) workers = 4",
+        "[logging]",
+        "    level = debug",
+        "",
+    ]
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.path = os.path.join(self.directory, "service.ini")
+        self.create(os.linesep.join(self.source))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def create(self, content: str, newline: str = os.linesep):
+        with open(self.path, "w", newline = "") as handle:
+            handle.write(content.replace(os.linesep, newline))
+
+    def content(self) -> str:
+        with open(self.path, newline = "") as handle:
+            return handle.read()
+
+    def test_patch(self):
+
+        config = ConfigParser(track_origins = True).read(self.path)
+
+        config["server"]["port"] = 8080
+        config["server"]["hosts"] = "c"
+        del config["logging"]["level"]
+        config.save()
+
+        # Only the lines of the changed settings are rewritten - comments and layout are kept
+        lines = self.source.copy()
+        lines[4:7] = ["    (int) port = 8080", "    hosts = c"]
+        del lines[-2]
+        self.assertEqual(os.linesep.join(lines), self.content())
+
+        self.assertEqual(config, ConfigParser().read(self.path))
+
+        # The origins of the following settings are moved to their new lines
+        self.assertEqual(config.origin("server:workers"), Origin(self.path, 7, 5))
+        self.assertEqual(config.origin("server:hosts"), Origin(self.path, 6, 5))
+
+        # Subsequent saves continue to patch the file
+        config["server"]["workers"] = 8
+        config.save()
+
+        lines[6] = "    (int) workers = 8"
+        self.assertEqual(os.linesep.join(lines), self.content())
+        self.assertEqual(os.listdir(self.directory), ["service.ini"])
+
+    def test_lineEndings(self):
+
+        self.create(os.linesep.join(self.source), "\r\n")
+
+        config = ConfigParser(track_origins = True).read(self.path)
+        config["server"]["hosts"] = "a\nb\nc"
+        config.save()
+
+        lines = self.source.copy()
+        lines[5:7] = ["    hosts = a", "     b", "     c"]
+        self.assertEqual("\r\n".join(lines), self.content())
+        self.assertEqual(config, ConfigParser().read(self.path))
+
+    def test_fullWrite(self):
+
+        config = ConfigParser(track_origins = True).read(self.path)
+
+        # Added settings require the whole config to be written - in the order of the config
+        config["server"]["timeout"] = 30
+        config.save()
+
+        content = self.content()
+        self.assertNotIn("#", content)
+        self.assertTrue(content.startswith("name = demo" + os.linesep + "[server]"))
+        self.assertEqual(config, ConfigParser().read(self.path))
+
+        # The origins of the written settings are recorded - such that the file can be patched once more
+        self.assertEqual(config.origin("server:timeout"), Origin(self.path, 8, 1))
+
+        config["server"]["timeout"] = 60
+        config.save()
+        self.assertEqual(ConfigParser().read(self.path)["server"]["timeout"], 60)
+
+    def test_externalChanges(self):
+
+        config = ConfigParser(track_origins = True).read(self.path)
+        config["server"]["port"] = 8080
+
+        # The file has changed since it was read - its lines no longer match the origins of the config
+        self.create(os.linesep.join(["[server]", "    port = 1", ""]))
+        os.utime(self.path, ns = (0, 0))
+
+        config.save()
+        self.assertEqual(config, ConfigParser().read(self.path))
+
+    def test_paths(self):
+
+        # Untracked configs, and configs mixing content from elsewhere, are written in full
+        config = ConfigParser().read(self.path)
+        config["server"]["port"] = 8080
+        config.save()
+        self.assertEqual(config, ConfigParser().read(self.path))
+
+        config = ConfigParser(track_origins = True).read(self.path)
+        config.parse("extra = 1")
+        config.save()
+        self.assertEqual(ConfigParser().read(self.path)["extra"], "1")
+
+        # A config can be saved to a new file - which it is saved to from then on
+        other = os.path.join(self.directory, "other.ini")
+        config.save(other)
+        config["extra"] = "2"
+        config.save()
+        self.assertEqual(ConfigParser().read(other)["extra"], "2")
+
+        with pytest.raises(ValueError):
+            ConfigParser({"a": 1}).save()
+
+    def test_interpolation(self):
+
+        self.create(os.linesep.join(["a = 1", "b = {a}", "c = 3  # {a}", ""]))
+        config = ConfigParser(track_origins = True).read(self.path)
+
+        # The interpolated setting is written with the value it holds rather than being interpolated again
+        config["a"] = "2"
+        config.save()
+
+        self.assertEqual(ConfigParser().read(self.path), {"a": "2", "b": "1", "c": "3"})
+        self.assertNotIn("#", self.content())
+
+        # Files without interpolated settings continue to be patched
+        config["c"] = "4"
+        config.save()
+        self.assertEqual(ConfigParser().read(self.path), config)
+
+    def test_fed_content(self):
+
+        config = ConfigParser(track_origins = True).read(self.path)
+
+        # Content fed into the config is saved along with the rest of the config
+        parser = IncrementalParser(config)
+        parser.feed("[server]\n    (int) port = 8")
+        parser.feed("080\nextra = 1\n")
+        parser.close()
+        config.save()
+
+        saved = ConfigParser().read(self.path)
+        self.assertEqual(saved, config)
+        self.assertEqual((saved["server"]["port"], saved["server"]["extra"]), (8080, "1"))
+
+class Test_OriginMapSpans(unittest.TestCase):
+
+    def test_shift(self):
+
+        origins = OriginMap()
+        origins.record(("a",), "file.ini", 1)
+        origins.record(("b",), "file.ini", 2, 1, 3)
+        origins.record(("c",), "file.ini", 5)
+        origins.record(("d",), "file.ini", 9)
+        origins.record(("e",), "other.ini", 9)
+
+        self.assertEqual(origins.extent(("b",)), ("file.ini", 2, 1, 3))
+
+        origins.shift({"file.ini"}, [(4, -2), (6, 1)])
+
+        self.assertEqual([origins.lookup((key,)).line for key in "abcde"], [1, 2, 3, 8, 9])
@@ -0,0 +1,102 @@
+import typing
+import dataclasses
+import unittest
+
+import pytest
+
+from pyini import ConfigParser, Schema, SchemaError
+
+@dataclasses.dataclass
+class Pool:
+    minimum: int = 1
+    maximum: int = 10
+
+@dataclasses.dataclass
+class Database:
+    host: str
+    port: int
+    debug: bool = False
+    replicas: typing.List[str] = dataclasses.field(default_factory = list)
+    timeout: typing.Optional[float] = None
+    display_name: str = dataclasses.field(default = "", metadata = {"key": "display name"})
+    pool: Pool = dataclasses.field(default_factory = Pool)
+
+class Service(typing.TypedDict):
+    name: str
+    ports: typing.Tuple[int, ...]
+
+class Test_Schema(unittest.TestCase):
+
+    def test_load_dataclass(self):
+
+        database = Schema(Database, section = "database").parse("""
+[database]
+    host = localhost
+    port = 5432
+    debug = yes
+    replicas = one, two
+    display name = "Main database"
+    [pool]
+        (int) maximum = 20
+""")
+
+        self.assertEqual(database.host, "localhost")
+        self.assertEqual(database.port, 5432)
+        self.assertIs(database.debug, True)
+        self.assertEqual(database.replicas, ["one", "two"])
+        self.assertIsNone(database.timeout)
+        self.assertEqual(database.display_name, "Main database")
+        self.assertEqual((database.pool.minimum, database.pool.maximum), (1, 20))
+
+        # The records are slotted
+        self.assertFalse(hasattr(database, "__dict__"))
+        with pytest.raises(AttributeError):
+            database.unknown = 1
+
+        self.assertEqual(database._asdict()["pool"], {"minimum": 1, "maximum": 20})
+        self.assertEqual(type(database).__name__, "Database")
+
+    def test_load_config(self):
+
+        config = ConfigParser({"name": "api", "ports": ["80", 443]})
+        schema = Schema(Service)
+        service = schema.load(config)
+
+        self.assertEqual(service.name, "api")
+        self.assertEqual(service.ports, (80, 443))
+
+        self.assertEqual(service, schema.load({"name": "api", "ports": "80, 443"}))
+
+    def test_all_problems_reported(self):
+
+        with pytest.raises(SchemaError) as info:
+            Schema(Database, section = "database").parse("""
+[database]
+    port = eighty
+    debug = perhaps
+    (int) timeout = never
+    [pool]
+        maximum = lots
+""")
+
+        issues = {issue.path: issue for issue in info.value.issues}
+
+        self.assertEqual(set(issues), {
+            "database:host", "database:port", "database:debug", "database:timeout", "database:pool:maximum"
+        })
+
+        self.assertIsNone(issues["database:host"].line)
+        self.assertEqual(issues["database:port"].line, 3)
+        self.assertEqual(issues["database:debug"].line, 4)
+        self.assertEqual(issues["database:timeout"].line, 5)
+        self.assertEqual(issues["database:pool:maximum"].line, 7)
+
+        self.assertIn("database:port (line 3)", str(info.value))
+        self.assertIsInstance(info.value, ValueError)
+
+    def test_missing_section(self):
+
+        with pytest.raises(SchemaError) as info:
+            Schema(Database, section = "database").parse("[other]\n    key = value\n")
+
+        self.assertEqual(info.value.issues[0].path, "database")
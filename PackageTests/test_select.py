@@ -0,0 +1,81 @@
+import unittest
+
+from pyini import ConfigParser
+
+class Test_Select(unittest.TestCase):
+
+    def setUp(self):
+        self.config = ConfigParser(r"""
+        connect_timeout = 5
+        [servers]
+            [alpha]
+                (int) port = 8080
+                read_timeout = 10
+            [beta]
+                (int) port = 8081
+        [clients]
+            (int) port = 9000
+            [pool]
+                idle_timeout = 30
+        """)
+
+    def test_wildcard(self):
+
+        self.assertEqual(self.config.select("servers:*:port"), {"servers:alpha:port": 8080, "servers:beta:port": 8081})
+        self.assertEqual(self.config.select("servers:alpha:port"), {"servers:alpha:port": 8080})
+        self.assertEqual(self.config.select("servers:?????:port"), {"servers:alpha:port": 8080})
+        self.assertEqual(self.config.select("servers:*:missing"), {})
+
+    def test_recursive_wildcard(self):
+
+        self.assertEqual(
+            self.config.select("**:*_timeout"),
+            {
+                "connect_timeout": "5",
+                "servers:alpha:read_timeout": "10",
+                "clients:pool:idle_timeout": "30"
+            }
+        )
+
+        self.assertEqual(set(self.config.select("**:port")), {"servers:alpha:port", "servers:beta:port", "clients:port"})
+        self.assertEqual(set(self.config.select("clients:**")), {"clients:port", "clients:pool", "clients:pool:idle_timeout"})
+
+    def test_index_invalidation(self):
+
+        self.assertEqual(len(self.config.select("**:port")), 3)
+
+        # Adding and removing keys - directly and within nested sections
+        self.config["servers"]["gamma"] = {"port": 8082}
+        self.assertEqual(self.config.select("servers:gamma:port"), {"servers:gamma:port": 8082})
+
+        del self.config["clients"]
+        self.assertEqual(len(self.config.select("**:port")), 3)
+
+        self.config["servers"]["alpha"].pop("port")
+        self.config.parse("[servers]\n    [delta]\n        port = 1")
+        self.assertEqual(set(self.config.select("**:port")), {"servers:beta:port", "servers:gamma:port", "servers:delta:port"})
+
+        # Changes of values are reflected without any change to the index
+        self.config["servers"]["beta"]["port"] = 1
+        self.assertEqual(self.config.select("servers:beta:port"), {"servers:beta:port": 1})
+
+    def test_detached_sections(self):
+
+        alpha = self.config["servers"]["alpha"]
+        self.config["servers"]["copy"] = alpha
+
+        # Sections belonging to the config are copied when placed elsewhere
+        self.assertIsNot(self.config["servers"]["copy"], alpha)
+
+        del self.config["servers"]["alpha"]
+        self.config.select("**:port")
+        alpha["another"] = 10
+        self.assertEqual(self.config.select("**:another"), {})
+
+    def test_non_string_keys(self):
+
+        config = ConfigParser({1: {"x": 1}, "a": {2: "y"}})
+
+        self.assertEqual(config.select("**:x"), {"1:x": 1})
+        self.assertEqual(config.select("a:*"), {"a:2": "y"})
+        self.assertEqual(config.select("a:2"), {"a:2": "y"})
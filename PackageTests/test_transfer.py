@@ -0,0 +1,153 @@
+import copy
+import math
+import array
+import pickle
+import unittest
+import concurrent.futures
+
+import pytest
+
+from pyini import ConfigParser, Resolvers
+from pyini import transfer
+
+def _secret(name: str) -> str:
+    return "hunter2"
+
+def _received(config: ConfigParser) -> (int, int, str):
+    """ Report the registry of the worker process receiving the config """
+    return transfer.registry.hits, config["section 1"]["port"], config.fingerprint()
+
+class Test_Pickling(unittest.TestCase):
+
+    source = "".join(
+        "[section {0}]\n    host = localhost\n    (int) port = {0}\n    (tuple<int>) ids = 1, 2\n".format(i)
+        for i in range(200)
+    )
+
+    def test_round_trip(self):
+
+        config = ConfigParser(self.source, delimiter = ",", track_origins = True)
+        config["binary"] = {1: b"\x00", "values": array.array("i", [1, 2])}
+
+        duplicate = pickle.loads(pickle.dumps(config))
+
+        self.assertEqual(duplicate, config)
+        self.assertIsNot(duplicate["section 1"], config["section 1"])
+        self.assertEqual(duplicate.origin("section 1:port"), config.origin("section 1:port"))
+        self.assertEqual(duplicate.fingerprint(), config.fingerprint())
+
+        # The copy's sections belong to the copy
+        self.assertIs(duplicate["section 1"]._owner, duplicate)
+        self.assertEqual(duplicate["section 1"]._path(), ("section 1",))
+
+    def test_lazy(self):
+
+        config = ConfigParser("(int) valid = 1\n(int) invalid = one\n", lazy = True)
+        duplicate = copy.deepcopy(config)
+
+        self.assertEqual(duplicate["valid"], 1)
+        with pytest.raises(ValueError):
+            duplicate["invalid"]
+
+    def test_namespace(self):
+
+        # Modules of the namespace are carried by name
+        config = ConfigParser("(eval) root = math.sqrt(4)", safe = False, lazy = True, namespace = {"math": math})
+        duplicate = pickle.loads(pickle.dumps(config))
+
+        self.assertIs(duplicate._namespace["math"], math)
+        self.assertEqual(duplicate["root"], 2.0)
+
+    def test_resolvers(self):
+
+        config = ConfigParser("password = {secret:db}", resolvers = Resolvers({"secret": _secret}))
+        del config["password"]
+
+        # Resolved values are not carried across - only the resolvers themselves
+        payload = pickle.dumps(config)
+        self.assertNotIn(b"hunter2", payload)
+
+        duplicate = pickle.loads(payload)
+        self.assertEqual(duplicate._resolvers._cache, {})
+        self.assertEqual(duplicate.parse("password = {secret:db}")["password"], "hunter2")
+
+    def test_compact(self):
+
+        config = ConfigParser(self.source)
+
+        # Repeated keys and strings are written once
+        nested = {key: dict(value) for key, value in config.items()}
+        self.assertLess(len(pickle.dumps(config)), len(pickle.dumps(nested)))
+
+class Test_References(unittest.TestCase):
+
+    def setUp(self):
+        transfer.registry.clear()
+
+    def test_reference(self):
+
+        config = ConfigParser("[section 1]\n    (int) port = 80\n")
+        reference = config.reference()
+
+        self.assertIn(reference.key, transfer.registry)
+        self.assertTrue(reference.key.startswith(config.fingerprint()))
+
+        # The process already holds the config - the payload isn't deserialized
+        self.assertIs(pickle.loads(pickle.dumps(reference)), config)
+
+        # A fingerprint only reference is smaller than the config
+        light = pickle.dumps(config.reference(payload = False))
+        self.assertLess(len(light), len(pickle.dumps(config)))
+
+        # Modifying the held config invalidates its registration
+        config["section 1"]["port"] = 81
+        with pytest.raises(LookupError):
+            pickle.loads(light)
+
+    def test_options(self):
+
+        content = "[section 1]\n    (int) port = 80\n"
+        unsafe = ConfigParser(content, safe = False, delimiter = ";")
+        config = ConfigParser(content)
+        self.assertEqual(unsafe.fingerprint(), config.fingerprint())
+
+        # Configs of the same content parsed with different options are held separately
+        pickle.loads(pickle.dumps(unsafe.reference()))
+        reference = config.reference()
+        self.assertNotEqual(reference.key, unsafe.reference().key)
+
+        received = pickle.loads(pickle.dumps(reference))
+        self.assertIs(received, config)
+        self.assertTrue(received._safe)
+        self.assertEqual(received._delimiter, ",")
+
+        registry = transfer.ConfigRegistry()
+        registry.register(config)
+        self.assertIsNone(registry.get(transfer.key(ConfigParser(content, lazy = True))))
+
+        # The options are identified the same way between processes
+        self.assertEqual(transfer.key(config), transfer.key(pickle.loads(pickle.dumps(config))))
+
+    def test_processes(self):
+
+        config = ConfigParser("[section 1]\n    (int) port = 80\n")
+        reference = config.reference()
+
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            first = executor.submit(_received, reference).result()
+            second = executor.submit(_received, reference).result()
+            third = executor.submit(_received, config.reference(payload = False)).result()
+
+        self.assertEqual(first[1:], (80, config.fingerprint()))
+        self.assertEqual(second[0], first[0] + 1)
+        self.assertEqual(third[0], first[0] + 2)
+
+    def test_registry_bounded(self):
+
+        registry = transfer.ConfigRegistry(maxsize = 2)
+        configs = [ConfigParser({"value": i}) for i in range(3)]
+        fingerprints = [registry.register(config) for config in configs]
+
+        self.assertEqual(len(registry), 2)
+        self.assertIsNone(registry.get(fingerprints[0]))
+        self.assertIs(registry.get(fingerprints[2]), configs[2])
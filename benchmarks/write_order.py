@@ -0,0 +1,46 @@
+""" Compare the sorted and insertion ordered modes of ConfigParser.write on wide sections of typed values
+
+    python benchmarks/write_order.py [keys]
+"""
+
+import io
+import os
+import sys
+import random
+import timeit
+
+# Run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyini import ConfigParser
+
+def value(i: int) -> object:
+    """ A setting value of one of the types commonly held by configs """
+    return (str(i), i, i/4, bool(i % 2), [i, i + 1, i + 2], ["host{}".format(i), "backup{}".format(i)])[i % 6]
+
+def build(keys: int) -> ConfigParser:
+    """ Build a config of a wide root section and wide nested sections of typed settings, with keys added in a random
+    order """
+    names = ["key {:07d}".format(i) for i in range(keys)]
+    random.Random(0).shuffle(names)
+
+    config = ConfigParser()
+    config.update({name: value(i) for i, name in enumerate(names)})
+    config["section"] = {
+        "inner": {name: value(i) for i, name in enumerate(names)},
+        "servers": {
+            "server {}".format(i): {"host": "10.0.0.{}".format(i % 256), "port": 8000 + i, "weights": [1.0, 0.5]}
+            for i in range(keys // 10)
+        }
+    }
+    return config
+
+def main(keys: int = 100000, repeat: int = 5):
+    config = build(keys)
+
+    for sort in (True, False):
+        seconds = min(timeit.repeat(lambda: config.write(io.StringIO(), sort = sort), number = 1, repeat = repeat))
+        print("sort={!s:<5} {:8.3f}s  ({} keys per section)".format(sort, seconds, keys))
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
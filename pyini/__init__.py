@@ -1 +1,13 @@
-from .configparser import ConfigParser
\ No newline at end of file
+from .configparser import ConfigParser, ConfigDiff, ParseError, LimitExceeded
+from .frozen import FrozenConfig
+from .intern import InternPool
+from .compiled import compile_to_module, load_compiled
+from .incremental import IncrementalParser
+from .schema import Schema, SchemaError
+from .origins import Origin, OriginMap
+from .transfer import ConfigReference
+from .memory import MemoryReport
+from .accessor import Accessor
+from .resolvers import Resolvers
+from . import resolvers
+from .limits import Limits
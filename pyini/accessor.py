@@ -0,0 +1,68 @@
+from .section import Section, Deferred
+
+class Accessor:
+    """ A precompiled lookup of the value at a path within a config. The path is split once and the section holding
+    the value is cached, such that a lookup is a single dictionary access. The cached section is discarded when any
+    section of the config is replaced or removed (which may have detached it from the config) - changes to settings, the
+    addition of keys and changes to other configs do not discard it.
+
+    Parameters:
+        config (ConfigParser): The config to look up the value within
+        path (str): A colon delimited path of key names
+    """
+
+    __slots__ = ("path", "_config", "_parents", "_key", "_node", "_releases")
+
+    def __init__(self, config: object, path: str):
+        keys = path.split(":")
+
+        self.path = path
+        self._config = config
+        self._parents = tuple(keys[:-1])
+        self._key = keys[-1]
+        self._node = None  # The section holding the value
+        self._releases = -1  # The config's count of section releases when the section was found
+
+    def __repr__(self): return "<Accessor {}>".format(self.path)
+
+    def __call__(self, default: object = None) -> object:
+        """ Collect the value at the accessor's path
+
+        Params:
+            default (object): The value to return if the path doesn't exist
+
+        Returns:
+            object: The value at the path, or the default
+        """
+
+        node = self._node
+        if node is None or self._releases != self._config._releases:
+            node = self._locate()
+            if node is None: return default
+
+        value = dict.get(node, self._key, default)
+        if type(value) is Deferred: value = node[self._key]  # Resolve the value through the section
+        return value
+
+    get = __call__
+
+    def _locate(self) -> Section:
+        """ Walk the config to the section holding the accessor's value, caching it
+
+        Returns:
+            Section: The section, or None if the path to the section doesn't exist
+        """
+
+        releases = self._config._releases
+
+        node = self._config._elements
+        for key in self._parents:
+            node = dict.get(node, key)
+            if not isinstance(node, Section):
+                # The path doesn't exist (yet) - sections may be added without discarding a cached section, so a
+                # missing section is not cached
+                self._node = None
+                return None
+
+        self._node, self._releases = node, releases
+        return node
@@ -0,0 +1,221 @@
+import os
+import sys
+import glob
+import json
+import array
+import base64
+import argparse
+import contextlib
+import collections.abc
+import concurrent.futures
+
+from .configparser import ConfigParser, ParseError
+
+_MISSING = object()  # Stands in for a missing setting value
+
+def main(argv: [str] = None) -> int:
+    """ Run the pyini command line interface. Each file named (or matched by a glob pattern) is processed by the command
+    and a JSON line describing the result is written to stdout for each file, in the order the files were given.
+
+    Commands:
+        validate: Parse the files, reporting any that are invalid
+        get <path>: Report the value of the setting at the colon delimited path within each file
+        to-json: Report the content of each file as JSON
+        fmt: Report the files whose content differs from the parser's written form - rewriting them with --write
+
+    Params:
+        argv ([str]): The command line arguments - defaults to sys.argv
+
+    Returns:
+        int: The exit status - 0 when every file succeeded, 1 when any file failed (or would be reformatted) and 2
+            for incorrect usage
+    """
+
+    arguments = _arguments().parse_args(argv)
+
+    entries = _expand(arguments.files)
+    results = _run([(path, arguments) for path, matched in entries if matched], arguments.jobs)
+
+    failed = False
+    try:
+        # The records of patterns that didn't match any file are written in the position of the pattern
+        for path, matched in entries:
+            ok, record = next(results) if matched else (False, {
+                "file": path, "ok": False, "line": None, "error": "No files matched"
+            })
+            failed = failed or not ok
+            _emit(record)
+
+    except BrokenPipeError:
+        # The consumer stopped reading (e.g. `| head`) - stdout is pointed at devnull so that python's flush of stdout
+        # on exit doesn't fail once more
+        results.close()
+        with contextlib.suppress(OSError, ValueError):
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            os.close(devnull)
+
+    return 1 if failed else 0
+
+def _arguments() -> argparse.ArgumentParser:
+    """ Define the command line arguments """
+
+    parser = argparse.ArgumentParser(prog = "pyini", description = "Validate, query and convert ini config files.")
+    parser.add_argument("-j", "--jobs", type = _positive, help = "Worker processes - defaults to the cpu count")
+    parser.add_argument("--unsafe", action = "store_true", help = "Evaluate eval settings")
+    parser.add_argument("--lazy", action = "store_true", help = "Skip the conversion of typed settings unless required")
+
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    validate = commands.add_parser("validate", help = "Parse the files, reporting those that are invalid")
+    validate.add_argument("files", nargs = "+")
+
+    get = commands.add_parser("get", help = "Report the value at a path within each file")
+    get.add_argument("path", help = "A colon delimited path of key names e.g. section:setting")
+    get.add_argument("files", nargs = "+")
+
+    tojson = commands.add_parser("to-json", help = "Report the content of each file as JSON")
+    tojson.add_argument("files", nargs = "+")
+
+    fmt = commands.add_parser("fmt", help = "Report (or rewrite) files not in the parser's written form")
+    fmt.add_argument("--write", action = "store_true", help = "Rewrite the files - note, comments are not preserved")
+    fmt.add_argument("--keep-order", action = "store_true", help = "Keep the order of the settings - don't sort them")
+    fmt.add_argument("files", nargs = "+")
+
+    return parser
+
+def _positive(text: str) -> int:
+    """ Convert a command line argument into an integer of at least 1
+
+    Raises:
+        argparse.ArgumentTypeError: In the event that the argument isn't a positive integer
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+
+    if value < 1: raise argparse.ArgumentTypeError("must be an integer of at least 1: {!r}".format(text))
+    return value
+
+def _expand(patterns: [str]) -> [(str, bool)]:
+    """ Expand the glob patterns provided into file paths, removing duplicates while keeping their order
+
+    Params:
+        patterns ([str]): The file paths and glob patterns
+
+    Returns:
+        [(str, bool)]: Each file path (True) and each pattern that didn't match any file (False), in the order given
+    """
+
+    entries, seen = [], set()
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern, recursive = True)) if glob.has_magic(pattern) else [pattern]
+        matched = [path for path in matched if not os.path.isdir(path)]
+
+        if not matched: entries.append((pattern, False))
+
+        for path in matched:
+            if path not in seen:
+                seen.add(path)
+                entries.append((path, True))
+
+    return entries
+
+def _run(tasks: list, jobs: int = None) -> iter:
+    """ Process the tasks, in parallel across worker processes when there is enough work to warrant starting them
+
+    Params:
+        tasks (list): The tasks to process
+        jobs (int): The number of worker processes - defaults to the cpu count
+
+    Yields:
+        (bool, dict): Whether each task succeeded and its record - in the order of the tasks
+    """
+
+    jobs = jobs or os.cpu_count() or 1
+
+    # Starting worker processes costs far more than parsing a handful of files - small runs are processed in-process
+    if jobs == 1 or len(tasks) < 2*jobs:
+        yield from map(_process, tasks)
+        return
+
+    # Tasks are sent to the workers in chunks to amortise the cost of communicating with them
+    chunksize = max(1, len(tasks) // (jobs*4))
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        yield from executor.map(_process, tasks, chunksize = chunksize)
+
+def _process(task: tuple) -> (bool, dict):
+    """ Carry out the command for a single file
+
+    Params:
+        task (tuple): The file path and the command line arguments
+
+    Returns:
+        bool: Whether the command succeeded
+        dict: The record of the result
+    """
+
+    path, arguments = task
+
+    try:
+        config = ConfigParser(safe = not arguments.unsafe, lazy = arguments.lazy).read(path)
+
+        if arguments.command == "validate":
+            if not arguments.lazy: config.materialize()
+            return True, {"file": path, "ok": True}
+
+        elif arguments.command == "get":
+            value = config.get(arguments.path, _MISSING)
+            if value is _MISSING:
+                error = "No setting at path: {}".format(arguments.path)
+                return False, {"file": path, "ok": False, "line": None, "error": error}
+            return True, {"file": path, "ok": True, "path": arguments.path, "value": _jsonable(value)}
+
+        elif arguments.command == "to-json":
+            return True, {"file": path, "ok": True, "config": _jsonable(config)}
+
+        elif arguments.command == "fmt":
+            with open(path, encoding = "utf-8", newline = "") as handle:
+                formatted = config.write(sort = not arguments.keep_order)
+                changed = handle.read() != formatted
+
+            if changed and arguments.write:
+                with open(path, "w", encoding = "utf-8", newline = "") as handle:
+                    handle.write(formatted)
+
+            ok = not changed or arguments.write
+            return ok, {"file": path, "ok": ok, "changed": changed}
+
+    except ParseError as e:
+        return False, {"file": path, "ok": False, "line": e.line, "error": e.message}
+
+    except (OSError, ValueError, TypeError) as e:
+        return False, {"file": path, "ok": False, "line": None, "error": str(e)}
+
+def _jsonable(value: object) -> object:
+    """ Convert a setting value into a value that can be expressed in JSON
+
+    Params:
+        value (object): The setting value
+
+    Returns:
+        object: A value composed of JSON types
+    """
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, collections.abc.Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return [_jsonable(item) for item in value]
+    elif isinstance(value, array.array):
+        return value.tolist()
+    elif isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    return repr(value)
+
+def _emit(record: dict):
+    """ Write a result record to stdout as a JSON line """
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()  # Results are streamed to the consumer as they are produced
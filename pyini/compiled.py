@@ -0,0 +1,159 @@
+import os
+import array
+import hashlib
+import py_compile
+import importlib.util
+
+from .configparser import ConfigParser
+from . import patch
+
+def compile_to_module(ini_path: str, out_py: str, **options) -> str:
+    """ Parse the config file and write its converted content as a python module of literals, such that later loads of
+    the config are an import of the module (and with the bytecode cache, an unmarshal of its content).
+
+    The module records the fingerprint of the config file it was generated from, allowing load_compiled to detect when
+    the module is stale.
+
+    Params:
+        ini_path (str): The path of the config file
+        out_py (str): The path of the python module to be written
+        **options: The keyword arguments for the ConfigParser that parses the file
+
+    Returns:
+        str: The path of the module written
+
+    Raises:
+        TypeError: In the event that a setting's value cannot be expressed as a literal
+    """
+
+    with open(ini_path, "rb") as handle:
+        content = handle.read()
+
+    status = os.stat(ini_path)
+    config = ConfigParser(**options).read(ini_path)
+
+    lines = [
+        "# Generated by pyini from {} - do not edit".format(os.path.basename(ini_path)),
+        "from array import array",
+        "",
+        "FINGERPRINT = {!r}".format(hashlib.blake2b(content).hexdigest()),
+        "MTIME_NS = {!r}".format(status.st_mtime_ns),
+        "SIZE = {!r}".format(status.st_size),
+        "OPTIONS = {!r}".format(_optionsKey(options)),
+        "",
+        "CONFIG = {}".format(_literal(config)),
+        ""
+    ]
+
+    # Write the module atomically so that a concurrent loader never reads a partially written module
+    with patch.replacing(out_py, encoding = "utf-8") as handle:
+        handle.write("\n".join(lines))
+
+    # Compile the bytecode with a hash of the source - a module regenerated within the same second as its previous
+    # version would otherwise be indistinguishable to a timestamp based bytecode cache
+    py_compile.compile(out_py, doraise = True, invalidation_mode = py_compile.PycInvalidationMode.CHECKED_HASH)
+
+    return out_py
+
+def load_compiled(ini_path: str, out_py: str, **options) -> ConfigParser:
+    """ Load a config from the module compiled from it, (re)generating the module when it is missing, was generated
+    with different options or is stale relative to the config file.
+
+    Note: Only the fingerprint of the config file itself is checked - changes to files it includes aren't detected
+
+    Params:
+        ini_path (str): The path of the config file
+        out_py (str): The path of the compiled python module
+        **options: The keyword arguments for the ConfigParser
+
+    Returns:
+        ConfigParser: The config
+
+    Raises:
+        ImportError: In the event that the regenerated module cannot be imported
+    """
+
+    try:
+        module = _import(out_py) if os.path.exists(out_py) else None
+    except Exception:
+        module = None  # The module is broken - it shall be regenerated
+
+    if module is None or not _isCurrent(module, ini_path, options):
+        compile_to_module(ini_path, out_py, **options)
+        try:
+            module = _import(out_py)
+        except Exception as e:
+            raise ImportError("The module {} compiled from {} cannot be imported".format(out_py, ini_path)) from e
+
+    return ConfigParser(module.CONFIG, **options)
+
+def _import(path: str) -> object:
+    """ Import the python module at the path provided without registering it as a module """
+    name = "_pyini_compiled_{}".format(hashlib.blake2b(os.path.abspath(path).encode(), digest_size = 8).hexdigest())
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _isCurrent(module: object, ini_path: str, options: dict) -> bool:
+    """ Determine whether a compiled module reflects the current content of the config file
+
+    Params:
+        module (module): The compiled module
+        ini_path (str): The path of the config file
+        options (dict): The options the config is to be loaded with
+
+    Returns:
+        bool: True when the module is up to date
+    """
+
+    if getattr(module, "OPTIONS", None) != _optionsKey(options): return False
+
+    # The file's modification time and size are checked before the more expensive digest of its content
+    status = os.stat(ini_path)
+    if (module.MTIME_NS, module.SIZE) == (status.st_mtime_ns, status.st_size): return True
+
+    with open(ini_path, "rb") as handle:
+        return hashlib.blake2b(handle.read()).hexdigest() == module.FINGERPRINT
+
+def _optionsKey(options: dict) -> str:
+    """ A comparable representation of the parser options that is stable between processes - option objects (such as
+    Limits and Resolvers) are represented by their content rather than their address, and options that don't affect
+    the parsed content (the intern pool and origin tracking) are excluded """
+    return "{:032x}".format(ConfigParser(**options)._settingsDigest())
+
+def _literal(value: object) -> str:
+    """ Generate python source that evaluates to the value provided
+
+    Params:
+        value (object): The value to be expressed
+
+    Returns:
+        str: The python source
+
+    Raises:
+        TypeError: In the event that the value cannot be expressed as source
+    """
+
+    if value is None or type(value) in (bool, str, bytes, int, range):
+        return repr(value)
+    elif type(value) is float:
+        return repr(value) if value == value and value not in (float("inf"), float("-inf")) else "float({!r})".format(str(value))
+    elif type(value) is complex:
+        return "complex({!r})".format(str(value))
+    elif isinstance(value, (dict, ConfigParser)):
+        return "{" + ", ".join("{}: {}".format(_literal(k), _literal(v)) for k, v in value.items()) + "}"
+    elif isinstance(value, list):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    elif isinstance(value, tuple):
+        return "(" + "".join(_literal(v) + ", " for v in value) + ")"
+    elif isinstance(value, set):
+        return "{" + ", ".join(_literal(v) for v in value) + "}" if value else "set()"
+    elif isinstance(value, frozenset):
+        return "frozenset({})".format(_literal(set(value)))
+    elif isinstance(value, bytearray):
+        return "bytearray({!r})".format(bytes(value))
+    elif isinstance(value, array.array):
+        return "array({!r}, {})".format(value.typecode, _literal(value.tolist()))
+
+    raise TypeError("Setting value of type {} cannot be compiled: {!r}".format(type(value).__name__, value))
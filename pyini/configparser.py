@@ -1,29 +1,143 @@
 import os
 import io
 import re
+import ast
+import array
+import types
+import base64
+import codecs
+import pickle
+import fnmatch
+import functools
+import contextlib
+import importlib
 import collections.abc
 
+from .frozen import FrozenConfig
+from .intern import InternPool
+from .section import Section, Deferred, digest
+from .observers import ChangeDispatcher, Subscription
+from .origins import OriginMap, Origin
+from .accessor import Accessor
+from .resolvers import Resolvers
+from .limits import Limits
+from . import include
+from . import transfer
+from . import memory
+from . import patch
+
 class ConsistencyError(Exception):
     """ A warning that the internal consistency of the config parser has broken
     down
     """
     pass
 
+class ParseError(ValueError):
+    """ An error in the content of a config being parsed
+
+    Parameters:
+        message (str): Description of the error
+        line (int): The line number the error was found on
+        source (str): The name of the file being parsed, if known
+        offset (int): The byte offset of the line within binary content
+    """
+
+    def __init__(self, message: str, line: int = None, source: str = None, offset: int = None):
+        self.message = message
+        self.line = line
+        self.source = source
+        self.offset = offset
+
+        if source is not None: message = "{}: {}".format(source, message)
+        if offset is not None: message = "{} (byte offset {})".format(message, offset)
+        super().__init__(message)
+
+class LimitExceeded(ParseError):
+    """ Raised when parsing a config exceeds one of the parser's limits - see Limits """
+
+class _ModuleReference:
+    """ Stands in for a module within a pickled namespace - modules cannot be pickled, so the reference unpickles into
+    the module by importing it by name
+
+    Parameters:
+        module (module): The module being referenced
+    """
+
+    def __init__(self, module: types.ModuleType):
+        self.name = module.__name__
+
+    def __reduce__(self): return (importlib.import_module, (self.name,))
+
+class ParseState:
+    """ The state of the parsing of a source that is carried from one line to the next
+
+    Parameters:
+        source (str): The filepath of the source, if known
+        including (tuple): The absolute filepaths of the files being parsed that have led to this source
+        directory (str): The directory included files are resolved relative to
+    """
+
+    __slots__ = (
+        "source", "including", "directory", "scope_stack", "setting", "line_index", "offset", "size", "settings",
+        "expanded"
+    )
+
+    def __init__(self, source: str, including: tuple, directory: str):
+        self.source = source
+        self.including = including
+        self.directory = directory
+
+        # Holds current indentation for section headers - e.g ["header", None, None, "sub header"]. Scope shall reduce
+        # the scope stack.
+        self.scope_stack = []
+
+        # Currently examined setting container - holds name and points to value
+        self.setting = None
+
+        # Line counter / represents the line number of the file being read
+        self.line_index = 0
+
+        # The byte offset of the line being read - when reading binary content
+        self.offset = None
+
+        # The number of characters and settings read, and of characters interpolated - only counted when the parser
+        # has limits
+        self.size = 0
+        self.settings = 0
+        self.expanded = 0
+
 class Setting:
     """ A setting value within the a config file. A key value representation
     that holds its scope
     """
 
-    def __init__(self, scope: [str], line: int, name: str, value: object, type: str = None):
+    def __init__(
+        self,
+        scope: [str],
+        line: int,
+        name: str,
+        value: object,
+        type: str = None,
+        source: str = None,
+        offset: int = None,
+        column: int = None
+    ):
         self.scope = scope
         self.line = line
         self.name = name
         self.value = value
         self.type = type
+        self.source = source
+        self.offset = offset
+        self.column = column
+        self.end = line  # The last line of the setting - extended by continuation lines
 
     def __repr__(self):
         return "line {} in {}: ({}) {} = {}".format(self.line, self.scope, self.type, self.name, self.value)
 
+ConfigDiff = collections.namedtuple("ConfigDiff", ("added", "removed", "changed"))
+ConfigDiff.__doc__ = """ The colon delimited paths that have been added, removed and changed between two configs """
+
 class ConfigParser(collections.abc.MutableMapping):
     """ This is an implementation of the global ini configuration format
 
@@ -37,6 +151,18 @@ class ConfigParser(collections.abc.MutableMapping):
             such that they can be treated as a tab char
         delimiter (str): The char(s) used to delimite sequences within the
             configuration file
+        pool (InternPool): A pool shared between configs in which parsed
+            keys and immutable values are deduplicated
+        lazy (bool): Defer the conversion of typed settings until they are
+            first accessed
+        namespace (dict): The global namespace eval settings are evaluated
+            within - include "__builtins__" to restrict the builtins available
+        track_origins (bool): Record the source, line and column of each
+            setting read - see origin
+        resolvers (Resolvers / dict): Resolvers of interpolated references
+            to values outside of the config, by the prefix of the references
+        limits (Limits): Bounds on the resources parsing may consume - for
+            configs from untrusted sources
 
     Raises:
         ValueError: In the event that the source provided does not have a
@@ -44,19 +170,35 @@ class ConfigParser(collections.abc.MutableMapping):
     """
 
     _rxComments = re.compile(r"[#;].*")  # Identifies comments and all following characters
+    _rxCommentChars = re.compile(r"[#;\"'\\]")  # Characters that may open a comment or change how one is read
 
     _rxEmptyLine = re.compile(r"^\s*$")
     _rxWhiteSpace = re.compile(r"^\s*")
 
+    _rxBinaryLine = re.compile(rb"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")  # A line of binary content and its line ending
+
+    _boms = (
+        (codecs.BOM_UTF32_LE, "utf-32-le"),  # Precedes utf-16-le as its byte order mark begins with utf-16-le's
+        (codecs.BOM_UTF32_BE, "utf-32-be"),
+        (codecs.BOM_UTF8, "utf-8"),
+        (codecs.BOM_UTF16_LE, "utf-16-le"),
+        (codecs.BOM_UTF16_BE, "utf-16-be"),
+    )
+
     _rxSection = re.compile(r"^\[(?P<header>.+)\]$")
+    _rxInclude = re.compile(r"^%include\s+(?P<path>.+)$")
     _rxEquality = re.compile(r"^(\((?P<type>[^\({}\)=:\n]+)\))?\s*(?P<name>[^\({}\)=:\n]+)\s*[=:]\s*(?P<value>.*)$")
 
-    _rxInterpolation = re.compile(r"{(.*)[^\\]}")
+    _rxInterpolation = re.compile(r"{(?P<path>[^{}]*[^{}\\])}")  # A reference - not closed by an escaped brace
 
     _rxType = re.compile(r"^(?P<type>[\w\.]+)(<(?P<sub_type>[^>]+)>)?$")
 
+    _rxWildcard = re.compile(r"[\*\?\[]")  # Identifies a key name pattern that contains wildcards
+
     _max_line_length = 120
 
+    _array_typecodes = "bBhHiIlLqQfd"  # The numeric array.array typecodes that can be used as array sub types
+
     def __init__(
         self,
         source: object = {},
@@ -65,15 +207,36 @@ class ConfigParser(collections.abc.MutableMapping):
         delimiter: str = ",",
         join: str = os.linesep,
         default: object = True,
-        safe: bool = True
+        safe: bool = True,
+        pool: InternPool = None,
+        lazy: bool = False,
+        namespace: dict = None,
+        track_origins: bool = False,
+        resolvers: Resolvers = None,
+        limits: Limits = None
     ):
 
-        self._elements = {}  # The dictionary containing the content
+        self._elements = Section(owner = self)  # The dictionary containing the content
+        self._index = None  # Key name to the paths of that key within the config - built on demand
+        self._releases = 0  # The number of sections replaced/removed from the config - see Accessor
+        self._observers = ChangeDispatcher()  # Subscriptions to the changes of the config
+        self._changes = None  # The paths changed within the currently open batch of changes
+        self._batches = 0  # The depth of the nested batches currently open
+        self._including = ()  # The absolute paths of the files being parsed that have led to this parse
+        self._origins = OriginMap() if track_origins else None  # The origin of each setting read
+        self._dirty = {} if track_origins else None  # The paths changed since reading/saving to the lines they spanned
+        self._mirror = None  # The filepath, file signature and encoding of the file the config's content was read from
+        self._source = None  # The filepath the config was last read from or saved to
         self._indent = indent_size
         self._delimiter = delimiter
         self._join = join
         self._default = default
         self._safe = safe
+        self._pool = pool
+        self._lazy = lazy
+        self._namespace = namespace
+        self._resolvers = Resolvers(resolvers) if isinstance(resolvers, dict) else resolvers
+        self._limits = limits
 
         if isinstance(source, dict):
             self.update(source)
@@ -86,6 +249,133 @@ class ConfigParser(collections.abc.MutableMapping):
     def __setitem__(self, key: object, value: object): self._elements[key] = value
     def __delitem__(self, key: object): del self._elements[key]
     def __iter__(self): return iter(self._elements)
+    def __contains__(self, key: object): return key in self._elements
+    def setdefault(self, key: object, default: object = None): return self._elements.setdefault(key, default)
+
+    def __reduce__(self):
+        # The config is reduced to its parser options and a flat encoding of its content - subscriptions, the intern
+        # pool and cached indexes/digests are not carried across to copies of the config
+        options = self._settings()
+        del options["pool"], options["track_origins"]
+        options["lazy"] = self._lazy
+
+        if self._namespace is not None:
+            options["namespace"] = {
+                key: _ModuleReference(value) if isinstance(value, types.ModuleType) else value
+                for key, value in self._namespace.items()
+            }
+
+        return (self.__class__._restore, (options, *self._encode(), self._origins))
+
+    @classmethod
+    def _restore(cls, options: dict, strings: tuple, structure: array.array, values: list, origins: OriginMap):
+        """ Rebuild a config from its reduced form - see _encode
+
+        Params:
+            options (dict): The keyword arguments of the parser
+            strings (tuple): The table of unique strings of the content
+            structure (array.array): The flat encoding of the sections of the content
+            values (list): The content values that aren't strings, in the order they are encoded
+            origins (OriginMap): The origins of the config's settings, if tracked
+
+        Returns:
+            ConfigParser: The config
+        """
+
+        config = cls(**options)
+        config._origins = origins
+        config._dirty = {} if origins is not None else None
+
+        values = iter(values)
+        position = 0
+
+        def decode(section: Section):
+            nonlocal position
+
+            length = structure[position]
+            position += 1
+
+            for _ in range(length):
+                key, tag = structure[position], structure[position + 1]
+                position += 2
+
+                key = strings[key] if key >= 0 else next(values)
+
+                if tag >= 0:
+                    value = strings[tag]
+                elif tag == cls._SECTION:
+                    value = Section(owner = config)
+                    value._parent, value._key = section, key
+                    decode(value)
+                elif tag == cls._DEFERRED:
+                    value = Deferred(config._convertSetting, *next(values))
+                else:
+                    value = next(values)
+
+                dict.__setitem__(section, key, value)
+
+        decode(config._elements)
+        return config
+
+    # Tags of the values of the flat encoding of a config - positive tags are indexes of the string table
+    _VALUE, _SECTION, _DEFERRED = -1, -2, -3
+
+    def _encode(self) -> (tuple, array.array, list):
+        """ Encode the content of the config as a flat sequence - such that it can be serialized compactly. Equal
+        strings (keys and values) are written once into a table of strings and referenced by their index.
+
+        Each section is encoded as the number of its items followed by a (key, tag) pair for each item - where the key
+        is the index of the key within the table of strings (or -1 when the key isn't a string and is held within the
+        values) and the tag is either the index of a string value, or a tag identifying that the value is a section
+        (whose encoding follows), a deferred setting or a value held within the values.
+
+        Returns:
+            tuple: The table of strings
+            array.array: The encoding of the sections
+            list: The keys and values that are not strings, in the order they are referenced
+        """
+
+        strings, indexes, structure, values = [], {}, array.array("q"), []
+
+        def index(text: str) -> int:
+            position = indexes.get(text)
+            if position is None:
+                position = indexes[text] = len(strings)
+                strings.append(text)
+            return position
+
+        def encode(section: Section):
+            structure.append(len(section))
+
+            for key, value in dict.items(section):
+                if type(key) is str:
+                    structure.append(index(key))
+                else:
+                    structure.append(-1)
+                    values.append(key)
+
+                if type(value) is str:
+                    structure.append(index(value))
+                elif isinstance(value, dict):
+                    structure.append(self._SECTION)
+                    encode(value)
+                elif type(value) is Deferred:
+                    structure.append(self._DEFERRED)
+                    values.append(value.args)
+                else:
+                    structure.append(self._VALUE)
+                    values.append(value)
+
+        encode(self._elements)
+
+        # Hold the encoding in the narrowest integers that can express it
+        bound = max(max(structure), -min(structure))
+        for typecode in "bhi":
+            if bound < 1 << (8*array.array(typecode).itemsize - 1):
+                structure = array.array(typecode, structure)
+                break
+
+        return tuple(strings), structure, values
 
     def get(self, path: str, default: object = None) -> object:
         """ Collect the value from within the config parser and return or if not
@@ -121,7 +411,85 @@ class ConfigParser(collections.abc.MutableMapping):
             # Traditional behaviour
             return super().get(path, default)
 
-    def read(self, filepath: str, *, safe: bool = None):
+    def get_many(self, paths: [str], default: object = None) -> [object]:
+        """ Collect the values at many paths at once. Sections shared by the paths are walked once
+
+        Params:
+            paths ([str]): Colon delimited paths of key names
+            default (object) = None: The value to collect for a path that doesn't exist
+
+        Returns:
+            [object]: The value of each path, in the order of the paths
+        """
+
+        nodes = {(): self._elements}  # The section at each path walked - None where the path doesn't exist
+
+        values = []
+        for path in paths:
+            keys = path.split(":")
+            parents, key = tuple(keys[:-1]), keys[-1]
+
+            node = nodes.get(parents, self)  # The config stands in for a section not yet walked
+            if node is self:
+                # Walk to the section from the deepest section already found
+                depth = len(parents)
+                while parents[:depth] not in nodes: depth -= 1
+
+                node = nodes[parents[:depth]]
+                for depth in range(depth + 1, len(parents) + 1):
+                    node = dict.get(node, parents[depth - 1]) if isinstance(node, dict) else None
+                    nodes[parents[:depth]] = node
+
+            values.append(node[key] if isinstance(node, dict) and key in node else default)
+
+        return values
+
+    def accessor(self, path: str) -> Accessor:
+        """ Compile a path into an accessor for repeated lookups of its value. The accessor caches the section holding
+        the value, such that a lookup costs about the same as a dictionary access.
+
+        Params:
+            path (str): A colon delimited path of key names
+
+        Returns:
+            Accessor: A callable returning the value at the path - `accessor(default = None)`
+        """
+        return Accessor(self, path)
+
+    def select(self, pattern: str) -> dict:
+        """ Collect all the values whose path matches the pattern provided. Each key name within the pattern may use
+        shell style wildcards ('*', '?', '[seq]'), and a key name of '**' matches any number of sections.
+
+        Queries are answered from an index of key names to their paths, which is built upon first use and discarded
+        whenever the keys of the config change.
+
+        Params:
+            pattern (str): A colon delimited path pattern - e.g. "servers:*:port" or "**:*_timeout"
+
+        Returns:
+            dict: The colon delimited path of each match to its value, in the order the paths were found
+        """
+
+        segments = pattern.split(":")
+        if segments[-1] == "**": segments.append("*")  # A trailing '**' selects everything beneath
+        name = segments[-1]
+
+        if self._index is None: self._index = self._buildIndex()
+
+        # Collect the paths of the keys that match the final segment of the pattern
+        if self._rxWildcard.search(name) is None:
+            candidates = self._index.get(name, [])
+        else:
+            candidates = [path for key, paths in self._index.items() if fnmatch.fnmatchcase(key, name) for path in paths]
+
+        matches = {}
+        for path in candidates:
+            if self._matchPath(path[:-1], segments[:-1]):
+                matches[":".join(map(str, path))] = self._traverse(path)
+
+        return matches
+
+    def read(self, filepath: str, *, safe: bool = None, encoding: str = None):
         """ Read the contents of a file using the filepath provided, parse the
         contents and update the config with its values.
 
@@ -129,6 +497,8 @@ class ConfigParser(collections.abc.MutableMapping):
             filepath (str): The filepath to the configuration file.
             *,
             safe (bool): Manner of content parsing. defaults to ConfigParsers safe property.
+            encoding (str): The encoding of the file, a byte order mark takes
+                precedence. defaults to utf-8.
 
         Returns:
             ConfigParser: self
@@ -141,28 +511,133 @@ class ConfigParser(collections.abc.MutableMapping):
                 raised by this function
         """
 
-        with open(filepath) as fh:
-            self.parse(fh, safe = safe)
+        with open(filepath, "rb") as fh:
+            signature = self._signature(os.fstat(fh.fileno()))
+            content = fh.read()
+
+        # The content of an empty config read from a file can be saved back to the file by patching its lines
+        mirror = None if self._elements else (os.path.abspath(filepath), signature, encoding)
+
+        self._mirror = None
+        with self.batch(), self._untracked():
+            self._parse(content, safe = safe, encoding = encoding, source = filepath)
+
+        self._mirror, self._source = mirror, filepath
+        if self._dirty is not None: self._dirty.clear()
 
         return self
 
-    def parse(self, configuration_string: str, *, safe: bool = None):
+    def parse(self, configuration_string: str, *, safe: bool = None, encoding: str = None):
         """ Parse the provided  object converting its contents into key values and updating this config with the values.
-        This function accepts strings or io objects that express a readline function.
+        This function accepts strings, bytes like objects (bytes, bytearray, memoryview) or io objects that express a
+        readline function.
+
+        Binary content is decoded line by line as it is parsed. Errors within binary content record the byte offset
+        of the line they occurred on.
 
         Parameters:
-            configuration_string (str / io.IO.base): The string to be parsed
+            configuration_string (str / bytes / io.IO.base): The string to be parsed
             *,
             safe (bool): Manner of content parsing. defaults to ConfigParsers safe property.
+            encoding (str): The encoding of binary content, a byte order mark takes precedence. defaults to utf-8.
+        """
+        self._mirror = None  # The parsed content is not held by the file the config was read from
+        with self.batch(), self._untracked():
+            return self._parse(configuration_string, safe = safe, encoding = encoding)
+
+    def update(self, *args, **kwargs):
+        """ Update the config with the content of a mapping/iterable of key value pairs and/or keyword arguments. The
+        changes are reported to the config's subscribers as a single batch
+        """
+        with self.batch():
+            super().update(*args, **kwargs)
+
+            if self._origins is not None:
+                # Carry across the origins of the settings of other configs that are tracking their origins
+                for other in args:
+                    if isinstance(other, ConfigParser) and other._origins is not None:
+                        self._origins.merge(other._origins, other._elements)
+
+    def origin(self, path: str) -> Origin:
+        """ Collect where the setting at the path was read from. Origins are only recorded when the config was created
+        with track_origins - settings assigned directly have no origin.
+
+        Params:
+            path (str): A colon delimited path of key names
+
+        Returns:
+            Origin: The source, line and column of the setting, or None if the setting has no recorded origin
+        """
+
+        if self._origins is None: return None
+
+        keys = tuple(path.split(":"))
+
+        # Confirm that the setting still exists - the origins of the content of a removed section are not discarded
+        node = self._elements
+        for key in keys:
+            if not isinstance(node, dict) or key not in node: return None
+            node = dict.__getitem__(node, key)
+
+        return self._origins.lookup(keys)
+
+    def on_change(self, pattern: str, callback: callable) -> Subscription:
+        """ Subscribe a callback to the changes made to the config under a path. The callback is called with the list
+        of colon delimited paths that have changed, once per batch of changes.
+
+        A change matches a pattern if the changed path is beneath the pattern, or if the changed path contains the
+        pattern (e.g. the section containing the pattern's path is replaced). A key of '*' within the pattern matches
+        any key.
+
+        Params:
+            pattern (str): A colon delimited path - e.g "database" or "servers:*:port". An empty string subscribes to
+                all changes.
+            callback (callable): The function to be called with the list of changed paths
+
+        Returns:
+            Subscription: The subscription, which can be cancelled
+        """
+        return self._observers.subscribe(tuple(pattern.split(":")) if pattern else (), callback)
+
+    @contextlib.contextmanager
+    def _untracked(self):
+        """ Suspend the tracking of the changes to be saved for the duration of the context - see save """
+        dirty, self._dirty = self._dirty, None
+        try:
+            yield
+        finally:
+            self._dirty = dirty
+
+    @contextlib.contextmanager
+    def batch(self):
+        """ Group the changes made to the config within the context such that subscribers are informed once, when the
+        outermost batch is closed. Parsing and updating the config are batches themselves.
         """
-        if safe is not None:
-            temp = self._safe
-            self._safe = safe
+
+        if self._batches == 0: self._changes = {}
+        self._batches += 1
+        try:
+            yield self
+        finally:
+            self._batches -= 1
+            if self._batches == 0:
+                changes, self._changes = self._changes, None
+                if changes: self._observers.dispatch(list(changes))
+
+    def _parse(self, configuration_string: str, *, safe: bool = None, encoding: str = None, source: str = None):
+        """ Parse the provided object into the config - see parse """
+
+        content = None  # Binary content to be decoded
 
         # Convert any string passed into an io stream
         if isinstance(configuration_string, str):
+            if self._limits is not None and self._limits.max_size is not None:
+                self._enforce(None, len(configuration_string), self._limits.max_size, "The size of the content")
             ioStream = io.StringIO(configuration_string)
 
+        elif isinstance(configuration_string, (bytes, bytearray, memoryview)):
+            ioStream, content = None, configuration_string
+
         # Check that the source configuration is valid
         elif hasattr(configuration_string, 'readline'):
             ioStream = configuration_string
@@ -170,237 +645,711 @@ class ConfigParser(collections.abc.MutableMapping):
         else:
             raise ValueError("Source object doesn't implement a readline function - cannot parse")
 
-        # The current indentation of the line - scope shall be greater than scope stack for variables being defined in
-        # a section.
-        scope = 0
+        if source is None: source = getattr(ioStream, "name", None)
 
-        # Holds current indentation for section headers - e.g ["header", None, None, "sub header"]. Scope shall reduce
-        # the scope stack.
-        scope_stack = []
+        limits = self._limits
 
-        # Currently examined setting container - holds name and points to value
-        setting = None
+        with self._safety(safe):
+            state = self._openParse(source)
 
-        # Line counter / represents the line number of the file being read
-        line_index = 0
+            if ioStream is not None:
+                readline = ioStream.readline
+                if limits is not None and limits.max_line_length is not None:
+                    # Read no more than is needed to identify a line that is too long
+                    readline = functools.partial(ioStream.readline, limits.max_line_length + 2)
 
-        while True:
-            line = ioStream.readline()
-            if line == "": break  # The line has reached an end of file line (due to the lack of a new line character)
+                line = readline()
 
-            # Increment the line number
-            line_index += 1
+                if isinstance(line, (bytes, bytearray)):
+                    # A binary stream - collect its content to be decoded
+                    if limits is not None and limits.max_size is not None:
+                        content = line + ioStream.read(max(0, limits.max_size + 1 - len(line)))
+                    else:
+                        content = line + ioStream.read()
 
-            line = self._removeComments(line)  # Remove comments from the line
-            if self._rxEmptyLine.search(line): continue  # Ignore empty lines
+                elif line:
+                    # Read lines until the stream is exhausted - readline returns an empty string at the end
+                    self._parseLine(state, line)
+                    for line in iter(readline, ""):
+                        self._parseLine(state, line)
 
-            # Determine scope and reduce scope stack if less than section scope
-            scope = len(self._rxWhiteSpace.match(line).group(0).replace("\t", " "*self._indent))
-            scope_stack = scope_stack[:scope+1]
+            if content is not None:
+                if limits is not None: self._enforce(state, len(content), limits.max_size, "The size of the content")
 
-            line = line.strip()  # Strip out all surrounding whitespace
+                for offset, line in self._decodeLines(content, encoding, state):
+                    state.offset = offset
+                    self._parseLine(state, line)
 
-            # Examine the syntax of the line and determine its intention
-            match = self._rxSection.search(line)
-            if match is not None:
-                # Section declaration - Open a new section in at this scope
+            self._closeParse(state)
 
-                # Push any currently open setting
-                self._addSetting(setting)
-                setting = None
+        return self
 
-                # Collect from the match object the section header
-                section_header = match.group("header")
+    def _decodeLines(self, content: bytes, encoding: str, state: ParseState):
+        """ Split binary content into lines, decoding each line as it is reached. A byte order mark at the start of
+        the content determines its encoding.
 
-                # Traverse the current parsed scope and add the section in if present
-                # Note: Taking care to ensure that a previously openned section isn't overwritten
-                node = self._traverse(scope_stack[:scope])
-                node[section_header] = node.get(section_header, {})
+        Params:
+            content (bytes / bytearray / memoryview): The binary content
+            encoding (str): The encoding of the content when it doesn't start with a byte order mark
+            state (ParseState): The state of the parse - to report decoding errors against
 
-                # Add the header to the stack updated section header - padding scope with None
-                scope_stack += [None]*((scope + 1) - len(scope_stack))
-                scope_stack[scope] = section_header
+        Yields:
+            (int, str): The byte offset of the line and the decoded line
 
-                continue
+        Raises:
+            ParseError: In the event that a line cannot be decoded
+        """
 
-            match = self._rxEquality.search(line)
-            if match is not None:
-                # Setting Declaration - The line is a key value pair
+        view = memoryview(content).cast("B")
+        start, encoding = self._encodingOf(view, encoding)
 
-                # Add previous setting if set
-                self._addSetting(setting)
+        if "\n".encode(encoding) == b"\n":
+            # Line endings can be found within the undecoded content - only the lines themselves are decoded
+            lines = ((match.start(), match.end()) for match in self._rxBinaryLine.finditer(view, start))
+            for number, (begin, end) in enumerate(lines, state.line_index + 1):
+                try:
+                    yield begin, str(view[begin: end], encoding)
+                except UnicodeDecodeError as e:
+                    raise ParseError(
+                        "Line {} - Cannot be decoded as {}".format(number, encoding), number, state.source, begin
+                    ) from e
 
-                # Generate a setting to hold the information of this line just read in
-                setting = Setting(
-                    scope_stack.copy(),
+        else:
+            # Line endings are multi-byte in the encoding - decode the content and measure the lines when re-encoded
+            try:
+                text = str(view[start:], encoding)
+            except UnicodeDecodeError as e:
+                raise ParseError("Cannot be decoded as {}".format(encoding), None, state.source, start + e.start) from e
+
+            offset = start
+            for line in text.splitlines(keepends = True):
+                yield offset, line
+                offset += len(line.encode(encoding))
+
+    @classmethod
+    def _encodingOf(cls, content: bytes, encoding: str) -> (int, str):
+        """ Determine the encoding of binary content - a byte order mark at the start of the content takes precedence
+        over the encoding provided
+
+        Params:
+            content (bytes / memoryview): The binary content
+            encoding (str): The encoding of the content when it doesn't start with a byte order mark
+
+        Returns:
+            int: The position the content begins at - after any byte order mark
+            str: The encoding
+        """
+        for bom, bomEncoding in cls._boms:
+            if content[:len(bom)] == bom: return len(bom), bomEncoding
+        return 0, encoding or "utf-8"
+
+    @contextlib.contextmanager
+    def _safety(self, safe: bool = None):
+        """ Set the manner of parsing for the duration of the context
+
+        Params:
+            safe (bool): The manner of parsing - None leaves the parser's manner unchanged
+        """
+
+        if safe is None:
+            yield
+            return
+
+        previous, self._safe = self._safe, safe
+        try:
+            yield
+        finally:
+            self._safe = previous
+
+    def _openParse(self, source: str = None) -> ParseState:
+        """ Begin the parsing of a source - generating the state that is carried between its lines
+
+        Params:
+            source (str): The filepath of the source being parsed, if the source is a file
+
+        Returns:
+            ParseState: The state of the parse
+        """
+
+        # Identify the file being parsed (if any) - included files are resolved relative to it
+        if isinstance(source, str):
+            including = self._including + (os.path.abspath(source),)
+            directory = os.path.dirname(including[-1])
+        else:
+            source, including, directory = None, self._including, os.getcwd()
+
+        return ParseState(source, including, directory)
+
+    def _parseLine(self, state: ParseState, line: str):
+        """ Parse a single line of a source, updating the config and the parse state
+
+        Params:
+            state (ParseState): The state of the parse of the source
+            line (str): The line to be parsed (with or without its line ending)
+        """
+
+        # Increment the line number
+        state.line_index += 1
+        line_index = state.line_index
+
+        limits = self._limits
+        if limits is not None:
+            state.size += len(line)
+            self._enforce(state, state.size, limits.max_size, "The size of the content")
+            if limits.max_line_length is not None and len(line) > limits.max_line_length:
+                self._enforce(state, len(line.rstrip("\r\n")), limits.max_line_length, "The length of the line")
+
+        line = self._removeComments(line)  # Remove comments from the line
+        if self._rxEmptyLine.search(line): return  # Ignore empty lines
+
+        # Determine scope and reduce scope stack if less than section scope
+        whitespace = self._rxWhiteSpace.match(line).group(0)
+        scope = len(whitespace.replace("\t", " "*self._indent))
+        scope_stack = state.scope_stack = state.scope_stack[:scope+1]
+
+        line = line.strip()  # Strip out all surrounding whitespace
+
+        # Examine the syntax of the line and determine its intention
+        match = self._rxInclude.search(line)
+        if match is not None:
+            # Include directive - graft the content of another file into the current scope
+
+            self._addSetting(state.setting)
+            state.setting = None
+
+            path = os.path.abspath(os.path.join(state.directory, match.group("path").strip().strip('"').strip("'")))
+            if path in state.including:
+                raise ParseError(
+                    "Line {} - Cyclic include of {}".format(line_index, path), line_index, state.source, state.offset
+                )
+
+            if limits is not None and not limits.includable(path):
+                raise LimitExceeded(
+                    "Line {} - Including {} is not permitted by the limits".format(line_index, path),
+                    line_index,
+                    state.source,
+                    state.offset
+                )
+
+            try:
+                fragment, origins = include.cache.load(path, self, state.including)
+            except OSError as e:
+                raise ParseError(
+                    "Line {} - Cannot include {}".format(line_index, path), line_index, state.source, state.offset
+                ) from e
+
+            if limits is not None:
+                # The grafted content counts towards the limits of the including source
+                settings, depth = include.measure(fragment)
+                state.settings += settings
+                self._enforce(state, state.settings, limits.max_settings, "The number of settings")
+                depth += sum(1 for key in scope_stack if key is not None)
+                self._enforce(state, depth, limits.max_depth, "The depth of the section")
+
+            include.cache.graft(self._traverse(scope_stack), fragment)
+            if self._origins is not None:
+                self._origins.merge(origins, fragment, tuple(key for key in scope_stack if key is not None))
+            return
+
+        match = self._rxSection.search(line)
+        if match is not None:
+            # Section declaration - Open a new section in at this scope
+
+            # Push any currently open setting
+            self._addSetting(state.setting)
+            state.setting = None
+
+            # Collect from the match object the section header
+            section_header = match.group("header")
+            if self._pool is not None: section_header = self._pool.intern(section_header)
+
+            # Traverse the current parsed scope and add the section in if present
+            # Note: Taking care to ensure that a previously openned section isn't overwritten
+            if limits is not None and limits.max_depth is not None:
+                depth = sum(1 for key in scope_stack[:scope] if key is not None) + 1
+                self._enforce(state, depth, limits.max_depth, "The depth of the section")
+
+            node = self._traverse(scope_stack[:scope])
+            section = node.get(section_header, node)  # The node stands in for a missing section
+            if section is node:
+                node[section_header] = Section()
+            elif not isinstance(section, dict):
+                raise ParseError(
+                    "Line {} - Section [{}] conflicts with the setting of the same name".format(
+                        line_index, section_header
+                    ),
                     line_index,
-                    match.group("name").strip(),
-                    self._performInterpolation(match.group("value").strip()),
-                    match.group("type")
+                    state.source,
+                    state.offset
                 )
+            elif not isinstance(section, Section):
+                node[section_header] = Section(section)
+
+            # Add the header to the stack updated section header - padding scope with None
+            scope_stack += [None]*((scope + 1) - len(scope_stack))
+            scope_stack[scope] = section_header
+
+            return
+
+        match = self._rxEquality.search(line)
+        if match is not None:
+            # Setting Declaration - The line is a key value pair
+
+            # Add previous setting if set
+            self._addSetting(state.setting)
+
+            # Generate a setting to hold the information of this line just read in
+            state.setting = Setting(
+                scope_stack.copy(),
+                line_index,
+                match.group("name").strip(),
+                self._performInterpolation(match.group("value").strip(), state),
+                match.group("type"),
+                state.source,
+                state.offset,
+                len(whitespace) + 1
+            )
 
-            elif len(scope_stack) <= scope and setting is not None:
-                # Setting Extension - Scope is greater than section header + no key value - assumed value extension
-                setting.value += self._join + self._performInterpolation(line)
+            if limits is not None: self._countSetting(limits, state)
 
-            else:
-                # Key Declaration - The line is a key without a value
-                self._addSetting(setting)
-
-                self._addSetting(
-                    Setting(
-                        scope_stack.copy(),
-                        line_index,
-                        line,
-                        self._default
-                    )
+        elif len(scope_stack) <= scope and state.setting is not None:
+            # Setting Extension - Scope is greater than section header + no key value - assumed value extension
+            state.setting.value += self._join + self._performInterpolation(line, state)
+            state.setting.end = line_index
+
+            if limits is not None:
+                self._enforce(state, len(state.setting.value), limits.max_value_length, "The length of the value")
+
+        else:
+            # Key Declaration - The line is a key without a value
+            self._addSetting(state.setting)
+
+            self._addSetting(
+                Setting(
+                    scope_stack.copy(),
+                    line_index,
+                    line,
+                    self._default,
+                    source = state.source,
+                    offset = state.offset,
+                    column = len(whitespace) + 1
                 )
+            )
 
-                # Reset setting - ready for a new value
-                setting = None
+            # Reset setting - ready for a new value
+            state.setting = None
 
-        # All lines read - push final setting
-        self._addSetting(setting)
+            if limits is not None: self._countSetting(limits, state)
 
-        if safe is not None:
-            self._safe = temp
+    def _countSetting(self, limits: Limits, state: ParseState):
+        """ Count a setting that has been read, enforcing the limits of the number of settings and their length """
+        state.settings += 1
+        self._enforce(state, state.settings, limits.max_settings, "The number of settings")
+        if state.setting is not None:
+            self._enforce(state, len(state.setting.value), limits.max_value_length, "The length of the value")
 
-        return self
+    @staticmethod
+    def _enforce(state: ParseState, value: int, limit: int, description: str):
+        """ Raise a LimitExceeded error if the value provided exceeds its limit
+
+        Params:
+            state (ParseState): The state of the parse - to report the error against. None if the parse hasn't begun
+            value (int): The measured value
+            limit (int): The limit of the value - None when unlimited
+            description (str): A description of the value
+
+        Raises:
+            LimitExceeded: In the event that the value is over the limit
+        """
+        if limit is None or value <= limit: return
+
+        if state is None:
+            raise LimitExceeded("{} ({}) exceeds the limit of {}".format(description, value, limit))
 
-    def write(self, output: object = None):
+        raise LimitExceeded(
+            "Line {} - {} ({}) exceeds the limit of {}".format(state.line_index, description, value, limit),
+            state.line_index,
+            state.source,
+            state.offset
+        )
+
+    def _closeParse(self, state: ParseState):
+        """ Complete the parsing of a source - pushing the final setting
+
+        Params:
+            state (ParseState): The state of the parse of the source
+        """
+        self._addSetting(state.setting)
+        state.setting = None
+
+    def write(self, output: object = None, *, sort: bool = True):
+        """ Write the config out as ini content
+
+        Params:
+            output (str/FileHandle): The filepath or handle to write to - defaults to returning the content
+            sort (bool): Order the settings and sections of each section by key - when False the settings and sections
+                are written in the order they were added, such that a parsed config is written back in its own order
+
+        Returns:
+            str: The content, when no output was provided
+        """
 
         if output is None:
             outputString = io.StringIO()
-            self._write(outputString, self)
+            self._write(outputString, self._elements, sort = sort)
             outputString.seek(0)
             return outputString.read()
 
         elif isinstance(output, str):
             with open(output, 'w', newline='') as handle:
-                self._write(handle, self)
+                self._write(handle, self._elements, sort = sort)
 
         else:
-            self._write(output, self)
+            self._write(output, self._elements, sort = sort)
 
-    def _write(self, handler: object, section: dict, depth: int = 0) -> None:
-        """ Write the section provided into the filehandler provided, and recursively write subsections into
-        the handler
+    def save(self, filepath: str = None):
+        """ Persist the changes made to the config to the file it was read from. When the config tracks the origins of
+        its settings and its content was read from the file alone, only the lines of the settings that have been
+        changed or removed are rewritten - the rest of the file, comments included, is left as it is. The whole config
+        is written (in insertion order) when settings or sections have been added, replaced by one another or
+        included from other files, when the file holds interpolated settings that haven't changed, or when the file has
+        changed since it was read. Either way, the file is replaced atomically.
+
+        Note: Changes are seen through the config's sections - values changed in place (e.g. appending to a list
+        setting) are not seen, and so not saved, unless the setting is assigned once more
 
         Params:
-            handler (FileHandle): The handler to be written to
-            section (dict): The section to be written
-            depth (int) = 0: The depth of the section - none zero value implies that the section is a nested section
+            filepath (str): The filepath to save to - defaults to the file the config was last read from
+
+        Returns:
+            ConfigParser: self
+
+        Raises:
+            ValueError: In the event that no filepath is given and the config was not read from a file
+            OSError: Any error that can be raised reading or replacing the file
         """
 
-        # Define containers for the two types of contents of the dictionary - separate the section
-        settings, sections = [], []
+        if filepath is None:
+            if self._source is None: raise ValueError("The config was not read from a file - a filepath is required")
+            filepath = self._source
 
-        for key, value in section.items():
-            if isinstance(value, dict):
-                sections.append((key, value))
-            else:
-                settings.append((key, value))
+        encoding = None
+        if self._mirror is not None and self._mirror[0] == os.path.abspath(filepath): encoding = self._mirror[2]
 
-        # Process the settings of the section first - sort the keys before writing
-        for key, value in sorted(settings, key = lambda x: x[0]):
+        if not self._patch(filepath):
+            with patch.replacing(filepath, encoding = encoding or "utf-8") as handle:
+                if self._origins is None:
+                    self._write(handle, self._elements, sort = False)
+                else:
+                    recorder = patch.Recorder(handle, self._origins, filepath)
+                    self._write(recorder, self._elements, sort = False, path = ())
 
-            setting_depth = max(0, depth - 1)
+        self._mirror = (os.path.abspath(filepath), self._signature(os.stat(filepath)), encoding)
+        self._source = filepath
+        if self._dirty is not None: self._dirty.clear()
 
-            # Define the variables type
+        return self
 
-            setting_type, value = self._convertFromType(value)
-            if setting_type: setting_type = "({}) ".format(setting_type)
+    def _patch(self, filepath: str) -> bool:
+        """ Rewrite the lines of the settings that have changed since the config was read from (or saved to) the file
 
-            # Define the key for the setting
-            title = "{}{}{} = ".format(" "*(setting_depth*self._indent), setting_type, key)
-            lentit = len(title)
+        Params:
+            filepath (str): The filepath of the file
 
-            # Define the value string
-            lenval = len(value)
+        Returns:
+            bool: Whether the file was patched - False when the whole config is required to be written
+        """
 
-            config_value = ""  # The manipulated value string
-            whitespace = " "*(1 + setting_depth*self._indent)
+        target = os.path.abspath(filepath)
+        if self._dirty is None or self._mirror is None or self._mirror[0] != target: return False
 
-            if lentit + lenval < self._max_line_length or self._join not in value:
-                # The entire setting can fit on a single line - or it cannot be broken up
-                config_value = value
-            else:
-                # The setting is greater than the line limit -  examine the value for break points
-                start, end = 0, self._max_line_length - lentit
-                line_length = self._max_line_length - (setting_depth*self._indent + 1)
-
-                while True:
-                    # Check whether we can break from the processing of the value
-                    if end > lenval:
-                        # The final window containing the rest of the value - write it and break
-                        config_value += value[start:]
-                        break
+        # Collect the lines of each changed setting, and its value - None when it has been removed
+        edits = []
+        for keys, extent in self._dirty.items():
+            if extent is None or extent[0] is None or os.path.abspath(extent[0]) != target: return False
 
-                    # Idenfity whether there is a break point in the window
-                    splitPoint = value[start: end].rfind(self._join)
+            node = self._elements
+            for key in keys[:-1]:
+                node = dict.get(node, key)
+                if not isinstance(node, dict): return False
 
-                    if splitPoint == -1:
-                        # There was nowhere to split for this window, search for next split and add entire line
-                        nextSplit = value[end:].find(self._join)
+            if keys[-1] in node:
+                value = node[keys[-1]]
+                if isinstance(value, dict): return False
+                edits.append((extent[1], extent[3], keys, value, extent[0]))
+            else:
+                # The config stands in for the value of a removed setting
+                edits.append((extent[1], extent[3], keys, self, extent[0]))
+
+        # Nothing is to be written when nothing has changed - unless the file has been changed by another
+        if not edits: return self._signature(os.stat(filepath)) == self._mirror[1]
+
+        edits.sort(key = lambda edit: edit[0])
+        if any(a[0] + a[1] > b[0] for a, b in zip(edits, edits[1:])): return False
+
+        with open(filepath, "rb") as handle:
+            if self._signature(os.fstat(handle.fileno())) != self._mirror[1]: return False
+            content = handle.read()
+
+        start, encoding = self._encodingOf(content, self._mirror[2])
+        if "\n".encode(encoding) != b"\n": return False
+
+        if b"{" in content:
+            # Interpolated settings hold the values they were interpolated with - left in the file, they would be
+            # interpolated again from the changed values when the file is next read
+            edited = {line for first, span, *_ in edits for line in range(first, first + span)}
+            for number, match in enumerate(self._rxBinaryLine.finditer(content, start), 1):
+                if number in edited or b"{" not in match.group(0): continue
+                if self._rxInterpolation.search(self._removeComments(match.group(0).decode(encoding))): return False
+
+        rewritten = []  # The number of lines and the column of each setting once rewritten
+
+        def rewriter(keys: tuple, value: object) -> callable:
+            def rewrite(lines: bytes) -> bytes:
+                if value is self:
+                    rewritten.append((0, None))
+                    return b""
+
+                # Write the setting at the indentation it was read with, ending its lines as the file does
+                lines = lines.decode(encoding)
+                indentation = self._rxWhiteSpace.match(lines).group(0)
+                ending = lines[len(lines.rstrip("\r\n")):]
+
+                text = self._formatSetting(keys[-1], value, indentation, indentation + " ").split(os.linesep)[:-1]
+                rewritten.append((len(text), len(indentation) + 1))
+                return ((ending or os.linesep).join(text) + ending).encode(encoding)
+            return rewrite
+
+        content = patch.splice(
+            content,
+            self._rxBinaryLine.finditer(content, start),
+            [(line, span, rewriter(keys, value)) for line, span, keys, value, _ in edits]
+        )
+
+        with patch.replacing(filepath, binary = True) as handle:
+            handle.write(content)
+
+        # Move the origins of the settings that follow the edits, then record the lines of the rewritten settings
+        deltas = [(line + span - 1, lines - span) for (line, span, *_), (lines, _) in zip(edits, rewritten)]
+        if any(delta for _, delta in deltas):
+            sources = {source for source in self._origins.sources if source and os.path.abspath(source) == target}
+            self._origins.shift(sources, deltas)
+
+        offset = 0
+        for (line, span, keys, value, source), (lines, column) in zip(edits, rewritten):
+            if value is not self: self._origins.record(keys, source, line + offset, column, lines)
+            offset += lines - span
+
+        return True
 
-                        if nextSplit == -1:
-                            # There is not going to be another split, write the remaining line and end
-                            config_value += value[start:]
-                            break
-                        else:
-                            end += nextSplit
-                    else:
-                        end = start + splitPoint
+    @staticmethod
+    def _signature(status: os.stat_result) -> tuple:
+        """ Identify the version of a file by its status - such that changes made to the file can be detected """
+        return status.st_ino, status.st_size, status.st_mtime_ns
+
+    def _write(self, handler: object, section: dict, depth: int = 0, sort: bool = True, path: tuple = None) -> None:
+        """ Write the section provided into the filehandler provided, and recursively write subsections into
+        the handler
 
-                    # Extract the line given by the start and end char and add it to the config line
-                    config_value += value[start: end] + os.linesep + whitespace
+        Params:
+            handler (FileHandle): The handler to be written to
+            section (dict): The section to be written
+            depth (int) = 0: The depth of the section - none zero value implies that the section is a nested section
+            sort (bool) = True: Order the settings and sections by key rather than by insertion
+            path (tuple) = None: The keys leading to the section - when provided, the handler is a patch.Recorder and
+                the lines of each setting written are recorded
+        """
 
-                    # Update the start and end index - Add one to the previous end to jump over the break character
-                    start, end = end + len(self._join), end + len(self._join) + line_length
+        if sort:
+            # Separate the two types of contents of the section and sort each by key
+            settings, sections = [], []
 
-            # Ensure that white space is handled
-            config_value = re.sub(
-                "{}(?!{})".format(os.linesep, whitespace),
-                "{}{}".format(os.linesep, whitespace),
-                config_value
-            )
+            for key, value in section.items():
+                if isinstance(value, dict):
+                    sections.append((key, value))
+                else:
+                    settings.append((key, value))
 
-            # Write the setting line
-            handler.write("".join((title, config_value, os.linesep)))
+            settings.sort(key = lambda x: x[0])
+            sections.sort(key = lambda x: x[0])
 
-        for name, section in sorted(sections, key = lambda x: x[0]):
+        else:
+            # Stream the contents in insertion order - settings must precede the subsections as a setting written
+            # after a subsection would be read back as part of the subsection
+            settings = ((key, value) for key, value in section.items() if not isinstance(value, dict))
+            sections = ((key, value) for key, value in section.items() if isinstance(value, dict))
+
+        # The indentation of the settings of the section and of their continuation lines
+        setting_depth = max(0, depth - 1)
+        indentation = " "*(setting_depth*self._indent)
+        whitespace = " "*(1 + setting_depth*self._indent)
+
+        # Process the settings of the section first
+        for key, value in settings:
+            text = self._formatSetting(key, value, indentation, whitespace)
+            if path is not None: handler.record(path + (key,), len(indentation) + 1, text)
+            handler.write(text)
+
+        for name, section in sections:
             # Write the nested sections - start by writing its name
             handler.write("{}[{}]{}".format(" "*(depth*self._indent), name, os.linesep))
 
             # Write the contents of the section
-            self._write(handler, section, depth + 1)
+            self._write(handler, section, depth + 1, sort, None if path is None else path + (name,))
 
             # Separate the sections - Check that section contents doesn't already separate sections
             if not any(isinstance(v, dict) for v in section.values()):
                 handler.write(os.linesep)
 
+    def _formatSetting(self, key: object, value: object, indentation: str, whitespace: str) -> str:
+        """ Format a setting as the lines it is written as - breaking long values over continuation lines
+
+        Params:
+            key (object): The key of the setting
+            value (object): The value of the setting
+            indentation (str): The whitespace preceding the setting's declaration
+            whitespace (str): The whitespace preceding the setting's continuation lines
+
+        Returns:
+            str: The lines of the setting, including the final line ending
+        """
+
+        # Define the variables type
+        setting_type, value = self._convertFromType(value)
+        if setting_type: setting_type = "({}) ".format(setting_type)
+
+        # Define the key for the setting
+        title = "{}{}{} = ".format(indentation, setting_type, key)
+        lentit = len(title)
+
+        # Define the value string
+        lenval = len(value)
+
+        config_value = ""  # The manipulated value string
+
+        if lentit + lenval < self._max_line_length or self._join not in value:
+            # The entire setting can fit on a single line - or it cannot be broken up
+            config_value = value
+        else:
+            # The setting is greater than the line limit -  examine the value for break points
+            start, end = 0, self._max_line_length - lentit
+            line_length = self._max_line_length - (len(indentation) + 1)
+
+            while True:
+                # Check whether we can break from the processing of the value
+                if end > lenval:
+                    # The final window containing the rest of the value - write it and break
+                    config_value += value[start:]
+                    break
+
+                # Idenfity whether there is a break point in the window
+                splitPoint = value[start: end].rfind(self._join)
+
+                if splitPoint == -1:
+                    # There was nowhere to split for this window, search for next split and add entire line
+                    nextSplit = value[end:].find(self._join)
+
+                    if nextSplit == -1:
+                        # There is not going to be another split, write the remaining line and end
+                        config_value += value[start:]
+                        break
+                    else:
+                        end += nextSplit
+                else:
+                    end = start + splitPoint
+
+                # Extract the line given by the start and end char and add it to the config line
+                config_value += value[start: end] + os.linesep + whitespace
+
+                # Update the start and end index - Add one to the previous end to jump over the break character
+                start, end = end + len(self._join), end + len(self._join) + line_length
+
+        # Ensure that white space is handled
+        if os.linesep in config_value: config_value = re.sub(
+            "{}(?!{})".format(os.linesep, whitespace),
+            "{}{}".format(os.linesep, whitespace),
+            config_value
+        )
+
+        return "".join((title, config_value, os.linesep))
+
     def _addSetting(self, setting: Setting):
             """ Push the information about the currently staged variable into the config at the position expressed by
             its mark on the scope stack
             """
             if setting is None: return  # Nothing to add
 
+            # Deduplicate the setting name against those of other configs sharing the pool
+            if self._pool is not None: setting.name = self._pool.intern(setting.name)
+
             # None string type set for value - update the value before adding to self
             if setting.type is not (None and "str"):
+                if self._lazy:
+                    # Hold onto the setting and convert it when it is first accessed
+                    value = Deferred(self._convertSetting, setting, self._safe)
+                else:
+                    value = self._convertSetting(setting, self._safe)
+
+            else:
+                value = setting.value
+
+                if isinstance(value, str) and value:
+                    # Trim quotes from  string setting value if applicable
+                    if value[0] in ('"', "'") and value[0] == value[-1]:
+                        value = value[1:-1]
+
+                if self._pool is not None: value = self._pool.intern(value)
+
+            if self._origins is None:
+                # Insert the setting into self at the correct position
+                self._traverse(setting.scope)[setting.name] = value
+
+            else:
+                # Detach the origins whilst inserting the setting - its origin is recorded rather than discarded
+                origins, self._origins = self._origins, None
                 try:
-                    setting.value = self._convertToType(setting.type, setting.value)
-                except Exception as e:
-                    raise ValueError(
-                        "Invalid type definition: Line {} - {} = {}".format(setting.line, setting.name, setting.value)
-                    ) from e
+                    self._traverse(setting.scope)[setting.name] = value
+                finally:
+                    self._origins = origins
+
+                path = tuple(key for key in setting.scope if key is not None) + (setting.name,)
+                origins.record(path, setting.source, setting.line, setting.column, setting.end - setting.line + 1)
+
+    def _convertSetting(self, setting: Setting, safe: bool) -> object:
+        """ Convert the value of a typed setting into an instance of its type
+
+        Params:
+            setting (Setting): The setting whose value is to be converted
+            safe (bool): The manner of parsing the setting was read with
+
+        Returns:
+            object: The converted value
 
-            elif isinstance(setting.value, str) and setting.value:
-                # Trim quotes from  string setting value if applicable
-                if setting.value[0] in ('"', "'") and setting.value[0] == setting.value[-1]:
-                    setting.value = setting.value[1:-1]
+        Raises:
+            ValueError: In the event that the value could not be converted into its type
+        """
 
-            # Insert the setting into self at the correct position
-            self._traverse(setting.scope)[setting.name] = setting.value
+        previous, self._safe = self._safe, safe
+        try:
+            value = self._convertToType(setting.type, setting.value)
+        except LimitExceeded as e:
+            raise LimitExceeded(
+                "Line {} - {}".format(setting.line, e.message), setting.line, setting.source, setting.offset
+            ) from None
+        except Exception as e:
+            raise ParseError(
+                "Invalid type definition: Line {} - {} = {}".format(setting.line, setting.name, setting.value),
+                setting.line,
+                setting.source,
+                setting.offset
+            ) from e
+        finally:
+            self._safe = previous
+
+        # Deduplicate the value against those of other configs sharing the pool
+        if self._pool is not None: value = self._pool.intern(value)
+
+        return value
 
     def _removeComments(self, line: str) -> None:
         """ Remove comments ensuring that a the comment symbols aren't removed
@@ -413,6 +1362,9 @@ class ConfigParser(collections.abc.MutableMapping):
             str: The line provided without line
         """
 
+        # Lines without any comment, quote or escape characters can be returned untouched - avoiding the character walk
+        if self._rxCommentChars.search(line) is None: return line
+
         comment = None
         escape = False
         openChar = None
@@ -458,27 +1410,210 @@ class ConfigParser(collections.abc.MutableMapping):
 
         return node
 
-    def _performInterpolation(self, line: str) -> str:
+    def _settings(self) -> dict:
+        """ Collect the keyword arguments that would construct a parser with the same parsing options as this parser
+
+        Returns:
+            dict: The constructor keyword arguments
+        """
+        return {
+            "indent_size": self._indent,
+            "delimiter": self._delimiter,
+            "join": self._join,
+            "default": self._default,
+            "safe": self._safe,
+            "pool": self._pool,
+            "namespace": self._namespace,
+            "track_origins": self._origins is not None,
+            "resolvers": self._resolvers,
+            "limits": self._limits
+        }
+
+    def _options(self) -> tuple:
+        """ A hashable representation of the options that affect the content parsed by this parser - objects are
+        identified by their id, so holders of the representation must hold the objects too (see include.cache) """
+        return (
+            self._indent,
+            self._delimiter,
+            self._join,
+            repr(self._default),
+            self._safe,
+            id(self._namespace),
+            self._origins is not None,
+            id(self._resolvers),
+            id(self._limits)
+        )
+
+    def _settingsDigest(self) -> int:
+        """ Generate a digest of the parsing options that are carried along with the config when it is pickled, which
+        is stable between processes - such that configs of the same content but different options are told apart (see
+        transfer)
+
+        Returns:
+            int: The digest of the options
+        """
+        options = self._settings()
+        del options["pool"], options["track_origins"]
+        options["lazy"] = self._lazy
+        return self._stableDigest(options)
+
+    @classmethod
+    def _stableDigest(cls, value: object) -> int:
+        """ Generate a digest of an option value that is stable between processes. Functions, classes and modules are
+        identified by their qualified names, and other values without a stable digest by their pickled form
+
+        Params:
+            value (object): The value to digest
+
+        Returns:
+            int: The digest of the value
+        """
+
+        if isinstance(value, dict):
+            return digest({key: cls._stableDigest(item) for key, item in value.items()})
+        elif isinstance(value, (list, tuple)):
+            return digest(tuple(map(cls._stableDigest, value)))
+        elif isinstance(value, Limits):
+            return digest(("Limits", cls._stableDigest(vars(value))))
+        elif isinstance(value, Resolvers):
+            return digest(("Resolvers", cls._stableDigest(value._resolvers), value.ttl))
+        elif isinstance(value, types.ModuleType):
+            return digest(("module", value.__name__))
+        elif callable(value) and hasattr(value, "__qualname__"):
+            return digest(("callable", getattr(value, "__module__", None), value.__qualname__))
+
+        try:
+            return digest(value)
+        except TypeError:
+            return digest(pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL))
+
+    def _mutated(self, section: Section, key: object, structural: bool, previous: object = None):
+        """ Respond to a mutation of one of the config's sections
+
+        Params:
+            section (Section): The section that has been mutated
+            key (object): The key within the section whose value has changed
+            structural (bool): Whether keys have been added/removed or sections replaced
+            previous (object): The value that was replaced or removed, if any
+        """
+        if structural: self._index = None
+
+        if self._origins is not None:
+            path = section._path() + (key,)
+
+            # Hold onto the lines the setting was read from, such that saving the config can rewrite them
+            if self._dirty is not None and path not in self._dirty: self._dirty[path] = self._origins.extent(path)
+            self._origins.discard(path)
+
+            # The settings of a replaced/removed section no longer originate from where the section was read
+            stack = [(path, previous)] if isinstance(previous, dict) else []
+            while stack:
+                prefix, node = stack.pop()
+                for name, value in dict.items(node):
+                    keys = prefix + (name,)
+                    self._origins.discard(keys)
+                    if isinstance(value, dict): stack.append((keys, value))
+
+        if self._observers:
+            # Record the change - dispatching it immediately if it isn't part of a batch
+            path = section._path() + (key,)
+            if self._batches:
+                self._changes[path] = None
+            else:
+                self._observers.dispatch([path])
+
+    def _buildIndex(self) -> dict:
+        """ Walk the config and index the path of every key by its name - the string of the key
+
+        Returns:
+            dict: key name to a list of the paths (tuples of keys) with that key name
+        """
+
+        index = {}
+        stack = [((), self._elements)]
+        while stack:
+            prefix, section = stack.pop()
+            for key, value in dict.items(section):
+                path = prefix + (key,)
+                index.setdefault(str(key), []).append(path)
+                if isinstance(value, dict): stack.append((path, value))
+
+        return index
+
+    @classmethod
+    def _matchPath(cls, path: tuple, segments: list) -> bool:
+        """ Determine whether the keys of a path match the segments of a pattern
+
+        Params:
+            path (tuple): The keys of the path
+            segments (list): The pattern segments, where '**' matches any number of keys
+
+        Returns:
+            bool: True if the path matches
+        """
+
+        if not segments: return not path
+
+        if segments[0] == "**":
+            # Consume any number of keys of the path
+            return any(cls._matchPath(path[i:], segments[1:]) for i in range(len(path) + 1))
+
+        return bool(path) and fnmatch.fnmatchcase(str(path[0]), segments[0]) and cls._matchPath(path[1:], segments[1:])
+
+    def _performInterpolation(self, line: str, state: ParseState = None) -> str:
         """ Convert the references in the provided line into their value that
-        was previously defined, and not a key value within the config
+        was previously defined, and not a key value within the config. References
+        whose first key is the prefix of a resolver are resolved by the resolver.
 
         Params:
             line (str): The line to perform the interpolation on
+            state (ParseState): The state of the parse - to report errors against
 
         Returns:
             str: The line transformed to have its values
+
+        Raises:
+            ParseError: In the event that a reference cannot be resolved
         """
 
-        # For each match in the line
-        for match in self._rxInterpolation.finditer(line):
-            path = match.group(0).strip("{}").split(":")  # Path/key of value
+        if "{" not in line: return line  # Nothing to interpolate
 
-            value = self._traverse(path[:-1])[path[-1]]  # Extract the value for the path
+        limits = self._limits
+        length = len(line)
 
-            line = re.sub(match.group(0), str(value), line)  # Replace the original match with this value
+        def replace(match: re.Match) -> str:
+            nonlocal length
 
-        # Return the transformed line
-        return line
+            path = match.group("path").split(":")  # Path/key of value
+
+            if len(path) > 1 and self._resolvers is not None and path[0] in self._resolvers:
+                value = self._resolvers.resolve(path[0], ":".join(path[1:]))
+            else:
+                value = str(self._traverse(path[:-1])[path[-1]])  # Extract the value for the path
+
+            if limits is not None:
+                # Stop as soon as the expanded line, or the content interpolated over the whole source, is too long
+                length += len(value) - len(match.group(0))
+                self._enforce(state, length, limits.max_interpolation, "The length of the interpolated line")
+                if state is not None:
+                    state.expanded += len(value)
+                    self._enforce(state, state.expanded, limits.max_expansion, "The number of interpolated characters")
+
+            return value
+
+        # Replace each reference in a single pass of the line
+        try:
+            return self._rxInterpolation.sub(replace, line)
+        except LimitExceeded:
+            raise
+        except Exception as e:
+            line_index = state.line_index if state is not None else None
+            raise ParseError(
+                "Line {} - Cannot interpolate {}".format(line_index, line),
+                line_index,
+                state.source if state is not None else None,
+                state.offset if state is not None else None
+            ) from e
 
     def _convertToType(self, variable_type: str, variable_value: str):
         """ Convert the value passed into the type provided
@@ -495,11 +1630,53 @@ class ConfigParser(collections.abc.MutableMapping):
             raise ValueError("Couldn't process type signature: {}".format(variable_type))
 
         settingType = match.group("type")
+
+        limits = self._limits
+        if limits is not None and limits.types is not None and settingType not in limits.types:
+            raise LimitExceeded("Type {} is not allowed".format(settingType))
+
         if settingType == 'eval':
-            if not self._safe: return eval(variable_value)
-            else: raise RuntimeError("Unsafe eval type present as type in config when config read is safe")
+            if self._safe:
+                # Literal expressions cannot execute code and so can be evaluated regardless of safety. Other
+                # expressions are rejected without being compiled - such that untrusted content doesn't fill the
+                # compilation cache
+                try:
+                    return ast.literal_eval(variable_value.strip())
+                except (ValueError, TypeError):
+                    raise RuntimeError("Unsafe eval type present as type in config when config read is safe")
+
+            literal, code = self._compileExpression(variable_value.strip())
+            if literal is not None: return ast.literal_eval(literal)
+
+            if self._namespace is None: return eval(code)
+            return eval(code, dict(self._namespace))
+
+        if settingType == "array":
+            # Numeric arrays are converted in a single pass straight into a compact buffer - int and float both
+            # tolerate the surrounding whitespace so the items don't need to be stripped
+            typecode = match.group("sub_type") or "d"
+            if typecode not in self._array_typecodes:
+                raise ValueError("Invalid array typecode: {}".format(typecode))
+
+            convert = float if typecode in "fd" else int
+            if not variable_value.strip(): return array.array(typecode)
+            if limits is not None:
+                self._enforce(None, variable_value.count(self._delimiter) + 1, limits.max_items, "The number of items")
+            return array.array(typecode, map(convert, variable_value.split(self._delimiter)))
+
+        if settingType in ("bytes", "bytearray") and match.group("sub_type") in ("hex", "base64"):
+            # Binary data expressed as text - decoded in bulk
+            if limits is not None: self._enforce(None, len(variable_value)//2, limits.max_items, "The size of the bytes")
+            if match.group("sub_type") == "hex":
+                buffer = bytes.fromhex(variable_value.replace(self._delimiter, " "))
+            else:
+                buffer = base64.b64decode(variable_value)
+            return buffer if settingType == "bytes" else bytearray(buffer)
 
         if variable_value:
+            if limits is not None:
+                self._enforce(None, variable_value.count(self._delimiter) + 1, limits.max_items, "The number of items")
+
             variable_value = [x.strip().strip('"').strip("'") for x in variable_value.split(self._delimiter)]
 
             if match.group("sub_type"):
@@ -512,10 +1689,16 @@ class ConfigParser(collections.abc.MutableMapping):
         elif settingType == "set":          return set(variable_value)
         elif settingType == "frozenset":    return frozenset(variable_value)
         elif settingType == "tuple":        return tuple(variable_value)
-        elif settingType == "range":        return range(*[int(x) for x in variable_value])
+        elif settingType == "range":
+            value = range(*[int(x) for x in variable_value])
+            if limits is not None: self._enforce(None, len(value), limits.max_items, "The length of the range")
+            return value
 
-        elif settingType == "bytes":        return bytes(*variable_value)
-        elif settingType == "bytearray":    return bytearray(*variable_value)
+        elif settingType in ("bytes", "bytearray"):
+            if limits is not None and variable_value and isinstance(variable_value[0], int):
+                # An integer argument allocates a buffer of that size
+                self._enforce(None, variable_value[0], limits.max_items, "The size of the bytes")
+            return bytes(*variable_value) if settingType == "bytes" else bytearray(*variable_value)
 
         elif settingType == "bool":        return variable_value[0] == ("True" or "yes" or "1" or "on")
         elif settingType == "int":
@@ -531,6 +1714,31 @@ class ConfigParser(collections.abc.MutableMapping):
             importClass = getattr(importlib.import_module(".".join(modules[:-1])), modules[-1])
             return importClass(*variable_value)
 
+    @staticmethod
+    @functools.lru_cache(maxsize = 4096)
+    def _compileExpression(expression: str) -> tuple:
+        """ Compile the expression of an eval setting. Compilation is cached on the expression's source such that
+        expressions repeated within and between configs are only compiled once
+
+        Params:
+            expression (str): The python expression
+
+        Returns:
+            (ast.Expression, None): When the expression is a pure literal - its syntax tree
+            (None, code): The compiled code object of the expression when it isn't a literal
+
+        Raises:
+            SyntaxError: If the expression isn't valid python
+        """
+
+        tree = ast.parse(expression, mode = "eval")
+
+        try:
+            ast.literal_eval(tree)
+            return tree, None
+        except (ValueError, TypeError):
+            return None, compile(tree, "<pyini eval>", "eval")
+
     @staticmethod
     def _updateIterableType(base: str, iterable: object):
         """ Check whether all the items within an iterable have the same type if so update the base to reflext that
@@ -600,7 +1808,16 @@ class ConfigParser(collections.abc.MutableMapping):
             value_string = str(value).strip("()")
 
         elif isinstance(value, (bytes, bytearray)):
-            value_string = value.decode() + ", utf-8"
+            try:
+                value_string = value.decode() + ", utf-8"
+            except UnicodeDecodeError:
+                # Binary content that isn't text - write its hex representation
+                value_type = "{}<hex>".format(value_type)
+                value_string = value.hex()
+
+        elif isinstance(value, array.array):
+            value_type = "array<{}>".format(value.typecode)
+            value_string = ", ".join(map(repr, value.tolist()))
 
         elif isinstance(value, complex):
             value_string = str(value).strip("()")
@@ -610,4 +1827,123 @@ class ConfigParser(collections.abc.MutableMapping):
 
         return value_type, value_string
 
-    def copy(self): return self._elements.copy()
\ No newline at end of file
+    def copy(self): return self._elements.copy()
+
+    def materialize(self):
+        """ Convert all settings whose conversion has been deferred, such that a lazily parsed config is validated
+
+        Returns:
+            ConfigParser: self
+
+        Raises:
+            ValueError: In the event that a setting's value cannot be converted into its type
+        """
+        self._elements.materialize()
+        return self
+
+    def fingerprint(self) -> str:
+        """ Generate a digest of the content of the config which is stable between processes. Section digests are
+        cached, so only the sections mutated since the last fingerprint are re-hashed.
+
+        Only values of the types the parser produces (and a few others that are wholly expressed by their repr - such
+        as datetime, Decimal and UUID) have a stable digest.
+
+        Returns:
+            str: Hex digest of the config content
+
+        Raises:
+            TypeError: In the event that the config holds a value of a type without a stable digest
+        """
+        return "{:032x}".format(self._elements.digest())
+
+    def diff(self, other: collections.abc.Mapping) -> ConfigDiff:
+        """ Determine the differences between this config and another. Sections whose digests match are skipped
+        without being walked, so the cost of the comparison is proportional to the sections that differ.
+
+        Params:
+            other (collections.abc.Mapping): The config (or dictionary) to compare against
+
+        Returns:
+            ConfigDiff: The paths found only in other (added), only in self (removed) and the paths whose values
+                differ (changed)
+        """
+
+        if isinstance(other, ConfigParser): other = other._elements
+
+        difference = ConfigDiff([], [], [])
+        self._diff(self._elements, other, (), difference)
+        return difference
+
+    @classmethod
+    def _diff(cls, section: dict, other: dict, path: tuple, difference: ConfigDiff):
+        """ Record the differences between two sections into the difference provided, recursing into the subsections
+        that differ
+
+        Params:
+            section (dict): The original section
+            other (dict): The section to compare against
+            path (tuple): The keys leading to the sections
+            difference (ConfigDiff): The container of the differences found
+        """
+
+        if section is other or cls._same(section, other): return
+
+        for key in section:
+            if key not in other: difference.removed.append(":".join(map(str, path + (key,))))
+
+        for key, value in other.items():
+            if key not in section:
+                difference.added.append(":".join(map(str, path + (key,))))
+                continue
+
+            original = section[key]
+            if isinstance(original, dict) and isinstance(value, dict):
+                cls._diff(original, value, path + (key,), difference)
+            elif not cls._same(original, value):
+                difference.changed.append(":".join(map(str, path + (key,))))
+
+    @staticmethod
+    def _same(value: object, other: object) -> bool:
+        """ Determine whether two values (or sections) are equal - by their digests, or by comparison when they hold
+        values without a stable digest """
+        try:
+            return digest(value) == digest(other)
+        except TypeError:
+            return value == other
+
+    def memory_report(self) -> memory.MemoryReport:
+        """ Measure the memory held by the content of the config, attributing it to the sections holding it and the
+        types of the values held. Objects referenced more than once (such as pooled values) are counted once.
+
+        Returns:
+            MemoryReport: The bytes held in total, by each section and by each type of value
+        """
+        return memory.measure(self._elements, (self,))
+
+    def reference(self, *, payload: bool = True) -> transfer.ConfigReference:
+        """ Generate a picklable reference to the config by the fingerprint of its content and its parsing options, for
+        sending the config to other processes. A process receiving the reference that already holds the config (having
+        received it before) uses the config it holds rather than deserializing it again.
+
+        Note: Receivers share the config they hold between the references they receive - copy it before modifying it
+
+        Params:
+            payload (bool): Send the serialized config along with its key. Without the payload, the receiver must
+                already hold the config.
+
+        Returns:
+            ConfigReference: The reference, which unpickles into the config
+        """
+        return transfer.ConfigReference(self, payload)
+
+    def freeze(self) -> FrozenConfig:
+        """ Generate an immutable and hashable representation of the config's current content. Keys are interned and
+        sections are frozen recursively.
+
+        Returns:
+            FrozenConfig: The frozen representation of the config
+
+        Raises:
+            TypeError: In the event that a setting value cannot be made immutable
+        """
+        return FrozenConfig(self._elements)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import sys
+import array
+import collections.abc
+
+class FrozenConfig(collections.abc.Mapping):
+    """ An immutable, hashable representation of a config. Keys are interned and nested sections are themselves frozen
+    configs, with their hash computed once at construction so that frozen configs can be used as dictionary keys,
+    cached and compared cheaply.
+
+    Parameters:
+        source (collections.abc.Mapping): The mapping (typically a ConfigParser) to be frozen
+
+    Raises:
+        TypeError: In the event that a value within the source cannot be made immutable
+    """
+
+    __slots__ = ("_elements", "_hash")
+
+    def __init__(self, source: collections.abc.Mapping = {}):
+
+        elements = {}
+        for key, value in source.items():
+            if isinstance(key, str): key = sys.intern(key)
+            elements[key] = self._freeze(value)
+
+        self._elements = elements
+        self._hash = hash(frozenset(elements.items()))
+
+    def __repr__(self): return "<FrozenConfig {}>".format(self._elements)
+    def __len__(self): return len(self._elements)
+    def __getitem__(self, key: object): return self._elements[key]
+    def __iter__(self): return iter(self._elements)
+    def __contains__(self, key: object): return key in self._elements
+    def __hash__(self): return self._hash
+
+    def __eq__(self, other: object):
+        if self is other: return True
+        if isinstance(other, FrozenConfig):
+            # Differing hashes guarantee differing content - only compare the elements on a collision
+            return self._hash == other._hash and self._elements == other._elements
+        return super().__eq__(other)
+
+    def __reduce__(self): return (self.__class__, (self._elements,))
+
+    def get(self, path: str, default: object = None) -> object:
+        """ Collect the value from within the frozen config and return or if not found return the default value
+
+        Params:
+            path (str): A semi-colon delimited path of key names
+            default (object) = None: The value to be returned if nothing is found
+
+        returns:
+            object: Either the value at the location of path, or the default
+        """
+
+        if ":" in path:
+            value = self
+            for key in path.split(":"):
+                if not isinstance(value, FrozenConfig) or key not in value._elements:
+                    return default
+                value = value._elements[key]
+            return value
+        else:
+            return self._elements.get(path, default)
+
+    def thaw(self) -> dict:
+        """ Generate a mutable nested dictionary of the frozen content, suitable to seed a ConfigParser
+
+        Returns:
+            dict: The nested dictionary of the frozen config's content
+        """
+        return {k: v.thaw() if isinstance(v, FrozenConfig) else v for k, v in self._elements.items()}
+
+    @classmethod
+    def _freeze(cls, value: object) -> object:
+        """ Convert the value provided into an immutable equivalent
+
+        Params:
+            value (object): The value to be frozen
+
+        Returns:
+            object: The immutable representation of the value
+
+        Raises:
+            TypeError: If the value cannot be hashed once frozen
+        """
+
+        if isinstance(value, FrozenConfig): return value
+        elif isinstance(value, collections.abc.Mapping): return cls(value)
+        elif isinstance(value, str): return sys.intern(value)
+        elif isinstance(value, list): return tuple(cls._freeze(v) for v in value)
+        elif isinstance(value, tuple): return tuple(cls._freeze(v) for v in value)
+        elif isinstance(value, set): return frozenset(cls._freeze(v) for v in value)
+        elif isinstance(value, bytearray): return bytes(value)
+        elif isinstance(value, array.array): return tuple(value)  # Buffers of numbers other than bytes can't be hashed
+
+        # Assert that the value can be hashed - fail at freeze time rather than at lookup time
+        hash(value)
+        return value
@@ -0,0 +1,146 @@
+import os
+import copy
+import threading
+import collections
+
+class IncludeCache:
+    """ A cache of the parsed content of included files. Files are parsed once per process (for each set of parser
+    options) and their content is grafted into the configs that include them. Each entry records the modification
+    time and size of the file and of every file it includes (transitively), such that the file is parsed again when
+    any of them has changed. The least recently used entries are discarded once the cache is full.
+
+    Parameters:
+        maxsize (int): The number of parsed files to hold
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._fragments = collections.OrderedDict()
+        self._lock = threading.Lock()  # Guards the fragments and statistics - files are parsed without holding it
+        self._loading = threading.local()  # The dependencies of the files being parsed by the thread, innermost last
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self): return len(self._fragments)
+
+    def clear(self):
+        """ Remove all the cached fragments and reset the cache statistics """
+        with self._lock:
+            self._fragments.clear()
+            self.hits, self.misses = 0, 0
+
+    def load(self, path: str, parser: object, including: tuple) -> dict:
+        """ Collect the parsed content of the file at the path provided - parsing the file with the options of the
+        parser if it hasn't been parsed before
+
+        Params:
+            path (str): The absolute path of the file to include
+            parser (ConfigParser): The parser including the file
+            including (tuple): The absolute paths of the files currently being included - used to detect cycles
+
+        Returns:
+            dict: The content of the file, which must not be modified
+            OriginMap: The origins of the settings of the file - None if the parser isn't tracking origins
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+
+        key = (path,) + parser._options()
+
+        with self._lock: entry = self._fragments.get(key)
+
+        if entry is not None and all(map(self._unchanged, entry[2].items())):
+            with self._lock:
+                self.hits += 1
+                # Another thread may have evicted (or replaced) the entry whilst the files were checked
+                if self._fragments.get(key) is entry: self._fragments.move_to_end(key)
+
+        else:
+            with self._lock:
+                self.misses += 1
+                if entry is not None and self._fragments.get(key) is entry: del self._fragments[key]
+
+            # Record the file along with each file that it includes - the status is taken before the file is read such
+            # that a change made whilst reading is seen by the next load
+            dependencies = {path: self._status(path)}
+
+            stack = self._loading.__dict__.setdefault("stack", [])
+            stack.append(dependencies)
+            try:
+                # Parse the file independently of the including config with the same options
+                fragmentParser = parser.__class__(**parser._settings())
+                fragmentParser._including = including
+                fragmentParser.read(path).materialize()
+            finally:
+                stack.pop()
+
+            # The entry holds the option objects identified by the key (by id) so their ids aren't reused
+            references = (parser._namespace, parser._resolvers, parser._limits)
+            entry = (fragmentParser._elements, fragmentParser._origins, dependencies, references)
+
+            with self._lock:
+                self._fragments[key] = entry
+                while len(self._fragments) > self.maxsize: self._fragments.popitem(last = False)
+
+        # The files including this file depend upon its includes too
+        stack = getattr(self._loading, "stack", None)
+        if stack: stack[-1].update(entry[2])
+
+        return entry[0], entry[1]
+
+    @staticmethod
+    def _status(path: str) -> (int, int):
+        """ The modification time and size of a file """
+        status = os.stat(path)
+        return status.st_mtime_ns, status.st_size
+
+    @classmethod
+    def _unchanged(cls, dependency: (str, tuple)) -> bool:
+        """ Determine whether a file has the status it had when it was parsed - missing files have changed """
+        path, status = dependency
+        try:
+            return cls._status(path) == status
+        except OSError:
+            return False
+
+    @classmethod
+    def graft(cls, node: dict, fragment: dict):
+        """ Merge a copy of an included fragment into a node of a config - merging sections and overwriting settings
+
+        Params:
+            node (dict): The section of the config to receive the content
+            fragment (dict): The content of the included file
+        """
+
+        for key, value in dict.items(fragment):
+            if isinstance(value, dict) and isinstance(node.get(key), dict):
+                cls.graft(node[key], value)
+            else:
+                node[key] = copy.deepcopy(value)
+
+def measure(fragment: dict) -> (int, int):
+    """ Count the settings of an included fragment and the depth of its sections - such that grafting the fragment
+    can be held to the limits of the including config
+
+    Params:
+        fragment (dict): The content of the included file
+
+    Returns:
+        (int, int): The number of settings and the depth of the deepest section
+    """
+
+    settings, deepest = 0, 0
+    stack = [(fragment, 0)]
+    while stack:
+        node, depth = stack.pop()
+        for value in dict.values(node):
+            if isinstance(value, dict):
+                deepest = max(deepest, depth + 1)
+                stack.append((value, depth + 1))
+            else:
+                settings += 1
+
+    return settings, deepest
+
+cache = IncludeCache()  # The process wide cache of included files
@@ -0,0 +1,150 @@
+import codecs
+
+from .configparser import ConfigParser, ParseError, LimitExceeded
+
+class IncrementalParser:
+    """ A push style parser that parses a config as its content arrives, in chunks of any size. Partial lines are held
+    until the remainder of the line arrives, and the scope of sections and continued values carries across chunks.
+
+    Chunks are either strings or bytes. Bytes are decoded incrementally, so a character may be split between chunks,
+    and a byte order mark at the start of the content determines its encoding.
+
+    Parameters:
+        config (ConfigParser): The config to be updated with the parsed content - a new config is created by default
+        *,
+        safe (bool): Manner of content parsing. defaults to the config's safe property.
+        source (str): The filepath of the content being parsed, if the content is from a file
+        encoding (str): The encoding of binary content, a byte order mark takes precedence. defaults to utf-8.
+
+    Example:
+        parser = IncrementalParser()
+        for chunk in iter(lambda: socket.recv(4096), b""):
+            parser.feed(chunk)
+        config = parser.close()
+    """
+
+    def __init__(self, config: ConfigParser = None, *, safe: bool = None, source: str = None, encoding: str = None):
+        self.config = ConfigParser() if config is None else config
+        self._safe = safe
+        self._state = self.config._openParse(source)
+        self._encoding = encoding
+        self._decoder = None  # The incremental decoder of binary content - created once the encoding is known
+        self._decoding = None  # The encoding of the binary content
+        self._head = b""  # The initial bytes of binary content, held until a byte order mark can be identified
+        self._pending = []  # The chunks of the line that has yet to be completed
+        self._pendingSize = 0  # The number of characters of the pending chunks
+        self._closed = False
+
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None: self.close()
+
+    def feed(self, chunk: str):
+        """ Parse the complete lines of the chunk provided, holding onto any incomplete final line
+
+        Params:
+            chunk (str / bytes): The next piece of content
+
+        Raises:
+            ValueError: In the event that the parser has been closed, or the content is invalid
+        """
+
+        if self._closed: raise ValueError("Cannot feed a closed parser")
+        if isinstance(chunk, (bytes, bytearray, memoryview)): chunk = self._decode(bytes(chunk))
+
+        end = chunk.rfind("\n")
+        if end == -1:
+            # No line has been completed by the chunk
+            if chunk:
+                self._pending.append(chunk)
+                self._pendingSize += len(chunk)
+        else:
+            self._pending.append(chunk[:end])
+            content = "".join(self._pending)
+            self._pending = [chunk[end + 1:]] if end + 1 < len(chunk) else []
+            self._pendingSize = len(chunk) - end - 1
+
+            self._parse(content.split("\n"))
+
+        if self.config._limits is not None: self._limitPending(self.config._limits)
+
+    def _limitPending(self, limits: object):
+        """ Reject an incomplete line that is too long, or that takes the content over its size, without waiting for
+        the end of the line
+
+        Params:
+            limits (Limits): The limits of the config
+
+        Raises:
+            LimitExceeded: In the event that the pending content exceeds a limit
+        """
+
+        line = self._state.line_index + 1
+        for size, limit, description in (
+            (self._pendingSize, limits.max_line_length, "The length of the line"),
+            (self._state.size + self._pendingSize, limits.max_size, "The size of the content")
+        ):
+            if limit is not None and size > limit:
+                raise LimitExceeded(
+                    "Line {} - {} exceeds the limit of {}".format(line, description, limit), line, self._state.source
+                )
+
+    def close(self) -> ConfigParser:
+        """ Parse any remaining content and complete the parse
+
+        Returns:
+            ConfigParser: The config that has been parsed into
+        """
+
+        if not self._closed:
+            if self._decoder is not None or self._head: self.feed(self._decode(b"", final = True))
+
+            self._closed = True
+            self._parse(["".join(self._pending)] if self._pending else [], final = True)
+            self._pending, self._pendingSize = [], 0
+
+        return self.config
+
+    def _decode(self, chunk: bytes, final: bool = False) -> str:
+        """ Decode the next chunk of binary content - holding onto the bytes of any incomplete character
+
+        Params:
+            chunk (bytes): The next piece of binary content
+            final (bool): Whether the content has ended
+
+        Returns:
+            str: The characters completed by the chunk
+
+        Raises:
+            ParseError: In the event that the content cannot be decoded
+        """
+
+        if self._decoder is None:
+            # The longest byte order mark is four bytes - wait for them before identifying the encoding
+            self._head += chunk
+            if len(self._head) < 4 and not final: return ""
+
+            start, encoding = ConfigParser._encodingOf(self._head, self._encoding)
+            self._decoder, self._decoding = codecs.getincrementaldecoder(encoding)(), encoding
+            chunk, self._head = self._head[start:], b""
+
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError as e:
+            # The line of the error follows the lines completed before it within the chunk
+            line = self._state.line_index + 1 + chunk[:e.start].count("\n".encode(self._decoding))
+            raise ParseError(
+                "Line {} - Cannot be decoded as {}".format(line, self._decoding), line, self._state.source
+            ) from e
+
+    def _parse(self, lines: [str], final: bool = False):
+        """ Parse lines into the config as a single batch of changes """
+
+        # The fed content is not held by any file the config was read from - saving the config writes it in full
+        if lines: self.config._mirror = None
+
+        with self.config.batch(), self.config._untracked(), self.config._safety(self._safe):
+            for line in lines:
+                self.config._parseLine(self._state, line)
+
+            if final: self.config._closeParse(self._state)
@@ -0,0 +1,82 @@
+import sys
+
+class InternPool:
+    """ A flyweight pool of keys and immutable values that can be shared between many ConfigParser instances. Equal
+    keys, strings and immutable converted values (tuples, frozensets, ints...) are collapsed onto a single instance
+    such that the memory held grows with the unique content of the configs rather than with their number.
+
+    Example:
+        pool = InternPool()
+        configs = [ConfigParser(source, pool = pool) for source in sources]
+        pool.report()
+    """
+
+    # Types whose instances are immutable and can therefore be safely shared between configs
+    _immutable = (str, bytes, int, float, complex, range, tuple, frozenset)
+
+    def __init__(self):
+        self._pool = {}  # The interning table - a hashable identity key to the canonical instance
+        self.hits = 0  # The number of values that were replaced by a previously pooled instance
+        self.saved = 0  # The number of bytes that have been released by replacing values with pooled instances
+
+    def __len__(self): return len(self._pool)
+    def __repr__(self): return "<InternPool {} entries, {} bytes saved>".format(len(self._pool), self.saved)
+
+    def intern(self, value: object) -> object:
+        """ Collect the pooled instance equivalent to the value provided, adding the value to the pool if it is the
+        first of its kind. Mutable values and values that cannot be hashed are returned unchanged.
+
+        Params:
+            value (object): The value to be interned
+
+        Returns:
+            object: The canonical instance of the value
+        """
+
+        if type(value) not in self._immutable: return value
+
+        try:
+            key = self._key(value)
+            pooled = self._pool.setdefault(key, value)
+        except TypeError:
+            # The immutable container holds an unhashable value - it cannot be shared
+            return value
+
+        if pooled is not value:
+            self.hits += 1
+            self.saved += self._sizeof(value)
+
+        return pooled
+
+    def clear(self):
+        """ Release all the pooled instances and reset the pool's statistics """
+        self._pool.clear()
+        self.hits, self.saved = 0, 0
+
+    def report(self) -> dict:
+        """ Report the effectiveness of the pool
+
+        Returns:
+            dict: The number of unique entries held, the number of values deduplicated and the bytes saved by doing so
+        """
+        return {"entries": len(self._pool), "hits": self.hits, "saved": self.saved}
+
+    @classmethod
+    def _key(cls, value: object) -> object:
+        """ Generate a key for a value that only compares equal to the key of an identical value. Values such as 1,
+        1.0 and True are equal in python yet must not be collapsed together, so the type forms part of the key
+
+        Raises:
+            TypeError: In the event that the value (or a value it contains) is unhashable
+        """
+        if isinstance(value, (tuple, frozenset)):
+            return (type(value), type(value)(cls._key(item) for item in value))
+        return (type(value), value)
+
+    @classmethod
+    def _sizeof(cls, value: object) -> int:
+        """ Calculate the memory held by a value and any immutable values that it contains """
+        size = sys.getsizeof(value)
+        if isinstance(value, (tuple, frozenset)):
+            size += sum(cls._sizeof(item) for item in value)
+        return size
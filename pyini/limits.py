@@ -0,0 +1,93 @@
+import os
+
+class Limits:
+    """ Bounds on the resources that parsing a config may consume, for parsing configs from untrusted sources. A
+    limit of None is unbounded. Exceeding a limit raises a LimitExceeded error as soon as it is detected.
+
+    Parameters:
+        *,
+        max_size (int): The number of characters (or bytes of binary content) of a parsed source
+        max_line_length (int): The number of characters of a line
+        max_depth (int): The number of sections that can be nested within one another
+        max_settings (int): The number of settings of a parsed source
+        max_value_length (int): The number of characters of a setting's value (including continuation lines)
+        max_interpolation (int): The number of characters of a line once its references have been interpolated
+        max_expansion (int): The number of characters interpolated into a parsed source - over all of its lines
+        max_items (int): The number of items of a converted value - sequences, ranges and the size of bytes
+        types (set): The type names that settings may be converted to - defaults to any type, including types that
+            are imported (e.g. `(decimal.Decimal)`)
+        includes ([str]): The directories files may be included from (`%include`) - an empty list forbids includes
+
+    Example:
+        config = ConfigParser(limits = Limits.untrusted()).parse(content)
+    """
+
+    # The built in types that can be converted without importing or evaluating code
+    BUILTIN_TYPES = frozenset({
+        "str", "int", "float", "complex", "bool", "list", "tuple", "set", "frozenset", "range", "bytes", "bytearray",
+        "array"
+    })
+
+    def __init__(
+        self,
+        *,
+        max_size: int = None,
+        max_line_length: int = None,
+        max_depth: int = None,
+        max_settings: int = None,
+        max_value_length: int = None,
+        max_interpolation: int = None,
+        max_expansion: int = None,
+        max_items: int = None,
+        types: set = None,
+        includes: [str] = None
+    ):
+        self.max_size = max_size
+        self.max_line_length = max_line_length
+        self.max_depth = max_depth
+        self.max_settings = max_settings
+        self.max_value_length = max_value_length
+        self.max_interpolation = max_interpolation
+        self.max_expansion = max_expansion
+        self.max_items = max_items
+        self.types = None if types is None else frozenset(types)
+        self.includes = None if includes is None else tuple(os.path.realpath(directory) for directory in includes)
+
+    def __repr__(self):
+        limits = ("{}={!r}".format(name, value) for name, value in vars(self).items() if value is not None)
+        return "Limits({})".format(", ".join(limits))
+
+    def includable(self, path: str) -> bool:
+        """ Determine whether a file may be included - whether it is within one of the directories of includes
+
+        Params:
+            path (str): The filepath of the file
+
+        Returns:
+            bool: True if the file may be included
+        """
+        if self.includes is None: return True
+
+        # Links are followed, such that they cannot lead outside of the directories
+        path = os.path.realpath(path)
+        return any(path.startswith(os.path.join(directory, "")) for directory in self.includes)
+
+    @classmethod
+    def untrusted(cls) -> "Limits":
+        """ Conservative limits for configs received from untrusted sources - built in types only, without includes
+
+        Returns:
+            Limits: The limits
+        """
+        return cls(
+            max_size = 16*1024*1024,
+            max_line_length = 64*1024,
+            max_depth = 32,
+            max_settings = 100000,
+            max_value_length = 1024*1024,
+            max_interpolation = 1024*1024,
+            max_expansion = 16*1024*1024,
+            max_items = 1000000,
+            types = cls.BUILTIN_TYPES,
+            includes = ()
+        )
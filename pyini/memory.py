@@ -0,0 +1,152 @@
+import gc
+import sys
+import types
+
+from .section import Deferred
+
+class MemoryReport:
+    """ The memory held by a config, attributed to the sections holding it and to the types of the values held. Each
+    object is counted once, however many times it is referenced within the config.
+
+    Attributes:
+        total (int): The number of bytes held by the config
+        sections (dict): The colon delimited path of each section (the root section being "") to the bytes held
+            directly by the section - its table, keys and setting values but not its subsections
+        types (dict): The name of each type of setting value to the bytes held by the values of that type
+    """
+
+    def __init__(self, total: int, sections: dict, types: dict):
+        self.total = total
+        self.sections = sections
+        self.types = types
+
+    def __repr__(self):
+        return "<MemoryReport {} bytes across {} sections and {} types>".format(
+            self.total, len(self.sections), len(self.types)
+        )
+
+    def top(self, n: int = 10, *, by: str = "sections", inclusive: bool = False) -> [(str, int)]:
+        """ Rank the largest holders of memory within the config
+
+        Params:
+            n (int): The number of holders to report
+            by (str): Rank either the "sections" or the "types" of values
+            inclusive (bool): Include the memory held by a section's subsections within the section
+
+        Returns:
+            [(str, int)]: The name of each holder and the bytes it holds, largest first
+        """
+
+        if by == "types":
+            sizes = self.types
+        elif by == "sections":
+            sizes = self._inclusive() if inclusive else self.sections
+        else:
+            raise ValueError("Cannot rank memory by {} - expected 'sections' or 'types'".format(by))
+
+        return sorted(sizes.items(), key = lambda item: item[1], reverse = True)[:n]
+
+    def _inclusive(self) -> dict:
+        """ Sum the memory of each section along with the memory of its subsections """
+        totals = dict.fromkeys(self.sections, 0)
+        for path, size in self.sections.items():
+            keys = path.split(":") if path else []
+            for depth in range(len(keys) + 1):
+                totals[":".join(keys[:depth])] += size
+        return totals
+
+def measure(root: dict, exclude: tuple = ()) -> MemoryReport:
+    """ Walk the sections of a config, measuring the memory held by each section and by each type of value
+
+    Params:
+        root (dict): The root section of the config
+        exclude (tuple): Objects that are not to be counted (nor walked into), such as the config itself
+
+    Returns:
+        MemoryReport: The memory held
+    """
+
+    seen = {id(item) for item in exclude}
+    sections, types = {}, {}
+    getsizeof, leaves = sys.getsizeof, _leaves
+
+    stack = [((), root)]
+    while stack:
+        path, section = stack.pop()
+        seen.add(id(section))
+        size = getsizeof(section)
+
+        for key, value in dict.items(section):
+            # Keys and values that reference no other objects are measured in place - they are the bulk of a config
+            if type(key) in leaves:
+                if id(key) not in seen:
+                    seen.add(id(key))
+                    size += getsizeof(key)
+            else:
+                size += _deepsize(key, seen)
+
+            kind = type(value)
+            if kind in leaves:
+                if id(value) in seen: continue
+                seen.add(id(value))
+                held = getsizeof(value)
+                name = kind.__name__
+
+            elif isinstance(value, dict):
+                if id(value) not in seen: stack.append((path + (key,), value))
+                continue
+
+            else:
+                held = _deepsize(value, seen)
+                name = _typename(value)
+
+            types[name] = types.get(name, 0) + held
+            size += held
+
+        sections[":".join(map(str, path))] = size
+
+    return MemoryReport(sum(sections.values()), sections, types)
+
+# Types whose instances hold no references to other objects
+_leaves = {str, bytes, bytearray, int, float, complex, bool, range, type(None)}
+
+# Objects that are shared by the program rather than held by a config - they are never walked into
+_shared = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def _deepsize(value: object, seen: set) -> int:
+    """ Measure the memory held by a value and the objects it references that haven't already been counted
+
+    Params:
+        value (object): The value to measure
+        seen (set): The ids of the objects already counted - updated with the objects counted
+
+    Returns:
+        int: The number of bytes
+    """
+
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _shared): continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        # Strings, numbers and buffers hold no references to other objects
+        if type(item) in _leaves: continue
+
+        if isinstance(item, (tuple, list, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        else:
+            stack.extend(gc.get_referents(item))
+
+    return size
+
+def _typename(value: object) -> str:
+    """ The name a value's memory is attributed to """
+    if type(value) is Deferred: return "deferred"
+    kind = type(value)
+    return kind.__qualname__ if kind.__module__ == "builtins" else "{}.{}".format(kind.__module__, kind.__qualname__)
@@ -0,0 +1,134 @@
+class Subscription:
+    """ A callback that has subscribed to the changes made under a path of a config
+
+    Parameters:
+        dispatcher (ChangeDispatcher): The dispatcher the subscription is registered with
+        pattern (tuple): The keys of the path subscribed to, '*' matching any key
+        callback (callable): The function to be called with the list of changed paths
+    """
+
+    __slots__ = ("dispatcher", "pattern", "callback")
+
+    def __init__(self, dispatcher: object, pattern: tuple, callback: callable):
+        self.dispatcher = dispatcher
+        self.pattern = pattern
+        self.callback = callback
+
+    def __repr__(self): return "<Subscription {} {}>".format(":".join(self.pattern), self.callback)
+
+    def cancel(self):
+        """ Stop the callback from being informed of any further changes """
+        self.dispatcher.unsubscribe(self)
+
+class _Node:
+    """ A node of the subscription trie - holds the subscriptions whose pattern ends at this node """
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self):
+        self.children = {}
+        self.subscriptions = []
+
+class ChangeDispatcher:
+    """ Dispatches the paths changed within a config to the subscriptions whose patterns match them. Subscriptions are
+    held within a trie of their pattern's keys such that the cost of dispatching a change follows the depth of the
+    change rather than the number of subscriptions.
+
+    A subscription matches a changed path when the path is beneath the pattern (a change of "database:host" matches
+    "database" and "database:*"), or when the path contains the pattern (replacing "database" matches
+    "database:pool:size").
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self): return self._count
+    def __bool__(self): return self._count > 0
+
+    def subscribe(self, pattern: tuple, callback: callable) -> Subscription:
+        """ Register a callback to be informed of the changes that match the pattern provided
+
+        Params:
+            pattern (tuple): The keys of the path, a key of '*' matches any key
+            callback (callable): Function to be called with the list of the matching changed paths
+
+        Returns:
+            Subscription: The handle of the subscription, allowing for it to be cancelled
+        """
+
+        node = self._root
+        for key in pattern:
+            node = node.children.setdefault(key, _Node())
+
+        subscription = Subscription(self, tuple(pattern), callback)
+        node.subscriptions.append(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """ Remove a subscription from the dispatcher - pruning the nodes of the trie that are no longer required
+
+        Params:
+            subscription (Subscription): The subscription to be removed
+        """
+
+        nodes = [self._root]
+        for key in subscription.pattern:
+            node = nodes[-1].children.get(key)
+            if node is None: return
+            nodes.append(node)
+
+        if subscription not in nodes[-1].subscriptions: return
+        nodes[-1].subscriptions.remove(subscription)
+        self._count -= 1
+
+        for key, node, parent in zip(reversed(subscription.pattern), reversed(nodes), reversed(nodes[:-1])):
+            if node.subscriptions or node.children: break
+            del parent.children[key]
+
+    def dispatch(self, paths: [tuple]):
+        """ Call each subscription that matches any of the paths provided, once, with the list of paths it matched
+
+        Params:
+            paths ([tuple]): The changed paths, each a tuple of keys
+        """
+
+        matched = {}
+        for path in paths:
+            for subscription in dict.fromkeys(self._match(self._root, path, 0)):
+                matched.setdefault(subscription, []).append(":".join(path))
+
+        for subscription, changes in matched.items():
+            subscription.callback(changes)
+
+    def _match(self, node: _Node, path: tuple, depth: int) -> list:
+        """ Collect the subscriptions that match the path from the node provided - shallower patterns first
+
+        Params:
+            node (_Node): The trie node reached by matching path[:depth]
+            path (tuple): The changed path
+            depth (int): The number of keys of the path already matched
+
+        Returns:
+            list: The matching subscriptions (which may be repeated)
+        """
+
+        # The path is beneath the patterns that end at this node
+        matches = list(node.subscriptions)
+
+        if depth == len(path):
+            # The entire path has been consumed - the change contains every pattern beneath this node
+            stack = list(reversed(node.children.values()))
+            while stack:
+                child = stack.pop()
+                matches.extend(child.subscriptions)
+                stack.extend(reversed(child.children.values()))
+
+            return matches
+
+        for key in (path[depth], "*"):
+            child = node.children.get(key)
+            if child is not None: matches.extend(self._match(child, path, depth + 1))
+
+        return matches
@@ -0,0 +1,203 @@
+import array
+import bisect
+import hashlib
+import itertools
+import collections
+
+Origin = collections.namedtuple("Origin", ("source", "line", "column"))
+Origin.__doc__ = """ Where a setting was read from - the filepath of the source (None for content parsed from a string),
+the line number and the column the setting's declaration begins at """
+
+class OriginMap:
+    """ A compact record of the origin of each setting of a config. Rather than holding an object per setting, the map
+    holds its rows in parallel arrays - the digest of the setting's path, the id of its source file, its line, its
+    column and the number of lines it spans - along with an open addressing table (also an array) of the rows by path
+    digest.
+
+    Paths are identified by a 64 bit digest of their keys, such that the paths themselves are not held by the map.
+    """
+
+    _EMPTY = -1  # Marks an unused position of the table
+
+    def __init__(self):
+        self._sources = []  # Source file id to the filepath of the source
+        self._sourceIds = {}  # Filepath of a source to its id
+
+        self._digests = array.array("q")  # Row to the digest of the path recorded by the row
+        self._files = array.array("I")  # Row to the id of the source of the setting
+        self._lines = array.array("I")  # Row to the line of the setting - zero marks a discarded row
+        self._columns = array.array("I")  # Row to the column of the setting
+        self._spans = array.array("I")  # Row to the number of lines of the setting - including continuation lines
+
+        self._table = array.array("i", [self._EMPTY])*8  # Position to row - positions are found by probing
+        self._count = 0  # The number of rows that have not been discarded
+
+    def __len__(self): return self._count
+    def __repr__(self): return "<OriginMap {} settings from {} sources>".format(self._count, len(self._sources))
+
+    def __contains__(self, path: tuple): return self.lookup(path) is not None
+
+    @property
+    def nbytes(self) -> int:
+        """ The number of bytes held by the arrays of the map """
+        return sum(
+            column.itemsize*len(column)
+            for column in (self._digests, self._files, self._lines, self._columns, self._spans, self._table)
+        )
+
+    @property
+    def sources(self) -> tuple:
+        """ The sources that origins have been recorded for """
+        return tuple(self._sources)
+
+    def record(self, path: tuple, source: str, line: int, column: int = 1, span: int = 1):
+        """ Record the origin of the setting at the path provided, replacing any previous origin of the path
+
+        Params:
+            path (tuple): The keys leading to the setting
+            source (str): The filepath the setting was read from - None if it wasn't read from a file
+            line (int): The line of the setting
+            column (int): The column the setting's declaration begins at
+            span (int): The number of lines of the setting's declaration
+        """
+
+        fileId = self._sourceIds.get(source)
+        if fileId is None:
+            fileId = self._sourceIds[source] = len(self._sources)
+            self._sources.append(source)
+
+        digest = self._digest(path)
+        position, row = self._probe(digest)
+
+        if row == self._EMPTY:
+            row = len(self._digests)
+            self._digests.append(digest)
+            self._files.append(fileId)
+            self._lines.append(line)
+            self._columns.append(column or 1)
+            self._spans.append(span)
+            self._table[position] = row
+            self._count += 1
+
+            # Keep the table at most half full so that probes remain short
+            if len(self._digests)*2 > len(self._table): self._resize()
+
+        else:
+            if not self._lines[row]: self._count += 1
+            self._files[row], self._lines[row], self._columns[row], self._spans[row] = fileId, line, column or 1, span
+
+    def lookup(self, path: tuple) -> Origin:
+        """ Collect the origin of the setting at the path
+
+        Params:
+            path (tuple): The keys leading to the setting
+
+        Returns:
+            Origin: The origin of the setting, or None if no origin is recorded for the path
+        """
+        row = self._row(path)
+        if row is None: return None
+        return Origin(self._sources[self._files[row]], self._lines[row], self._columns[row])
+
+    def extent(self, path: tuple) -> (str, int, int, int):
+        """ Collect the lines of the source spanned by the setting at the path
+
+        Params:
+            path (tuple): The keys leading to the setting
+
+        Returns:
+            (str, int, int, int): The source, line, column and number of lines of the setting - or None if no origin
+                is recorded for the path
+        """
+        row = self._row(path)
+        if row is None: return None
+        return self._sources[self._files[row]], self._lines[row], self._columns[row], self._spans[row]
+
+    def discard(self, path: tuple):
+        """ Forget the origin of the setting at the path, if one was recorded
+
+        Params:
+            path (tuple): The keys leading to the setting
+        """
+        row = self._row(path)
+        if row is not None:
+            self._lines[row] = 0
+            self._count -= 1
+
+    def merge(self, other: "OriginMap", content: dict, prefix: tuple = ()):
+        """ Copy the origins of the settings of some content from the map that recorded them
+
+        Params:
+            other (OriginMap): The map holding the origins of the content
+            content (dict): The content whose settings' origins are to be copied
+            prefix (tuple): The keys leading to the content within the config of this map
+        """
+
+        stack = [((), content)]
+        while stack:
+            path, node = stack.pop()
+            for key, value in dict.items(node):
+                if isinstance(value, dict):
+                    stack.append((path + (key,), value))
+                    continue
+
+                extent = other.extent(path + (key,))
+                if extent is not None: self.record(prefix + path + (key,), *extent)
+
+    def shift(self, sources: set, edits: [(int, int)]):
+        """ Move the lines of the settings of a source after lines of the source have been inserted or removed
+
+        Params:
+            sources (set): The names the source has been recorded under
+            edits ([(int, int)]): The line after which lines were inserted (or removed) and the change in the number
+                of lines, ordered by line. Lines are numbered as they were before any of the edits
+        """
+
+        fileIds = {self._sourceIds[source] for source in sources if source in self._sourceIds}
+        if not fileIds: return
+
+        bounds = [line for line, _ in edits]
+        offsets = list(itertools.accumulate(delta for _, delta in edits))
+
+        lines = self._lines
+        for row, fileId in enumerate(self._files):
+            if fileId in fileIds and lines[row]:
+                index = bisect.bisect_left(bounds, lines[row])  # The number of edits preceding the line
+                if index: lines[row] += offsets[index - 1]
+
+    def _row(self, path: tuple) -> int:
+        """ Find the row recording the origin of a path - None if the path has no (undiscarded) row """
+        row = self._probe(self._digest(path))[1]
+        if row == self._EMPTY or not self._lines[row]: return None
+        return row
+
+    def _probe(self, digest: int) -> (int, int):
+        """ Find the position of a digest within the table
+
+        Params:
+            digest (int): The digest of a path
+
+        Returns:
+            int: The position of the digest, or the empty position it would occupy
+            int: The row of the digest, or _EMPTY if the digest has no row
+        """
+
+        table, digests, mask = self._table, self._digests, len(self._table) - 1
+
+        position = digest & mask
+        while True:
+            row = table[position]
+            if row == self._EMPTY or digests[row] == digest: return position, row
+            position = (position + 1) & mask
+
+    def _resize(self):
+        """ Double the size of the table, re-positioning the rows """
+        self._table = array.array("i", [self._EMPTY])*(len(self._table)*2)
+        for row, digest in enumerate(self._digests):
+            self._table[self._probe(digest)[0]] = row
+
+    @staticmethod
+    def _digest(path: tuple) -> int:
+        """ Generate a 64 bit digest of a path that is stable between processes """
+        content = "\0".join(map(str, path)).encode("utf-8", "surrogatepass")
+        return int.from_bytes(hashlib.blake2b(content, digest_size = 8).digest(), "big", signed = True)
@@ -0,0 +1,113 @@
+import os
+import stat
+import tempfile
+import contextlib
+
+@contextlib.contextmanager
+def replacing(path: str, *, binary: bool = False, encoding: str = None):
+    """ Open a temporary file alongside the file at the path which replaces the file, atomically, once the context
+    exits without error. Readers of the path see either the previous content or the new content, never a mixture.
+
+    Params:
+        path (str): The filepath of the file to be replaced (or created)
+        binary (bool): Open the temporary file in binary mode
+        encoding (str): The encoding of the temporary file when opened in text mode
+
+    Yields:
+        FileHandle: The handle of the temporary file - line endings are written as given
+    """
+
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix = ".{}.".format(name), suffix = ".tmp", dir = directory)
+
+    try:
+        if binary:
+            handle = os.fdopen(descriptor, "wb")
+        else:
+            handle = os.fdopen(descriptor, "w", encoding = encoding, newline = "")
+
+        with handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        os.chmod(temporary, _mode(path))
+        os.replace(temporary, path)
+
+    except BaseException:
+        with contextlib.suppress(OSError): os.unlink(temporary)
+        raise
+
+def splice(content: bytes, lines: object, edits: list) -> bytes:
+    """ Replace ranges of the lines of some content
+
+    Params:
+        content (bytes): The content to be edited
+        lines (iterator): The match of each line of the content (including its line ending), in order
+        edits (list): The line numbers of each range to be replaced, the number of lines of the range and a function
+            producing the replacement from the lines being replaced - `function(lines: bytes) -> bytes`. The edits are
+            ordered by line and must not overlap
+
+    Returns:
+        bytes: The edited content
+    """
+
+    pieces, position = [], 0
+    lines = enumerate(lines, 1)
+
+    for first, count, replace in edits:
+        last = first + count - 1
+
+        # Find the bounds of the lines being replaced
+        for number, match in lines:
+            if number == first: begin = match.start()
+            if number == last: break
+        else:
+            raise ValueError("Lines {} to {} are not within the content".format(first, last))
+
+        pieces.append(content[position: begin])
+        pieces.append(replace(content[begin: match.end()]))
+        position = match.end()
+
+    pieces.append(content[position:])
+    return b"".join(pieces)
+
+class Recorder:
+    """ A wrapper of a file handle that records the origin of each setting written through it - see
+    ConfigParser._write
+
+    Parameters:
+        handle (FileHandle): The handle being written to
+        origins (OriginMap): The map to record the origins within
+        source (str): The filepath of the file being written
+    """
+
+    def __init__(self, handle: object, origins: object, source: str):
+        self.handle = handle
+        self.origins = origins
+        self.source = source
+        self.line = 1  # The line about to be written
+
+    def write(self, text: str):
+        self.handle.write(text)
+        self.line += text.count(os.linesep)
+
+    def record(self, path: tuple, column: int, text: str):
+        """ Record the origin of a setting that is about to be written
+
+        Params:
+            path (tuple): The keys leading to the setting
+            column (int): The column the setting's declaration begins at
+            text (str): The lines of the setting
+        """
+        self.origins.record(path, self.source, self.line, column, text.count(os.linesep))
+
+def _mode(path: str) -> int:
+    """ The permissions a replacement of the file at the path is given - those of the file, or those a new file
+    receives when the path doesn't exist """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
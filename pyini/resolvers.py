@@ -0,0 +1,100 @@
+import os
+import time
+
+class Resolvers:
+    """ Resolvers of interpolated references to values outside of the config - e.g. `{env:HOME}`. A reference whose
+    first key is the prefix of a resolver is passed (without the prefix) to the resolver, and the resolved value is
+    cached such that repeated references to the same value are resolved once.
+
+    Parameters:
+        resolvers (dict): The prefix of each resolver to the function resolving its references - `function(name) -> str`
+        *,
+        ttl (float): The number of seconds resolved values are cached for - defaults to until they are invalidated
+
+    Example:
+        resolvers = Resolvers({"env": pyini.resolvers.env, "file": pyini.resolvers.file}, ttl = 60)
+        config = ConfigParser(source, resolvers = resolvers)
+    """
+
+    def __init__(self, resolvers: dict = None, *, ttl: float = None):
+        self._resolvers = dict(resolvers or {})
+        self.ttl = ttl
+        self._cache = {}  # (prefix, name) to the resolved value and its expiry time
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, prefix: str): return prefix in self._resolvers
+    def __repr__(self): return "<Resolvers {}>".format(", ".join(self._resolvers))
+
+    def __getstate__(self):
+        # The resolved values (which may be secrets) are not carried across to copies of the resolvers
+        state = self.__dict__.copy()
+        state["_cache"], state["hits"], state["misses"] = {}, 0, 0
+        return state
+
+    def register(self, prefix: str, resolver: callable):
+        """ Add (or replace) the resolver of a prefix, discarding any values cached for the prefix
+
+        Params:
+            prefix (str): The first key of the references to be resolved
+            resolver (callable): The function resolving the references - `function(name) -> str`
+        """
+        self._resolvers[prefix] = resolver
+        self.invalidate(prefix)
+
+    def resolve(self, prefix: str, name: str) -> str:
+        """ Resolve a reference, using the cached value of the reference if it hasn't expired
+
+        Params:
+            prefix (str): The prefix of the resolver
+            name (str): The remainder of the reference
+
+        Returns:
+            str: The resolved value
+
+        Raises:
+            Exception: Any exception raised by the resolver
+        """
+
+        entry = self._cache.get((prefix, name))
+        if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = str(self._resolvers[prefix](name))
+        self._cache[(prefix, name)] = (value, None if self.ttl is None else time.monotonic() + self.ttl)
+        return value
+
+    def invalidate(self, prefix: str = None, name: str = None):
+        """ Discard cached values, such that they are resolved again when next referenced
+
+        Params:
+            prefix (str): Only discard the values of the resolver of this prefix - defaults to all resolvers
+            name (str): Only discard the value of this reference of the prefix's resolver
+        """
+
+        if prefix is None:
+            self._cache.clear()
+        elif name is not None:
+            self._cache.pop((prefix, name), None)
+        else:
+            for key in [key for key in self._cache if key[0] == prefix]: del self._cache[key]
+
+def env(name: str) -> str:
+    """ Resolve a reference to an environment variable - `{env:NAME}`
+
+    Raises:
+        KeyError: In the event that the variable isn't set
+    """
+    return os.environ[name]
+
+def file(path: str) -> str:
+    """ Resolve a reference to the content of a file (such as a secret) without its trailing newline -
+    `{file:/run/secrets/token}`
+
+    Raises:
+        OSError: In the event that the file cannot be read
+    """
+    with open(os.path.expanduser(path)) as handle:
+        return handle.read().rstrip("\r\n")
@@ -0,0 +1,363 @@
+import typing
+import collections
+import dataclasses
+
+from .configparser import ConfigParser, ParseError
+from .origins import OriginMap
+
+SchemaIssue = collections.namedtuple("SchemaIssue", ("path", "line", "message"))
+SchemaIssue.__doc__ = """ A problem found while loading a config against a schema - the colon delimited path of the setting, the
+line it was read from (if known) and a description of the problem """
+
+class SchemaError(ValueError):
+    """ Raised when a config doesn't satisfy a schema. All of the problems found are reported together
+
+    Parameters:
+        issues ([SchemaIssue]): The problems found
+    """
+
+    def __init__(self, issues: [SchemaIssue]):
+        self.issues = issues
+
+        lines = []
+        for issue in issues:
+            location = issue.path if issue.line is None else "{} (line {})".format(issue.path, issue.line)
+            lines.append("    {}: {}".format(location, issue.message))
+
+        super().__init__("{} problem(s) found:\n{}".format(len(issues), "\n".join(lines)))
+
+class Record:
+    """ The base of the slotted classes generated for schemas. Records are compared by their values and can be
+    converted back into dictionaries """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            ", ".join("{}={!r}".format(name, getattr(self, name)) for name in self._fields)
+        )
+
+    def __eq__(self, other: object):
+        if type(other) is not type(self): return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def _asdict(self) -> dict:
+        """ Convert the record (and any records it holds) into a dictionary """
+        return {
+            name: value._asdict() if isinstance(value, Record) else value
+            for name, value in ((name, getattr(self, name)) for name in self._fields)
+        }
+
+class Schema:
+    """ A declared structure for a config (or a section of one) that is compiled once into a loader. The schema is
+    declared as a dataclass, a TypedDict or any class with annotations - annotations that are themselves such classes
+    declare subsections.
+
+    Loading converts each setting to its annotated type and sets it directly onto an instance of a generated class with
+    `__slots__`, so the result is accessed by attribute rather than through nested dictionaries. Every missing or
+    ill-typed setting is collected (with the line it was read from when the content was parsed by the schema) and
+    raised together as a SchemaError.
+
+    Parameters:
+        definition (type): The class declaring the settings and their types
+        *,
+        section (str): A colon delimited path of the section to be loaded - defaults to the whole config
+        delimiter (str): The separator of the items of sequence values given as strings
+
+    Example:
+        @dataclasses.dataclass
+        class Database:
+            host: str
+            port: int = 5432
+
+        database = Schema(Database, section = "database").read("service.ini")
+        database.port
+    """
+
+    # Strings accepted as booleans
+    _booleans = {"true": True, "yes": True, "on": True, "1": True, "false": False, "no": False, "off": False, "0": False}
+
+    def __init__(self, definition: type, *, section: str = None, delimiter: str = ","):
+        self.definition = definition
+        self.section = section
+        self._delimiter = delimiter
+
+        fields = self._fields(definition)
+
+        self.type = type(definition.__name__, (Record,), {
+            "__slots__": tuple(name for name, *_ in fields),
+            "__module__": definition.__module__,
+            "__qualname__": getattr(definition, "__qualname__", definition.__name__),
+            "_fields": tuple(name for name, *_ in fields),
+        })
+
+        # The plan of the loader - for each field: its key, setter, converter, nested schema and default
+        self._plan = []
+        for name, key, annotation, default, factory in fields:
+            nested = Schema(annotation, delimiter = delimiter) if self._isDefinition(annotation) else None
+            convert = None if nested else self._converter(annotation)
+            self._plan.append((key, self.type.__dict__[name].__set__, convert, nested, default, factory))
+
+    def __repr__(self): return "<Schema {}>".format(self.definition.__name__)
+
+    def load(self, config: dict) -> Record:
+        """ Load the content of a config (or any mapping) into a record
+
+        Params:
+            config (dict): The config to be loaded - problems are located when the config is tracking its origins
+
+        Returns:
+            Record: An instance of the schema's type
+
+        Raises:
+            SchemaError: In the event that settings are missing or cannot be converted
+        """
+        return self._loadRoot(config, config._origins if isinstance(config, ConfigParser) else None)
+
+    def parse(self, configuration_string: str, **options) -> Record:
+        """ Parse a config and load its content into a record - see ConfigParser.parse
+
+        Params:
+            configuration_string (str / bytes / io.IO.base): The content to be parsed
+            **options: The keyword arguments for the ConfigParser
+
+        Returns:
+            Record: An instance of the schema's type
+
+        Raises:
+            SchemaError: In the event that settings are missing or cannot be converted
+        """
+        config = self._parser(options).parse(configuration_string)
+        return self._loadRoot(config, config._origins)
+
+    def read(self, filepath: str, **options) -> Record:
+        """ Read a config file and load its content into a record - see ConfigParser.read
+
+        Params:
+            filepath (str): The filepath to the configuration file
+            **options: The keyword arguments for the ConfigParser
+
+        Returns:
+            Record: An instance of the schema's type
+
+        Raises:
+            SchemaError: In the event that settings are missing or cannot be converted
+        """
+        config = self._parser(options).read(filepath)
+        return self._loadRoot(config, config._origins)
+
+    def _parser(self, options: dict) -> ConfigParser:
+        """ Create the parser the schema parses content with - typed settings are converted lazily so that a setting
+        that cannot be converted is reported alongside every other problem rather than ending the parse """
+        options.setdefault("lazy", True)
+        options.setdefault("delimiter", self._delimiter)
+        options.setdefault("track_origins", True)
+        return ConfigParser(**options)
+
+    def _loadRoot(self, config: dict, origins: OriginMap) -> Record:
+        """ Load the schema's section of the config, raising any problems found """
+
+        issues = []
+        path = tuple(self.section.split(":")) if self.section else ()
+
+        section = config
+        for key in path:
+            section = section.get(key) if isinstance(section, (dict, ConfigParser)) else None
+
+        if not isinstance(section, (dict, ConfigParser)):
+            raise SchemaError([SchemaIssue(self.section, None, "Missing section")])
+
+        record = self._load(section, path, origins, issues)
+        if issues: raise SchemaError(issues)
+        return record
+
+    def _load(self, section: dict, path: tuple, origins: OriginMap, issues: list) -> Record:
+        """ Load a section into a record following the schema's plan
+
+        Params:
+            section (dict): The section to be loaded
+            path (tuple): The keys leading to the section
+            origins (OriginMap): Where each setting of the config was read from - None if unknown
+            issues (list): The collection of problems that have been found
+
+        Returns:
+            Record: The record - incomplete if problems were found
+        """
+
+        record = self.type.__new__(self.type)
+
+        for key, setter, convert, nested, default, factory in self._plan:
+            if key not in section:
+                if factory is not None:
+                    setter(record, factory())
+                elif default is not _REQUIRED:
+                    setter(record, default)
+                else:
+                    issues.append(SchemaIssue(":".join(path + (key,)), None, "Missing required setting"))
+                continue
+
+            try:
+                value = section[key]
+            except ParseError as e:
+                # A lazily converted setting whose declared type couldn't be converted
+                issues.append(SchemaIssue(":".join(path + (key,)), e.line, e.message))
+                continue
+
+            if nested is not None:
+                if not isinstance(value, dict):
+                    issues.append(SchemaIssue(":".join(path + (key,)), _line(origins, path + (key,)), "Expected a section"))
+                    continue
+                setter(record, nested._load(value, path + (key,), origins, issues))
+
+            else:
+                try:
+                    setter(record, convert(value))
+                except (ValueError, TypeError) as e:
+                    issues.append(SchemaIssue(":".join(path + (key,)), _line(origins, path + (key,)), str(e)))
+
+        return record
+
+    @staticmethod
+    def _isDefinition(annotation: object) -> bool:
+        """ Determine whether an annotation declares a subsection """
+        return isinstance(annotation, type) and (
+            dataclasses.is_dataclass(annotation) or
+            (annotation.__module__ != "builtins" and bool(getattr(annotation, "__annotations__", None)))
+        )
+
+    @staticmethod
+    def _fields(definition: type) -> list:
+        """ Collect the fields declared by a definition
+
+        Params:
+            definition (type): The dataclass, TypedDict or annotated class
+
+        Returns:
+            list: The name, key, annotation, default and default factory of each field
+        """
+
+        hints = typing.get_type_hints(definition)
+
+        fields = []
+        if dataclasses.is_dataclass(definition):
+            for field in dataclasses.fields(definition):
+                default = _REQUIRED if field.default is dataclasses.MISSING else field.default
+                factory = None if field.default_factory is dataclasses.MISSING else field.default_factory
+                key = field.metadata.get("key", field.name)
+                fields.append((field.name, key, hints[field.name], default, factory))
+
+        else:
+            # TypedDicts and annotated classes - class attributes provide defaults
+            required = getattr(definition, "__required_keys__", None)
+            for name, annotation in hints.items():
+                default = getattr(definition, name, _REQUIRED) if required is None else None
+                if required is not None and name in required: default = _REQUIRED
+                fields.append((name, name, annotation, default, None))
+
+        return fields
+
+    def _converter(self, annotation: object) -> callable:
+        """ Generate the function that converts a setting value into an instance of its annotated type
+
+        Params:
+            annotation (object): The type annotation of the field
+
+        Returns:
+            callable: A function of the setting value that raises a ValueError or TypeError if it cannot be converted
+        """
+
+        origin, arguments = typing.get_origin(annotation), typing.get_args(annotation)
+
+        if annotation is typing.Any or annotation is object:
+            return lambda value: value
+
+        if origin is typing.Union:
+            options = [self._converter(option) for option in arguments if option is not type(None)]
+            optional = type(None) in arguments
+
+            def convert(value: object) -> object:
+                if value is None and optional: return None
+                for option in options:
+                    try:
+                        return option(value)
+                    except (ValueError, TypeError):
+                        continue
+                raise ValueError("{!r} is not a valid {}".format(value, _name(annotation)))
+            return convert
+
+        if annotation is bool:
+            booleans = self._booleans
+
+            def convert(value: object) -> bool:
+                if type(value) is bool: return value
+                if isinstance(value, str) and value.strip().lower() in booleans: return booleans[value.strip().lower()]
+                raise ValueError("{!r} is not a valid bool".format(value))
+            return convert
+
+        container = origin or annotation
+        if container in (list, tuple, set, frozenset):
+            if container is tuple and arguments and arguments[-1] is not Ellipsis:
+                # A fixed length tuple - each position has its own type
+                items = [self._converter(argument) for argument in arguments]
+            else:
+                items = self._converter(arguments[0]) if arguments else (lambda value: value)
+
+            return lambda value: self._sequence(value, container, items)
+
+        if container is dict:
+            keys, values = (self._converter(argument) for argument in (arguments or (typing.Any, typing.Any)))
+
+            def convert(value: object) -> dict:
+                if not isinstance(value, dict): raise TypeError("{!r} is not a section".format(value))
+                return {keys(key): values(item) for key, item in value.items()}
+            return convert
+
+        if not callable(annotation):
+            raise TypeError("Cannot load settings annotated as {}".format(annotation))
+
+        def convert(value: object) -> object:
+            if type(value) is annotation: return value
+            if isinstance(value, (dict, list, set, frozenset, tuple)) or (annotation is not str and value is None):
+                raise TypeError("{!r} is not a valid {}".format(value, _name(annotation)))
+            try:
+                return annotation(value)
+            except (ValueError, TypeError):
+                raise ValueError("{!r} is not a valid {}".format(value, _name(annotation))) from None
+        return convert
+
+    def _sequence(self, value: object, container: type, items: object) -> object:
+        """ Convert a setting value into a sequence of converted items. String values are split by the delimiter
+
+        Params:
+            value (object): The setting value
+            container (type): The type of the sequence
+            items (callable / [callable]): The converter of each item, or of each position of a fixed length tuple
+
+        Returns:
+            object: The converted sequence
+        """
+
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(self._delimiter)] if value.strip() else []
+        elif not isinstance(value, (list, tuple, set, frozenset)):
+            raise TypeError("{!r} is not a valid {}".format(value, container.__name__))
+
+        if isinstance(items, list):
+            if len(value) != len(items):
+                raise ValueError("Expected {} items but found {}".format(len(items), len(value)))
+            return container(convert(item) for convert, item in zip(items, value))
+
+        return container(map(items, value))
+
+_REQUIRED = object()  # Stands in for the default of a field that must be provided
+
+def _line(origins: OriginMap, path: tuple) -> int:
+    """ The line the setting at the path was read from, if known """
+    origin = origins.lookup(path) if origins is not None else None
+    return origin.line if origin is not None else None
+
+def _name(annotation: object) -> str:
+    """ A readable name of a type annotation """
+    return annotation.__name__ if isinstance(annotation, type) else str(annotation).replace("typing.", "")
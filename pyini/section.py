@@ -0,0 +1,283 @@
+import uuid
+import array
+import decimal
+import hashlib
+import datetime
+import fractions
+
+class Deferred:
+    """ A placeholder for a setting value whose construction has been deferred until it is first accessed
+
+    Parameters:
+        function (callable): The function that constructs the value
+        *args: The arguments to be passed to the function
+    """
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function: callable, *args):
+        self.function = function
+        self.args = args
+
+    def __repr__(self): return "<Deferred {}>".format(", ".join(repr(arg) for arg in self.args))
+
+    def resolve(self) -> object:
+        """ Construct the value that has been deferred
+
+        Returns:
+            object: The value
+        """
+        return self.function(*self.args)
+
+class Section(dict):
+    """ A section of a config. Behaves as a dictionary, except that values whose conversion was deferred during
+    parsing are resolved upon their first access, and replaced by their resolved value.
+
+    Sections belong to the config that owns them, and notify their owner of any mutation made to them. Dictionaries
+    placed within a section are adopted as sections of the same owner - a section that already belongs to a config is
+    copied rather than shared.
+
+    Sections cache a digest of their content, which is discarded (along with those of the sections containing it) when
+    the section is mutated - such that only the sections that have changed need to be re-hashed.
+
+    Parameters:
+        source (dict): The initial content of the section
+        owner (object): The object to be notified of mutations, it must implement
+            `_mutated(section, key, structural, previous)` and hold a count of the sections released, `_releases`
+    """
+
+    __slots__ = ("_owner", "_parent", "_key", "_digest")
+
+    def __init__(self, source: dict = {}, owner: object = None):
+        dict.__init__(self)
+        self._owner = owner
+        self._parent = None
+        self._key = None
+        self._digest = None
+        for key, value in (dict.items(source) if isinstance(source, dict) else source.items()):
+            dict.__setitem__(self, key, self._adopt(key, value))
+
+    def __reduce__(self): return (self.__class__, (dict(dict.items(self)),))
+
+    def __setitem__(self, key: object, value: object):
+        previous = dict.get(self, key, self)  # The section itself stands in for a missing key
+        value = self._adopt(key, value)
+        dict.__setitem__(self, key, value)
+        self._notify(
+            key,
+            previous is self or isinstance(previous, dict) or isinstance(value, dict),
+            None if previous is self or previous is value else previous
+        )
+        if isinstance(previous, Section) and previous is not self and previous is not value: previous._release()
+
+    def __delitem__(self, key: object):
+        previous = dict.pop(self, key)
+        self._notify(key, True, previous)
+        if isinstance(previous, Section): previous._release()
+
+    def digest(self) -> int:
+        """ Generate a 128 bit digest of the content of the section. The digest is independent of the order of the
+        section's keys and is stable between processes. It is cached until the section, or a subsection, is mutated.
+
+        Note: In place changes to mutable setting values (e.g. appending to a list) are not seen by the section
+
+        Returns:
+            int: The digest of the section
+        """
+
+        if self._digest is None:
+            self._digest = _combine(self.items())
+        return self._digest
+
+    def __ior__(self, other: object):
+        self.update(other)
+        return self
+
+    def __getitem__(self, key: object):
+        value = dict.__getitem__(self, key)
+        if type(value) is Deferred:
+            value = value.resolve()
+            dict.__setitem__(self, key, value)
+        return value
+
+    # Overriding the iterator disables the raw copy of a dictionary's storage when unpacking or copying the section
+    # into another dictionary - items are then collected through __getitem__ and so are resolved
+    def __iter__(self): return dict.__iter__(self)
+
+    def __eq__(self, other: object):
+        self._resolve()
+        if isinstance(other, Section): other._resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object):
+        self._resolve()
+        if isinstance(other, Section): other._resolve()
+        return dict.__ne__(self, other)
+
+    def get(self, key: object, default: object = None) -> object:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: object, default: object = None) -> object:
+        if key in self: return self[key]
+        self[key] = default
+        return self[key]  # Dictionaries are adopted as sections - the stored section is returned, not the default
+
+    def pop(self, key: object, *default) -> object:
+        if key not in self: return dict.pop(self, key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple:
+        if not self: raise KeyError("popitem(): section is empty")
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def clear(self):
+        for key in list(self.keys()): del self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items(): self[key] = value
+
+    def values(self):
+        self._resolve()
+        return dict.values(self)
+
+    def items(self):
+        self._resolve()
+        return dict.items(self)
+
+    def copy(self):
+        self._resolve()
+        return dict.copy(self)
+
+    def materialize(self):
+        """ Resolve all the deferred values held within the section and its subsections
+
+        Raises:
+            ValueError: In the event that a deferred value cannot be converted
+        """
+        self._resolve()
+        for value in dict.values(self):
+            if isinstance(value, Section): value.materialize()
+
+    def _adopt(self, key: object, value: object) -> object:
+        """ Prepare a value to be held by the section - dictionaries become sections belonging to this section's owner
+
+        Params:
+            key (object): The key the value is to be held under
+            value (object): The value being added to the section
+
+        Returns:
+            object: The value to be stored
+        """
+        if not isinstance(value, dict): return value
+
+        if isinstance(value, Section) and value._owner is None:
+            # A detached section can be adopted without needing to be copied
+            value._claim(self._owner)
+        else:
+            value = Section(value, self._owner)
+
+        value._parent, value._key = self, key
+        return value
+
+    def _claim(self, owner: object):
+        """ Set the owner of this section and its subsections """
+        self._owner = owner
+        for value in dict.values(self):
+            if isinstance(value, Section): value._claim(owner)
+
+    def _path(self) -> tuple:
+        """ Collect the keys that lead from the root section to this section
+
+        Returns:
+            tuple: The keys of the path
+        """
+        path, node = [], self
+        while node._parent is not None:
+            path.append(node._key)
+            node = node._parent
+        return tuple(reversed(path))
+
+    def _release(self):
+        """ Detach the section (and its subsections) from its owner as it has been removed from the owner's content.
+        The owner's count of released sections is incremented - references to the owner's sections held outside of it
+        (see Accessor) remain valid for as long as the count is unchanged """
+        self._parent, self._key = None, None
+        if self._owner is not None:
+            self._owner._releases += 1
+            self._claim(None)
+
+    def _notify(self, key: object, structural: bool, previous: object = None):
+        """ Inform the owner of the section that the section has been mutated, discarding the digests of the section
+        and of the sections that contain it
+
+        Params:
+            key (object): The key whose value has changed
+            structural (bool): Whether the keys or sections of the config have changed as opposed to a setting value
+            previous (object): The value that was replaced or removed - None when the key was added or kept its value
+        """
+
+        # A section without a digest implies that its parents do not have one either
+        node = self
+        while node is not None and node._digest is not None:
+            node._digest = None
+            node = node._parent
+
+        if self._owner is not None: self._owner._mutated(self, key, structural, previous)
+
+    def _resolve(self):
+        """ Resolve the deferred values held directly by this section """
+        for key, value in dict.items(self):
+            if type(value) is Deferred:
+                dict.__setitem__(self, key, value.resolve())
+
+def digest(value: object) -> int:
+    """ Generate a 128 bit digest of a setting value, section or key that is stable between processes
+
+    Params:
+        value (object): The value to digest
+
+    Returns:
+        int: The digest of the value
+
+    Raises:
+        TypeError: In the event that the value (or an item of it) is of a type without a stable digest - see _literals
+    """
+
+    if isinstance(value, Section): return value.digest()
+    elif isinstance(value, dict): return _combine(value.items())
+    elif isinstance(value, (set, frozenset)):
+        # The ordering of the items of a set is not stable - combine the item digests with an order independent sum
+        content = (sum(digest(item) for item in value) % _MODULUS).to_bytes(16, "big")
+    elif isinstance(value, (list, tuple)):
+        content = b"".join(digest(item).to_bytes(16, "big") for item in value)
+    elif isinstance(value, str):
+        content = value.encode("utf-8", "surrogatepass")
+    elif isinstance(value, (bytes, bytearray)):
+        content = bytes(value)
+    elif type(value) in _literals:
+        content = repr(value).encode("utf-8", "surrogatepass")
+    else:
+        raise TypeError("Values of type {} have no stable digest".format(type(value).__qualname__))
+
+    name = type(value).__qualname__.encode()
+    return int.from_bytes(hashlib.blake2b(name + b"\0" + content, digest_size = 16).digest(), "big")
+
+_MODULUS = 1 << 128
+
+# Types whose repr expresses their entire value and is the same between processes. The repr of other types may hold
+# an address, or omit some of the value, such that it cannot identify the value
+_literals = {
+    type(None), bool, int, float, complex, range, array.array, decimal.Decimal, fractions.Fraction, uuid.UUID,
+    datetime.date, datetime.time, datetime.datetime, datetime.timedelta
+}
+
+def _combine(items: iter) -> int:
+    """ Combine the key value pairs of a mapping into a single digest, independently of the order of the pairs """
+    total = 0
+    for key, value in items:
+        pair = digest(key).to_bytes(16, "big") + digest(value).to_bytes(16, "big")
+        total += int.from_bytes(hashlib.blake2b(pair, digest_size = 16).digest(), "big")
+    return total % _MODULUS
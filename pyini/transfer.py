@@ -0,0 +1,120 @@
+import pickle
+import collections
+
+def key(config: object) -> str:
+    """ Identify a config by the fingerprint of its content along with a digest of its parsing options - configs of
+    the same content parsed with different options (e.g. safe and unsafe) are not interchangeable
+
+    Params:
+        config (ConfigParser): The config to identify
+
+    Returns:
+        str: The key of the config
+    """
+    return "{}-{:032x}".format(config.fingerprint(), config._settingsDigest())
+
+class ConfigRegistry:
+    """ A bounded registry of configs by their key (see key) - the fingerprint of their content and their parsing
+    options - through which a process that already holds a config can receive references to it without deserializing
+    it again. The least recently used configs are discarded once the registry is full.
+
+    Parameters:
+        maxsize (int): The number of configs to hold
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._configs = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self): return len(self._configs)
+    def __contains__(self, key: str): return key in self._configs
+
+    def register(self, config: object) -> str:
+        """ Add a config to the registry
+
+        Params:
+            config (ConfigParser): The config to be held
+
+        Returns:
+            str: The key the config is held under
+        """
+        identity = key(config)
+        self._configs[identity] = config
+        self._configs.move_to_end(identity)
+        while len(self._configs) > self.maxsize: self._configs.popitem(last = False)
+        return identity
+
+    def get(self, identity: str) -> object:
+        """ Collect the config with the key provided. A config that has been modified since it was registered no longer
+        matches its key and is discarded.
+
+        Params:
+            identity (str): The key of the config
+
+        Returns:
+            ConfigParser: The config, or None if no config with the key is held
+        """
+
+        config = self._configs.get(identity)
+        if config is not None and key(config) != identity:
+            del self._configs[identity]
+            config = None
+
+        if config is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._configs.move_to_end(identity)
+        return config
+
+    def clear(self):
+        """ Remove all the configs held and reset the registry statistics """
+        self._configs.clear()
+        self.hits, self.misses = 0, 0
+
+class ConfigReference:
+    """ A picklable reference to a config by its key - the fingerprint of its content and its parsing options.
+    Unpickling a reference produces the config held by the receiving process's registry, only deserializing the
+    config's payload (if one was sent) when the receiver doesn't already hold the config.
+
+    Parameters:
+        config (ConfigParser): The config being referenced
+        payload (bool): Send the serialized config along with its key
+    """
+
+    def __init__(self, config: object, payload: bool = True):
+        self.config = config
+        self.key = registry.register(config)
+        self._payload = pickle.dumps(config, protocol = pickle.HIGHEST_PROTOCOL) if payload else None
+
+    def __repr__(self): return "<ConfigReference {}>".format(self.key)
+    def __reduce__(self): return (_resolve, (self.key, self._payload))
+
+def _resolve(identity: str, payload: bytes) -> object:
+    """ Collect the config referenced by a key, deserializing its payload if it isn't already held
+
+    Params:
+        identity (str): The key of the config
+        payload (bytes): The pickled config - None when only the key was sent
+
+    Returns:
+        ConfigParser: The config
+
+    Raises:
+        LookupError: In the event that the config isn't held and no payload was sent
+    """
+
+    config = registry.get(identity)
+    if config is not None: return config
+
+    if payload is None:
+        raise LookupError("Config {} is not held by this process and its payload was not sent".format(identity))
+
+    config = pickle.loads(payload)
+    registry.register(config)
+    return config
+
+registry = ConfigRegistry()  # The process wide registry of configs that have been sent or received
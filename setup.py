@@ -19,6 +19,9 @@ setup(
     author_email="Kieran.Bacon@outlook.com",
     url="https://github.com/Kieran-Bacon/pyini",
     packages=find_packages(),
+    entry_points={
+          "console_scripts": ["pyini=pyini.cli:main"]
+    },
     classifiers=[
           "Programming Language :: Python :: 3",
           "License :: OSI Approved :: MIT License"